@@ -0,0 +1,47 @@
+"""
+Runs the benchmarks and prints throughput and latency percentiles::
+
+    python -m benchmarks
+    python -m benchmarks --suite signing --suite requests --json baseline.json
+    python -m benchmarks --compare baseline.json --tolerance 0.25
+"""
+
+import argparse
+import sys
+
+from benchmarks.harness import dump, load, regressions, report
+from benchmarks.suites import SUITES, run
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--suite", action="append", choices=list(SUITES), help="default: all"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="seconds per benchmark"
+    )
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline file written with --json")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed growth of the median latency over the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.min_time, args.suite)
+    print(report(results))
+    if args.json:
+        dump(results, args.json)
+    if args.compare:
+        found = regressions(results, load(args.compare), args.tolerance)
+        if found:
+            print("\nregressions:\n" + "\n".join(found))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import asyncio
+import json
+from time import perf_counter_ns
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class Result:
+    """
+    Latencies of one benchmark, in nanoseconds per operation
+    """
+
+    def __init__(self, name: str, samples: List[int], elapsed_ns: int):
+        self.name = name
+        self.samples = sorted(samples)
+        self.elapsed_ns = elapsed_ns
+
+    @property
+    def ops_per_sec(self) -> float:
+        return len(self.samples) / (self.elapsed_ns / 1e9)
+
+    def percentile(self, p: float) -> float:
+        """
+        Returns the p-th percentile latency in microseconds
+        """
+        index = min(len(self.samples) - 1, int(p / 100 * len(self.samples)))
+        return self.samples[index] / 1e3
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "ops": len(self.samples),
+            "ops_per_sec": round(self.ops_per_sec, 1),
+            "p50_us": round(self.percentile(50), 2),
+            "p90_us": round(self.percentile(90), 2),
+            "p99_us": round(self.percentile(99), 2),
+        }
+
+
+def measure(
+    name: str, fn: Callable[[], Any], min_time: float, warmup: int = 10
+) -> Result:
+    """
+    Calls fn repeatedly for at least min_time seconds
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    budget = int(min_time * 1e9)
+    started = perf_counter_ns()
+    now = started
+    while now - started < budget:
+        fn()
+        end = perf_counter_ns()
+        samples.append(end - now)
+        now = end
+    return Result(name, samples, now - started)
+
+
+async def measure_async(
+    name: str,
+    fn: Callable[[], Awaitable[Any]],
+    min_time: float,
+    concurrency: int = 1,
+    warmup: int = 10,
+) -> Result:
+    """
+    Awaits fn from concurrency workers for at least min_time seconds, throughput
+    is over all workers
+    """
+    for _ in range(warmup):
+        await fn()
+    samples: List[int] = []
+    budget = int(min_time * 1e9)
+    started = perf_counter_ns()
+
+    async def worker():
+        while perf_counter_ns() - started < budget:
+            begin = perf_counter_ns()
+            await fn()
+            samples.append(perf_counter_ns() - begin)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return Result(name, samples, perf_counter_ns() - started)
+
+
+def report(results: List[Result]) -> str:
+    width = max(len(result.name) for result in results)
+    lines = [
+        f"{'benchmark':<{width}}  {'ops/s':>12}  {'p50 us':>10}  {'p90 us':>10}  {'p99 us':>10}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.name:<{width}}  {result.ops_per_sec:>12,.0f}  "
+            f"{result.percentile(50):>10.2f}  {result.percentile(90):>10.2f}  "
+            f"{result.percentile(99):>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def regressions(
+    results: List[Result], baseline: Dict[str, Dict[str, float]], tolerance: float
+) -> List[str]:
+    """
+    Returns a line for every benchmark whose median latency grew by more than
+    tolerance (a fraction) over the baseline
+    """
+    found = []
+    for result in results:
+        before: Optional[Dict[str, float]] = baseline.get(result.name)
+        if before is None:
+            continue
+        after = result.percentile(50)
+        if after > before["p50_us"] * (1 + tolerance):
+            found.append(
+                f"{result.name}: p50 {before['p50_us']:.2f}us -> {after:.2f}us"
+            )
+    return found
+
+
+def dump(results: List[Result], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump({result.name: result.to_dict() for result in results}, f, indent=2)
+
+
+def load(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path) as f:
+        return json.load(f)
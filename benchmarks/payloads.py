@@ -0,0 +1,89 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+
+def depth(levels: int = 500, seed: int = 0) -> str:
+    """
+    Returns a get_depth response with levels price levels per side
+    """
+    rng = random.Random(seed)
+    mid = 150.0
+    asks = [
+        [f"{mid + 0.01 * i:.2f}", f"{rng.uniform(0.1, 500):.2f}"]
+        for i in range(1, levels + 1)
+    ]
+    bids = [
+        [f"{mid - 0.01 * i:.2f}", f"{rng.uniform(0.1, 500):.2f}"]
+        for i in range(levels, 0, -1)
+    ]
+    return json.dumps(
+        {
+            "asks": asks,
+            "bids": bids,
+            "lastUpdateId": "1708765432",
+            "timestamp": 1708765432123456,
+        }
+    )
+
+
+def klines(count: int = 1000, seed: int = 0) -> str:
+    """
+    Returns a get_klines response with count one minute candles
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    price = 100.0
+    rows = []
+    for i in range(count):
+        open_price = price
+        price = max(1.0, price + rng.gauss(0, 0.2))
+        rows.append(
+            {
+                "start": (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+                "end": (start + timedelta(minutes=i + 1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "open": f"{open_price:.2f}",
+                "high": f"{max(open_price, price) + rng.uniform(0, 0.1):.2f}",
+                "low": f"{min(open_price, price) - rng.uniform(0, 0.1):.2f}",
+                "close": f"{price:.2f}",
+                "volume": f"{rng.uniform(10, 5000):.2f}",
+                "quoteVolume": f"{rng.uniform(1000, 500000):.2f}",
+                "trades": str(rng.randint(1, 400)),
+            }
+        )
+    return json.dumps(rows)
+
+
+def fills(count: int = 1000, seed: int = 0) -> str:
+    """
+    Returns a get_fill_history response with count fills
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        quantity = rng.uniform(0.01, 50)
+        rows.append(
+            {
+                "clientId": str(rng.randint(1, 2**31)),
+                "fee": f"{quantity * 0.0002:.6f}",
+                "feeSymbol": "USDC",
+                "isMaker": rng.random() < 0.5,
+                "orderId": str(111_000_000_000 + i),
+                "price": f"{rng.uniform(140, 160):.2f}",
+                "quantity": f"{quantity:.2f}",
+                "side": rng.choice(("Bid", "Ask")),
+                "symbol": "SOL_USDC",
+                "systemOrderType": None,
+                "timestamp": (start + timedelta(seconds=i)).isoformat(
+                    timespec="milliseconds"
+                ),
+                "tradeId": 5_000_000 + i,
+            }
+        )
+    return json.dumps(rows)
+
+
+def all_payloads() -> Dict[str, str]:
+    return {"depth": depth(), "klines": klines(), "fills": fills()}
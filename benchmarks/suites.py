@@ -0,0 +1,259 @@
+import asyncio
+import base64
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from benchmarks import payloads
+from benchmarks.harness import Result, measure, measure_async
+from bpx.base.base_account import BaseAccount
+from bpx.base.base_public import BasePublic
+
+# deterministic key, the benchmarks never talk to the exchange
+SECRET = bytes(range(32))
+SECRET_KEY = base64.b64encode(SECRET).decode()
+PUBLIC_KEY = base64.b64encode(
+    ed25519.Ed25519PrivateKey.from_private_bytes(SECRET)
+    .public_key()
+    .public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+).decode()
+
+ORDER = {
+    "symbol": "SOL_USDC",
+    "side": "Bid",
+    "order_type": "Limit",
+    "quantity": "1.25",
+    "price": "99.5",
+    "time_in_force": "GTC",
+    "client_id": 123456,
+}
+
+# keyword arguments of every RequestConfiguration building method of BaseAccount
+ACCOUNT_CALLS: Dict[str, Dict[str, Any]] = {
+    "get_account": {},
+    "update_account": {"leverage_limit": "5", "auto_lend": True},
+    "get_max_borrow_quantity": {"symbol": "SOL"},
+    "get_max_order_quantity": {"symbol": "SOL_USDC", "side": "Bid", "price": "99"},
+    "get_max_withdrawal_quantity": {"symbol": "SOL"},
+    "get_borrow_lend_positions": {},
+    "execute_borrow_lend": {"quantity": "1", "side": "Lend", "symbol": "USDC"},
+    "get_balances": {},
+    "get_collateral": {},
+    "get_deposits": {"limit": 100, "offset": 0},
+    "get_deposit_address": {"blockchain": "Solana"},
+    "get_withdrawals": {"limit": 100, "offset": 0},
+    "withdrawal": {
+        "address": "9xQeWvG816bUx9EPjHmaT23yvVM2ZWbrrpZb9PusVFin",
+        "blockchain": "Solana",
+        "quantity": "1",
+        "symbol": "SOL",
+    },
+    "get_open_positions": {},
+    "get_borrow_history": {"symbol": "SOL"},
+    "get_interest_history": {"symbol": "SOL"},
+    "get_fill_history": {"symbol": "SOL_USDC", "limit": 1000},
+    "get_funding_payments": {"symbol": "SOL_USDC_PERP"},
+    "get_order_history": {"limit": 100, "offset": 0, "symbol": "SOL_USDC"},
+    "get_profit_and_loss_history": {"symbol": "SOL_USDC_PERP"},
+    "get_settlements_history": {},
+    "get_open_order": {"symbol": "SOL_USDC", "client_id": 123456},
+    "execute_order": ORDER,
+    "cancel_order": {"symbol": "SOL_USDC", "client_id": 123456},
+    "execute_orders": {"orders": [dict(ORDER, client_id=i) for i in range(1, 11)]},
+    "cancel_orders": {
+        "cancels": [{"symbol": "SOL_USDC", "client_id": i} for i in range(1, 11)]
+    },
+    "get_open_orders": {"symbol": "SOL_USDC"},
+    "cancel_all_orders": {"symbol": "SOL_USDC"},
+    "submit_quote": {"rfq_id": "1", "bid_price": "99", "ask_price": "101"},
+}
+
+# keyword arguments of every url builder of BasePublic
+PUBLIC_CALLS: Dict[str, Dict[str, Any]] = {
+    "get_assets_url": {},
+    "get_collateral_url": {},
+    "get_borrow_lend_markets_url": {},
+    "get_borrow_lend_market_history_url": {"interval": "1d", "symbol": "SOL"},
+    "get_markets_url": {},
+    "get_market_url": {"symbol": "SOL_USDC"},
+    "get_ticker_url": {"symbol": "SOL_USDC"},
+    "get_tickers_url": {},
+    "get_depth_url": {"symbol": "SOL_USDC"},
+    "get_klines_url": {
+        "symbol": "SOL_USDC",
+        "interval": "1m",
+        "start_time": 1704067200,
+        "end_time": 1704070800,
+    },
+    "get_klines_backfill_urls": {
+        "symbol": "SOL_USDC",
+        "interval": "1m",
+        "start_time": 1704067200,
+        "end_time": 1704672000,
+    },
+    "get_all_mark_prices_url": {"symbol": "SOL_USDC_PERP"},
+    "get_open_interest_url": {"symbol": "SOL_USDC_PERP"},
+    "get_funding_interval_rates_url": {"symbol": "SOL_USDC_PERP"},
+    "get_status_url": {},
+    "get_ping_url": {},
+    "get_time_url": {},
+    "get_recent_trades_url": {"symbol": "SOL_USDC"},
+    "get_historical_trades_url": {"symbol": "SOL_USDC", "offset": 1000},
+}
+
+
+def signing(min_time: float) -> List[Result]:
+    account = BaseAccount(PUBLIC_KEY, SECRET_KEY, window=5000, debug=False)
+    params = BaseAccount._order_params(account, **ORDER)
+    return [
+        measure(
+            "sign.order",
+            lambda: account._sign(params, "orderExecute", 1704067200000, 5000),
+            min_time,
+        ),
+        measure(
+            "headers.order",
+            lambda: account._headers(params, "orderExecute", None),
+            min_time,
+        ),
+        measure(
+            "headers.empty",
+            lambda: account._headers({}, "balanceQuery", None),
+            min_time,
+        ),
+    ]
+
+
+def request_building(min_time: float) -> List[Result]:
+    account = BaseAccount(PUBLIC_KEY, SECRET_KEY, window=5000, debug=False)
+    public = BasePublic()
+    results = []
+    for name, kwargs in ACCOUNT_CALLS.items():
+        method = getattr(account, name)
+        results.append(measure(f"account.{name}", lambda: method(**kwargs), min_time))
+    for name, kwargs in PUBLIC_CALLS.items():
+        method = getattr(public, name)
+        results.append(measure(f"public.{name}", lambda: method(**kwargs), min_time))
+    return results
+
+
+def decoding(min_time: float) -> List[Result]:
+    from bpx.http_client.json_codec import CODECS, JsonCodec
+
+    codecs = []
+    for codec in CODECS:
+        try:
+            codecs.append(codec())
+        except ImportError:
+            continue
+    results = []
+    for name, payload in payloads.all_payloads().items():
+        data = payload.encode()
+        for codec in codecs:
+            suffix = "" if type(codec) is JsonCodec else f".{codec.name}"
+            results.append(
+                measure(f"decode.{name}{suffix}", lambda: codec.loads(data), min_time)
+            )
+    return results
+
+
+def _http_clients(simulator_url: str) -> Tuple[Any, Any, Any]:
+    from bpx.account import Account
+    from bpx.http_client.sync_http_client import SyncHttpClient
+    from bpx.public import Public
+
+    account = Account(PUBLIC_KEY, SECRET_KEY, default_http_client=SyncHttpClient())
+    account.BPX_API_URL = simulator_url
+    public = Public(http_client=account.http_client)
+    public.BASE_URL = simulator_url
+    return account, public, account.http_client
+
+
+def sync_http(min_time: float, simulator_url: str) -> List[Result]:
+    account, public, http_client = _http_clients(simulator_url)
+    with http_client:
+        return [
+            measure("sync.get_depth", lambda: public.get_depth("SOL_USDC"), min_time),
+            measure(
+                "sync.get_open_orders",
+                lambda: account.get_open_orders(symbol="SOL_USDC"),
+                min_time,
+            ),
+            measure(
+                "sync.execute_order",
+                lambda: account.execute_order(
+                    "SOL_USDC", "Bid", "Market", quantity="1"
+                ),
+                min_time,
+            ),
+        ]
+
+
+def async_http(
+    min_time: float, simulator_url: str, concurrency: int = 16
+) -> List[Result]:
+    from bpx.async_.account import Account
+    from bpx.async_.public import Public
+    from bpx.http_client.async_http_client import AsyncHttpClient
+
+    async def run() -> List[Result]:
+        http_client = AsyncHttpClient()
+        account = Account(PUBLIC_KEY, SECRET_KEY, http_client=http_client)
+        account.BPX_API_URL = simulator_url
+        public = Public(http_client=http_client)
+        public.BASE_URL = simulator_url
+        async with http_client:
+            return [
+                await measure_async(
+                    "async.get_depth", lambda: public.get_depth("SOL_USDC"), min_time
+                ),
+                await measure_async(
+                    f"async.get_depth.x{concurrency}",
+                    lambda: public.get_depth("SOL_USDC"),
+                    min_time,
+                    concurrency=concurrency,
+                ),
+                await measure_async(
+                    "async.get_open_orders",
+                    lambda: account.get_open_orders(symbol="SOL_USDC"),
+                    min_time,
+                ),
+                await measure_async(
+                    "async.execute_order",
+                    lambda: account.execute_order(
+                        "SOL_USDC", "Bid", "Market", quantity="1"
+                    ),
+                    min_time,
+                ),
+            ]
+
+    return asyncio.run(run())
+
+
+SUITES: Dict[str, Callable[..., List[Result]]] = {
+    "signing": signing,
+    "requests": request_building,
+    "decoding": decoding,
+    "sync_http": sync_http,
+    "async_http": async_http,
+}
+
+
+def run(min_time: float = 0.5, suites: Optional[List[str]] = None) -> List[Result]:
+    """
+    Runs the named suites, all of them by default. The http suites run against
+    a local ExchangeSimulator
+    """
+    from bpx.simulator import ExchangeSimulator
+
+    results: List[Result] = []
+    names = list(SUITES) if suites is None else suites
+    with ExchangeSimulator() as simulator:
+        for name in names:
+            suite = SUITES[name]
+            if name.endswith("_http"):
+                results.extend(suite(min_time, simulator.url))
+            else:
+                results.extend(suite(min_time))
+    return results
@@ -1,10 +1,43 @@
 from bpx.base.base_account import BaseAccount
-from bpx.http_client.sync_http_client import SyncHttpClient
-from typing import Optional, Union, Dict, Any, List
+from bpx.http_client.lazy import LazyClient
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    Union,
+    Dict,
+    Any,
+    List,
+    Callable,
+    Iterator,
+    Iterable,
+)
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from collections import deque
+from itertools import count
 from bpx.constants.enums import *
+from bpx.exceptions import LimitValueError, UnexpectedResponseError
+from bpx.models.objects import (
+    BulkResponse,
+    CancelReplaceResult,
+    RequestConfiguration,
+)
+from time import perf_counter
 
+if TYPE_CHECKING:
+    from bpx.http_client.sync_http_client import SyncHttpClient
+    from bpx.models.order_validator import OrderValidator
+    from bpx.models.order_tracker import OrderTracker
+    from bpx.base.base_clock_sync import BaseClockSync
 
-http_client = SyncHttpClient()
+_default_http_client = LazyClient("bpx.http_client.sync_http_client", "SyncHttpClient")
+
+
+def __getattr__(name: str) -> Any:
+    if name == "http_client":
+        return _default_http_client.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Account(BaseAccount):
@@ -15,11 +48,56 @@ class Account(BaseAccount):
         window: int = 5000,
         proxy: Optional[dict] = None,
         debug: bool = False,
-        default_http_client: SyncHttpClient = http_client,
+        default_http_client: Optional["SyncHttpClient"] = None,
+        order_validator: Optional["OrderValidator"] = None,
+        order_tracker: Optional["OrderTracker"] = None,
+        clock: Optional["BaseClockSync"] = None,
+        max_workers: int = 8,
     ):
-        super().__init__(public_key, secret_key, window, debug)
+        super().__init__(public_key, secret_key, window, debug, order_validator, clock)
+        # worker threads of cancel_orders and cancel_replace, started on first use
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # the shared default client stays open when this instance is closed
+        self._shared_http_client = default_http_client is None
+        if default_http_client is None:
+            default_http_client = _default_http_client.get()
         self.http_client = default_http_client
         self.http_client.proxies = proxy
+        self.order_tracker = order_tracker
+
+    def __enter__(self) -> "Account":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the pooled sessions of the http client passed in, the shared
+        default client is left open for the other instances. Shuts down the
+        worker threads.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        if not self._shared_http_client:
+            self.http_client.close()
+
+    def _submit(self, fn: Callable[..., Any], *args) -> Future:
+        """
+        Runs fn in a worker thread, in a copy of the current context so a
+        deadline() applies there too
+        """
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="bpx"
+                    )
+        return self._executor.submit(copy_context().run, fn, *args)
 
     def get_account(
         self, window: Optional[int] = None
@@ -504,11 +582,14 @@ class Account(BaseAccount):
         request_config = super().get_open_order(
             symbol=symbol, order_id=order_id, client_id=client_id, window=window
         )
-        return self.http_client.get(
+        response = self.http_client.get(
             url=request_config.url,
             headers=request_config.headers,
             params=request_config.params,
         )
+        if self.order_tracker is not None:
+            self.order_tracker.on_order(response)
+        return response
 
     def execute_order(
         self,
@@ -572,11 +653,21 @@ class Account(BaseAccount):
             trigger_quantity=trigger_quantity,
             window=window,
         )
-        return self.http_client.post(
+        dedupe = None
+        if client_id:
+
+            def dedupe():
+                return self._find_order(symbol, client_id, window)
+
+        response = self.http_client.post(
             url=request_config.url,
             headers=request_config.headers,
             data=request_config.data,
+            **self._retry_options(request_config, "orderExecute", window, dedupe),
         )
+        if self.order_tracker is not None:
+            self.order_tracker.on_order(response)
+        return response
 
     def cancel_order(
         self,
@@ -593,11 +684,159 @@ class Account(BaseAccount):
         request_config = super().cancel_order(
             symbol=symbol, order_id=order_id, client_id=client_id, window=window
         )
-        return self.http_client.delete(
+        response = self.http_client.delete(
+            url=request_config.url,
+            headers=request_config.headers,
+            data=request_config.data,
+            **self._retry_options(request_config, "orderCancel", window),
+        )
+        if self.order_tracker is not None:
+            self.order_tracker.on_order(response)
+        return response
+
+    def execute_orders(
+        self, orders: Iterable[Dict[str, Any]], window: Optional[int] = None
+    ) -> BulkResponse:
+        """
+        Posts several orders in one request. Every order is a dict of execute_order
+        keyword arguments, results are keyed by position and ids holds each order's client_id.
+        An empty batch returns an empty BulkResponse without a request.
+
+        https://docs.backpack.exchange/#tag/Order/operation/execute_order_batch
+        """
+        orders = list(orders)
+        if not orders:
+            return BulkResponse()
+        request_config = super().execute_orders(orders, window=window)
+        response = self.http_client.post(
             url=request_config.url,
             headers=request_config.headers,
             data=request_config.data,
         )
+        if not isinstance(response, list):
+            response = [response] * len(request_config.data)
+        bulk = self.bulk_response(request_config.data, response)
+        if self.order_tracker is not None:
+            self.order_tracker.on_orders(bulk.results.values())
+        return bulk
+
+    def cancel_orders(
+        self,
+        cancels: Iterable[Dict[str, Any]],
+        window: Optional[int] = None,
+        max_workers: int = 8,
+    ) -> BulkResponse:
+        """
+        Cancels several orders concurrently over pooled connections, there's no batch
+        cancel endpoint. Every cancel is a dict with symbol and order_id or client_id,
+        results are keyed by position and ids holds each client_id or order_id.
+        An empty batch returns an empty BulkResponse without a request.
+        At most max_workers cancels are in flight, on the worker threads of the
+        account (Account(max_workers=...)).
+
+        https://docs.backpack.exchange/#tag/Order/operation/cancel_order
+        """
+        request_configs = super().cancel_orders(cancels, window=window)
+        if not request_configs:
+            return BulkResponse()
+
+        def cancel(request_config: RequestConfiguration):
+            try:
+                return self.http_client.delete(
+                    url=request_config.url,
+                    headers=request_config.headers,
+                    data=request_config.data,
+                )
+            except Exception as e:
+                return e
+
+        # at most max_workers cancels in flight, responses in order
+        pending = deque()
+        responses = []
+        for request_config in request_configs:
+            if len(pending) >= max_workers:
+                responses.append(pending.popleft().result())
+            pending.append(self._submit(cancel, request_config))
+        responses.extend(future.result() for future in pending)
+        bulk = self.bulk_response(
+            [request_config.data for request_config in request_configs], responses
+        )
+        if self.order_tracker is not None:
+            self.order_tracker.on_orders(bulk.results.values())
+        return bulk
+
+    def cancel_replace(
+        self,
+        symbol: str,
+        replacement: Dict[str, Any],
+        order_id: Optional[str] = None,
+        client_id: Optional[int] = None,
+        wait_for_cancel: bool = True,
+        window: Optional[int] = None,
+    ) -> CancelReplaceResult:
+        """
+        Cancels an order and places replacement, a dict of execute_order keyword
+        arguments for the same symbol. The replacement is signed while the cancel
+        is in flight and sent as soon as the cancel succeeds, or right away
+        alongside it with wait_for_cancel=False. If building the replacement
+        raises, e.g. OrderValidationError, the cancel has already been sent: the
+        error is returned on the result next to the cancel response.
+
+        https://docs.backpack.exchange/#tag/Order/operation/cancel_order
+        https://docs.backpack.exchange/#tag/Order/operation/execute_order
+        """
+        started = perf_counter()
+        cancel_config = super().cancel_order(
+            symbol=symbol, order_id=order_id, client_id=client_id, window=window
+        )
+        result = CancelReplaceResult(None)
+        result.timings["cancel_sign"] = perf_counter() - started
+
+        def send(
+            leg: str, request: Callable[..., Any], request_config: RequestConfiguration
+        ):
+            leg_started = perf_counter()
+            response = request(
+                url=request_config.url,
+                headers=request_config.headers,
+                data=request_config.data,
+            )
+            result.timings[leg] = perf_counter() - leg_started
+            return response
+
+        cancel = self._submit(send, "cancel", self.http_client.delete, cancel_config)
+        replace_started = perf_counter()
+        try:
+            replace_config = super().execute_order(
+                **{"symbol": symbol, **replacement, "window": window}
+            )
+        except Exception as error:
+            replace_config = None
+            result.error = error
+        result.timings["replace_sign"] = perf_counter() - replace_started
+        if replace_config is not None and not wait_for_cancel:
+            result.order = send("replace", self.http_client.post, replace_config)
+        result.cancel = cancel.result()
+        if replace_config is not None and wait_for_cancel:
+            if self.is_order(result.cancel):
+                result.order = send("replace", self.http_client.post, replace_config)
+        result.timings["total"] = perf_counter() - started
+        if self.order_tracker is not None:
+            self.order_tracker.on_orders((result.cancel, result.order))
+        return result
+
+    def _find_order(
+        self, symbol: str, client_id: int, window: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the order placed with client_id, open or in the latest order history,
+        None when the exchange doesn't know it
+        """
+        order = self.get_open_order(symbol, client_id=client_id, window=window)
+        if self.is_order(order):
+            return order
+        history = self.get_order_history(symbol=symbol, window=window)
+        return self._matching_order(history, client_id)
 
     def get_open_orders(
         self,
@@ -628,11 +867,14 @@ class Account(BaseAccount):
         https://docs.backpack.exchange/#tag/Order/operation/cancel_open_orders
         """
         request_config = super().cancel_all_orders(symbol=symbol, window=window)
-        return self.http_client.delete(
+        response = self.http_client.delete(
             url=request_config.url,
             headers=request_config.headers,
             data=request_config.data,
         )
+        if self.order_tracker is not None and isinstance(response, list):
+            self.order_tracker.on_orders(response)
+        return response
 
     def submit_quote(
         self,
@@ -659,3 +901,299 @@ class Account(BaseAccount):
             headers=request_config.headers,
             data=request_config.data,
         )
+
+    def iter_fill_history(
+        self,
+        symbol: Optional[str] = None,
+        from_: Optional[int] = None,
+        to: Optional[int] = None,
+        fill_type: Optional[Union[FillTypeEnum, FillTypeType]] = None,
+        market_type: Optional[Union[MarketTypeEnum, MarketTypeType]] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the whole fill history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_fills
+        """
+        return self._paginate(
+            self.get_fill_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            symbol=symbol,
+            from_=from_,
+            to=to,
+            fill_type=fill_type,
+            market_type=market_type,
+            window=window,
+        )
+
+    def iter_order_history(
+        self,
+        symbol: Optional[str] = None,
+        order_id: Optional[str] = None,
+        market_type: Optional[Union[MarketTypeEnum, MarketTypeType]] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the whole order history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_order_history
+        """
+        return self._paginate(
+            self.get_order_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            symbol=symbol,
+            order_id=order_id,
+            market_type=market_type,
+            window=window,
+        )
+
+    def iter_funding_payments(
+        self,
+        subaccount_id: Optional[int] = None,
+        symbol: Optional[str] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields all funding payments, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_funding_payments
+        """
+        return self._paginate(
+            self.get_funding_payments,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            subaccount_id=subaccount_id,
+            symbol=symbol,
+            window=window,
+        )
+
+    def iter_profit_and_loss_history(
+        self,
+        subaccount_id: Optional[int] = None,
+        symbol: Optional[str] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the whole profit and loss history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_pnl_payments
+        """
+        return self._paginate(
+            self.get_profit_and_loss_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            subaccount_id=subaccount_id,
+            symbol=symbol,
+            window=window,
+        )
+
+    def iter_settlements_history(
+        self,
+        source: Optional[
+            Union[SettlementSourceFilterEnum, SettlementSourceFilterType]
+        ] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the whole settlements history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_settlements
+        """
+        return self._paginate(
+            self.get_settlements_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            source=source,
+            window=window,
+        )
+
+    def iter_borrow_history(
+        self,
+        borrow_lend_event_type: Optional[
+            Union[BorrowLendEventEnum, BorrowLendEventType]
+        ] = None,
+        sources: Optional[str] = None,
+        position_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the whole borrow history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_borrow_lend_history
+        """
+        return self._paginate(
+            self.get_borrow_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            borrow_lend_event_type=borrow_lend_event_type,
+            sources=sources,
+            position_id=position_id,
+            symbol=symbol,
+            window=window,
+        )
+
+    def iter_interest_history(
+        self,
+        asset: Optional[str] = None,
+        symbol: Optional[str] = None,
+        position_id: Optional[str] = None,
+        source: Optional[
+            Union[InterestPaymentSourceType, InterestPaymentSourceEnum]
+        ] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the whole interest history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_interest_history
+        """
+        return self._paginate(
+            self.get_interest_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            asset=asset,
+            symbol=symbol,
+            position_id=position_id,
+            source=source,
+            window=window,
+        )
+
+    def iter_deposits(
+        self,
+        from_: Optional[int] = None,
+        to: Optional[int] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields all account deposits, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/Capital/operation/get_deposits
+        """
+        return self._paginate(
+            self.get_deposits,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            from_=from_,
+            to=to,
+            window=window,
+        )
+
+    def iter_withdrawals(
+        self,
+        from_: Optional[int] = None,
+        to: Optional[int] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields all account withdrawals, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/Capital/operation/get_withdrawals
+        """
+        return self._paginate(
+            self.get_withdrawals,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            from_=from_,
+            to=to,
+            window=window,
+        )
+
+    def _paginate(
+        self,
+        fetch: Callable[..., Union[Dict[str, Any], List[Any], str]],
+        page_size: int,
+        prefetch: bool,
+        concurrency: int,
+        **kwargs,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields items of consecutive pages returned by fetch until a page is not full.
+        With prefetch up to concurrency pages are requested ahead in worker threads.
+        """
+        if page_size <= 0 or page_size > LimitValueError.MAX:
+            raise LimitValueError
+        if not prefetch:
+            offset = 0
+            while True:
+                page = fetch(limit=page_size, offset=offset, **kwargs)
+                if not isinstance(page, list):
+                    raise UnexpectedResponseError(page)
+                yield from page
+                if len(page) < page_size:
+                    return
+                offset += page_size
+
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            pending = deque()
+            offsets = count(0, page_size)
+            for _ in range(max(concurrency, 1)):
+                pending.append(
+                    executor.submit(
+                        copy_context().run,
+                        fetch,
+                        limit=page_size,
+                        offset=next(offsets),
+                        **kwargs,
+                    )
+                )
+            try:
+                while pending:
+                    page = pending.popleft().result()
+                    if not isinstance(page, list):
+                        raise UnexpectedResponseError(page)
+                    if len(page) < page_size:
+                        yield from page
+                        return
+                    pending.append(
+                        executor.submit(
+                            copy_context().run,
+                            fetch,
+                            limit=page_size,
+                            offset=next(offsets),
+                            **kwargs,
+                        )
+                    )
+                    yield from page
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -1,10 +1,45 @@
 from bpx.base.base_account import BaseAccount
-from bpx.http_client.async_http_client import AsyncHttpClient
-from typing import Optional, Union, Dict, Any, List
+from bpx.http_client.lazy import LazyClient
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    Union,
+    Dict,
+    Any,
+    List,
+    Callable,
+    Awaitable,
+    AsyncIterator,
+    Iterable,
+)
+import asyncio
+from collections import deque
+from itertools import count
 
 from bpx.constants.enums import *
+from bpx.exceptions import LimitValueError, UnexpectedResponseError
+from bpx.models.objects import (
+    BulkResponse,
+    CancelReplaceResult,
+    RequestConfiguration,
+)
+from time import perf_counter
 
-default_http_client = AsyncHttpClient()
+if TYPE_CHECKING:
+    from bpx.http_client.async_http_client import AsyncHttpClient
+    from bpx.models.order_validator import OrderValidator
+    from bpx.models.order_tracker import OrderTracker
+    from bpx.base.base_clock_sync import BaseClockSync
+
+_default_http_client = LazyClient(
+    "bpx.http_client.async_http_client", "AsyncHttpClient"
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name == "default_http_client":
+        return _default_http_client.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Account(BaseAccount):
@@ -15,11 +50,35 @@ class Account(BaseAccount):
         window: int = 5000,
         proxy: Optional[str] = None,
         debug: bool = False,
-        http_client: AsyncHttpClient = default_http_client,
+        http_client: Optional["AsyncHttpClient"] = None,
+        order_validator: Optional["OrderValidator"] = None,
+        order_tracker: Optional["OrderTracker"] = None,
+        clock: Optional["BaseClockSync"] = None,
     ):
-        super().__init__(public_key, secret_key, window, debug)
+        super().__init__(public_key, secret_key, window, debug, order_validator, clock)
+        if http_client is None:
+            http_client = _default_http_client.get()
         self.http_client = http_client
         self.http_client.proxy = proxy
+        self._opened = 0
+        self.order_tracker = order_tracker
+
+    async def __aenter__(self) -> "Account":
+        await self.http_client.open()
+        self._opened += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Releases the pooled session opened by ``async with``, the http client
+        closes it once no one else uses it
+        """
+        if self._opened:
+            self._opened -= 1
+            await self.http_client.close()
 
     async def get_account(
         self, window: Optional[int] = None
@@ -504,41 +563,44 @@ class Account(BaseAccount):
         request_config = super().get_open_order(
             symbol=symbol, order_id=order_id, client_id=client_id, window=window
         )
-        return await self.http_client.get(
+        response = await self.http_client.get(
             url=request_config.url,
             headers=request_config.headers,
             params=request_config.params,
         )
+        if self.order_tracker is not None:
+            self.order_tracker.on_order(response)
+        return response
 
     async def execute_order(
-            self,
-            symbol: str,
-            side: str,
-            order_type: Union[OrderTypeEnum, OrderTypeType],
-            time_in_force: Optional[Union[TimeInForceEnum, TimeInForceType]] = None,
-            quantity: Optional[str] = None,
-            price: Optional[str] = None,
-            trigger_price: Optional[str] = None,
-            self_trade_prevention: Optional[
-                Union[SelfTradePreventionEnum, SelfTradePreventionType]
-            ] = None,
-            quote_quantity: Optional[str] = None,
-            client_id: Optional[int] = None,
-            post_only: Optional[bool] = None,
-            reduce_only: Optional[bool] = None,
-            auto_borrow: Optional[bool] = None,
-            auto_borrow_repay: Optional[bool] = None,
-            auto_lend: Optional[bool] = None,
-            auto_lend_redeem: Optional[bool] = None,
-            stop_loss_limit_price: Optional[str] = None,
-            stop_loss_trigger_by: Optional[str] = None,
-            stop_loss_trigger_price: Optional[str] = None,
-            take_profit_limit_price: Optional[str] = None,
-            take_profit_trigger_by: Optional[str] = None,
-            take_profit_trigger_price: Optional[str] = None,
-            triggered_by: Optional[str] = None,
-            trigger_quantity: Optional[str] = None,
-            window: Optional[int] = None,
+        self,
+        symbol: str,
+        side: str,
+        order_type: Union[OrderTypeEnum, OrderTypeType],
+        time_in_force: Optional[Union[TimeInForceEnum, TimeInForceType]] = None,
+        quantity: Optional[str] = None,
+        price: Optional[str] = None,
+        trigger_price: Optional[str] = None,
+        self_trade_prevention: Optional[
+            Union[SelfTradePreventionEnum, SelfTradePreventionType]
+        ] = None,
+        quote_quantity: Optional[str] = None,
+        client_id: Optional[int] = None,
+        post_only: Optional[bool] = None,
+        reduce_only: Optional[bool] = None,
+        auto_borrow: Optional[bool] = None,
+        auto_borrow_repay: Optional[bool] = None,
+        auto_lend: Optional[bool] = None,
+        auto_lend_redeem: Optional[bool] = None,
+        stop_loss_limit_price: Optional[str] = None,
+        stop_loss_trigger_by: Optional[str] = None,
+        stop_loss_trigger_price: Optional[str] = None,
+        take_profit_limit_price: Optional[str] = None,
+        take_profit_trigger_by: Optional[str] = None,
+        take_profit_trigger_price: Optional[str] = None,
+        triggered_by: Optional[str] = None,
+        trigger_quantity: Optional[str] = None,
+        window: Optional[int] = None,
     ) -> Union[Dict[str, Any], List[Any], str]:
         """
         Posts an order and returns order status
@@ -572,11 +634,21 @@ class Account(BaseAccount):
             trigger_quantity=trigger_quantity,
             window=window,
         )
-        return await self.http_client.post(
+        dedupe = None
+        if client_id:
+
+            async def dedupe():
+                return await self._find_order(symbol, client_id, window)
+
+        response = await self.http_client.post(
             url=request_config.url,
             headers=request_config.headers,
             data=request_config.data,
+            **self._retry_options(request_config, "orderExecute", window, dedupe),
         )
+        if self.order_tracker is not None:
+            self.order_tracker.on_order(response)
+        return response
 
     async def cancel_order(
         self,
@@ -593,14 +665,165 @@ class Account(BaseAccount):
         request_config = super().cancel_order(
             symbol=symbol, order_id=order_id, client_id=client_id, window=window
         )
-        return await self.http_client.delete(
+        response = await self.http_client.delete(
             url=request_config.url,
             headers=request_config.headers,
             data=request_config.data,
+            **self._retry_options(request_config, "orderCancel", window),
+        )
+        if self.order_tracker is not None:
+            self.order_tracker.on_order(response)
+        return response
+
+    async def execute_orders(
+        self, orders: Iterable[Dict[str, Any]], window: Optional[int] = None
+    ) -> BulkResponse:
+        """
+        Posts several orders in one request. Every order is a dict of execute_order
+        keyword arguments, results are keyed by position and ids holds each order's client_id.
+        An empty batch returns an empty BulkResponse without a request.
+
+        https://docs.backpack.exchange/#tag/Order/operation/execute_order_batch
+        """
+        orders = list(orders)
+        if not orders:
+            return BulkResponse()
+        request_config = super().execute_orders(orders, window=window)
+        response = await self.http_client.post(
+            url=request_config.url,
+            headers=request_config.headers,
+            data=request_config.data,
+        )
+        if not isinstance(response, list):
+            response = [response] * len(request_config.data)
+        bulk = self.bulk_response(request_config.data, response)
+        if self.order_tracker is not None:
+            self.order_tracker.on_orders(bulk.results.values())
+        return bulk
+
+    async def cancel_orders(
+        self, cancels: Iterable[Dict[str, Any]], window: Optional[int] = None
+    ) -> BulkResponse:
+        """
+        Cancels several orders concurrently over the pooled session, there's no batch
+        cancel endpoint. Every cancel is a dict with symbol and order_id or client_id,
+        results are keyed by position and ids holds each client_id or order_id.
+        An empty batch returns an empty BulkResponse without a request.
+
+        https://docs.backpack.exchange/#tag/Order/operation/cancel_order
+        """
+        request_configs = super().cancel_orders(cancels, window=window)
+        if not request_configs:
+            return BulkResponse()
+        async with self.http_client:
+            responses = await asyncio.gather(
+                *(
+                    self.http_client.delete(
+                        url=request_config.url,
+                        headers=request_config.headers,
+                        data=request_config.data,
+                    )
+                    for request_config in request_configs
+                ),
+                return_exceptions=True,
+            )
+        bulk = self.bulk_response(
+            [request_config.data for request_config in request_configs], responses
+        )
+        if self.order_tracker is not None:
+            self.order_tracker.on_orders(bulk.results.values())
+        return bulk
+
+    async def cancel_replace(
+        self,
+        symbol: str,
+        replacement: Dict[str, Any],
+        order_id: Optional[str] = None,
+        client_id: Optional[int] = None,
+        wait_for_cancel: bool = True,
+        window: Optional[int] = None,
+    ) -> CancelReplaceResult:
+        """
+        Cancels an order and places replacement, a dict of execute_order keyword
+        arguments for the same symbol. The replacement is signed while the cancel
+        is in flight and sent as soon as the cancel succeeds, or right away
+        alongside it with wait_for_cancel=False. If building the replacement
+        raises, e.g. OrderValidationError, the cancel has already been sent: the
+        error is returned on the result next to the cancel response.
+
+        https://docs.backpack.exchange/#tag/Order/operation/cancel_order
+        https://docs.backpack.exchange/#tag/Order/operation/execute_order
+        """
+        started = perf_counter()
+        cancel_config = super().cancel_order(
+            symbol=symbol, order_id=order_id, client_id=client_id, window=window
         )
+        result = CancelReplaceResult(None)
+        result.timings["cancel_sign"] = perf_counter() - started
+
+        async def send(
+            leg: str,
+            request: Callable[..., Awaitable[Any]],
+            request_config: RequestConfiguration,
+        ):
+            leg_started = perf_counter()
+            response = await request(
+                url=request_config.url,
+                headers=request_config.headers,
+                data=request_config.data,
+            )
+            result.timings[leg] = perf_counter() - leg_started
+            return response
+
+        cancel = asyncio.ensure_future(
+            send("cancel", self.http_client.delete, cancel_config)
+        )
+        # let the cancel reach its first network wait before signing the replacement
+        await asyncio.sleep(0)
+        replace_started = perf_counter()
+        try:
+            replace_config = super().execute_order(
+                **{"symbol": symbol, **replacement, "window": window}
+            )
+        except Exception as error:
+            replace_config = None
+            result.error = error
+        result.timings["replace_sign"] = perf_counter() - replace_started
+        if replace_config is None:
+            result.cancel = await cancel
+        elif wait_for_cancel:
+            result.cancel = await cancel
+            if self.is_order(result.cancel):
+                result.order = await send(
+                    "replace", self.http_client.post, replace_config
+                )
+        else:
+            result.cancel, result.order = await asyncio.gather(
+                cancel, send("replace", self.http_client.post, replace_config)
+            )
+        result.timings["total"] = perf_counter() - started
+        if self.order_tracker is not None:
+            self.order_tracker.on_orders((result.cancel, result.order))
+        return result
+
+    async def _find_order(
+        self, symbol: str, client_id: int, window: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the order placed with client_id, open or in the latest order history,
+        None when the exchange doesn't know it
+        """
+        order = await self.get_open_order(symbol, client_id=client_id, window=window)
+        if self.is_order(order):
+            return order
+        history = await self.get_order_history(symbol=symbol, window=window)
+        return self._matching_order(history, client_id)
 
     async def get_open_orders(
-        self, market_type: Optional[str] = None, symbol: Optional[str] = None, window: Optional[int] = None
+        self,
+        market_type: Optional[str] = None,
+        symbol: Optional[str] = None,
+        window: Optional[int] = None,
     ) -> Union[Dict[str, Any], List[Any], str]:
         """
         Returns open orders of a specified symbol
@@ -623,11 +846,14 @@ class Account(BaseAccount):
         https://docs.backpack.exchange/#tag/Order/operation/cancel_open_orders
         """
         request_config = super().cancel_all_orders(symbol=symbol, window=window)
-        return await self.http_client.delete(
+        response = await self.http_client.delete(
             url=request_config.url,
             headers=request_config.headers,
             data=request_config.data,
         )
+        if self.order_tracker is not None and isinstance(response, list):
+            self.order_tracker.on_orders(response)
+        return response
 
     async def submit_quote(
         self,
@@ -654,3 +880,292 @@ class Account(BaseAccount):
             headers=request_config.headers,
             data=request_config.data,
         )
+
+    def iter_fill_history(
+        self,
+        symbol: Optional[str] = None,
+        from_: Optional[int] = None,
+        to: Optional[int] = None,
+        fill_type: Optional[Union[FillTypeEnum, FillTypeType]] = None,
+        market_type: Optional[Union[MarketTypeEnum, MarketTypeType]] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the whole fill history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_fills
+        """
+        return self._paginate(
+            self.get_fill_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            symbol=symbol,
+            from_=from_,
+            to=to,
+            fill_type=fill_type,
+            market_type=market_type,
+            window=window,
+        )
+
+    def iter_order_history(
+        self,
+        symbol: Optional[str] = None,
+        order_id: Optional[str] = None,
+        market_type: Optional[Union[MarketTypeEnum, MarketTypeType]] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the whole order history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_order_history
+        """
+        return self._paginate(
+            self.get_order_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            symbol=symbol,
+            order_id=order_id,
+            market_type=market_type,
+            window=window,
+        )
+
+    def iter_funding_payments(
+        self,
+        subaccount_id: Optional[int] = None,
+        symbol: Optional[str] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields all funding payments, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_funding_payments
+        """
+        return self._paginate(
+            self.get_funding_payments,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            subaccount_id=subaccount_id,
+            symbol=symbol,
+            window=window,
+        )
+
+    def iter_profit_and_loss_history(
+        self,
+        subaccount_id: Optional[int] = None,
+        symbol: Optional[str] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the whole profit and loss history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_pnl_payments
+        """
+        return self._paginate(
+            self.get_profit_and_loss_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            subaccount_id=subaccount_id,
+            symbol=symbol,
+            window=window,
+        )
+
+    def iter_settlements_history(
+        self,
+        source: Optional[
+            Union[SettlementSourceFilterEnum, SettlementSourceFilterType]
+        ] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the whole settlements history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_settlements
+        """
+        return self._paginate(
+            self.get_settlements_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            source=source,
+            window=window,
+        )
+
+    def iter_borrow_history(
+        self,
+        borrow_lend_event_type: Optional[
+            Union[BorrowLendEventEnum, BorrowLendEventType]
+        ] = None,
+        sources: Optional[str] = None,
+        position_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the whole borrow history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_borrow_lend_history
+        """
+        return self._paginate(
+            self.get_borrow_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            borrow_lend_event_type=borrow_lend_event_type,
+            sources=sources,
+            position_id=position_id,
+            symbol=symbol,
+            window=window,
+        )
+
+    def iter_interest_history(
+        self,
+        asset: Optional[str] = None,
+        symbol: Optional[str] = None,
+        position_id: Optional[str] = None,
+        source: Optional[
+            Union[InterestPaymentSourceType, InterestPaymentSourceEnum]
+        ] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the whole interest history, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/History/operation/get_interest_history
+        """
+        return self._paginate(
+            self.get_interest_history,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            asset=asset,
+            symbol=symbol,
+            position_id=position_id,
+            source=source,
+            window=window,
+        )
+
+    def iter_deposits(
+        self,
+        from_: Optional[int] = None,
+        to: Optional[int] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields all account deposits, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/Capital/operation/get_deposits
+        """
+        return self._paginate(
+            self.get_deposits,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            from_=from_,
+            to=to,
+            window=window,
+        )
+
+    def iter_withdrawals(
+        self,
+        from_: Optional[int] = None,
+        to: Optional[int] = None,
+        page_size: int = 1000,
+        prefetch: bool = True,
+        concurrency: int = 1,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields all account withdrawals, fetching it page by page
+
+        https://docs.backpack.exchange/#tag/Capital/operation/get_withdrawals
+        """
+        return self._paginate(
+            self.get_withdrawals,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            from_=from_,
+            to=to,
+            window=window,
+        )
+
+    async def _paginate(
+        self,
+        fetch: Callable[..., Awaitable[Union[Dict[str, Any], List[Any], str]]],
+        page_size: int,
+        prefetch: bool,
+        concurrency: int,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields items of consecutive pages returned by fetch until a page is not full.
+        With prefetch up to concurrency pages are requested ahead as tasks.
+        """
+        if page_size <= 0 or page_size > LimitValueError.MAX:
+            raise LimitValueError
+        if not prefetch:
+            offset = 0
+            while True:
+                page = await fetch(limit=page_size, offset=offset, **kwargs)
+                if not isinstance(page, list):
+                    raise UnexpectedResponseError(page)
+                for item in page:
+                    yield item
+                if len(page) < page_size:
+                    return
+                offset += page_size
+
+        pending = deque()
+        offsets = count(0, page_size)
+        for _ in range(max(concurrency, 1)):
+            pending.append(
+                asyncio.ensure_future(
+                    fetch(limit=page_size, offset=next(offsets), **kwargs)
+                )
+            )
+        try:
+            while pending:
+                page = await pending.popleft()
+                if not isinstance(page, list):
+                    raise UnexpectedResponseError(page)
+                if len(page) == page_size:
+                    pending.append(
+                        asyncio.ensure_future(
+                            fetch(limit=page_size, offset=next(offsets), **kwargs)
+                        )
+                    )
+                for item in page:
+                    yield item
+                if len(page) < page_size:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
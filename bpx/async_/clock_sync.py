@@ -0,0 +1,41 @@
+import asyncio
+from time import perf_counter, time
+
+from bpx.base.base_clock_sync import BaseClockSync
+
+
+class ClockSync(BaseClockSync):
+    """
+    Clock offset estimator sampling an async Public client::
+
+        clock = ClockSync(public)
+        await clock.sync()
+        task = asyncio.create_task(clock.sync_periodically())
+        account = Account(public_key, secret_key, window=1000, clock=clock)
+    """
+
+    def __init__(self, public, max_samples: int = 16):
+        super().__init__(max_samples)
+        self.public = public
+
+    async def sync(self, samples: int = 4) -> float:
+        """
+        Takes samples get_time round trips and returns the new offset in milliseconds
+        """
+        for _ in range(samples):
+            sent_at = time()
+            started = perf_counter()
+            server_time = await self.public.get_time()
+            self.add_sample(sent_at, perf_counter() - started, server_time)
+        return self.offset
+
+    async def sync_periodically(self, interval: float = 30.0, samples: int = 2) -> None:
+        """
+        Samples every interval seconds until cancelled
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync(samples)
+            except Exception:
+                continue
@@ -0,0 +1,96 @@
+import asyncio
+from time import time
+from typing import Any, Optional, Union
+
+from bpx.async_.public import Public
+from bpx.base.base_history_cache import BaseHistoryCache
+from bpx.constants.enums import TimeIntervalEnum, TimeIntervalType
+from bpx.exceptions import UnexpectedResponseError
+from bpx.models.klines import KlineArrays
+
+
+class HistoryCache(BaseHistoryCache):
+    """
+    On-disk cache of klines and public trades in front of an async Public client.
+
+    Repeated backtests over the same range read memory-mapped files instead of
+    hitting the API, and a refresh only downloads what is missing::
+
+        cache = HistoryCache(Public(), "~/.cache/bpx")
+        klines = await cache.get_klines("SOL_USDC", "1m", start_time, end_time)
+        await cache.refresh_trades("SOL_USDC")
+    """
+
+    def __init__(self, public: Public, directory: str, max_concurrency: int = 4):
+        super().__init__(directory)
+        self.public = public
+        self.max_concurrency = max_concurrency
+
+    async def get_klines(
+        self,
+        symbol: str,
+        interval: Union[TimeIntervalEnum, TimeIntervalType],
+        start_time: int,
+        end_time: Optional[int] = None,
+    ) -> KlineArrays:
+        """
+        Returns klines opening in [start_time, end_time), only missing buckets are fetched
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_klines
+        """
+        end_time = int(time()) if end_time is None else end_time
+        missing = self.missing_kline_buckets(symbol, interval, start_time, end_time)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(bucket: int) -> KlineArrays:
+            async with semaphore:
+                page = await self.public.get_klines(
+                    symbol, interval, *self.kline_bucket_url_range(interval, bucket)
+                )
+            if not isinstance(page, list):
+                raise UnexpectedResponseError(page)
+            return self.store_kline_bucket(symbol, interval, bucket, page)
+
+        async with self.public.http_client:
+            stored = await asyncio.gather(*(fetch(bucket) for bucket in missing))
+        fetched = dict(zip(missing, stored))
+        return self.load_klines(symbol, interval, start_time, end_time, fetched)
+
+    async def refresh_trades(
+        self,
+        symbol: str,
+        since: Optional[int] = None,
+        page_size: int = 1000,
+        max_pages: Optional[int] = None,
+    ) -> int:
+        """
+        Downloads trades newer than the cached ones, and with since older ones
+        down to that timestamp, and returns how many were added. Without cached
+        trades and without since, only the newest page is fetched. since is a
+        timestamp in milliseconds.
+
+        New trades are stored only once the pages reach the cached ones, so a
+        refresh cut short by max_pages or an error adds nothing rather than
+        leaving a gap.
+
+        https://docs.backpack.exchange/#tag/Trades/operation/get_historical_trades
+        """
+        plan = self.refresh_plan(symbol, since, page_size, max_pages)
+        page = None
+        while True:
+            try:
+                offset = plan.send(page)
+            except StopIteration as stop:
+                return stop.value
+            page = await self.public.get_history_trades(
+                symbol, limit=page_size, offset=offset
+            )
+
+    def get_trades(
+        self, symbol: str, start_time: int, end_time: Optional[int] = None
+    ) -> Any:
+        """
+        Returns cached trades with timestamp in [start_time, end_time) as a structured array
+        """
+        end_time = int(time() * 1000) if end_time is None else end_time
+        return self.load_trades(symbol, start_time, end_time)
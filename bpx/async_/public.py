@@ -1,6 +1,22 @@
 from bpx.base.base_public import BasePublic
-from bpx.http_client.async_http_client import AsyncHttpClient
-from typing import Optional, Union, Dict, Any, List
+from bpx.http_client.lazy import LazyClient
+from bpx.models.objects import BulkResponse
+from bpx.models.klines import KlineArrays
+from bpx.exceptions import UnexpectedResponseError
+from bpx.async_.reference_cache import ReferenceCache
+from time import time
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    Union,
+    Dict,
+    Any,
+    List,
+    Callable,
+    Awaitable,
+    Iterable,
+)
+import asyncio
 
 from bpx.constants.enums import (
     TimeIntervalEnum,
@@ -9,7 +25,18 @@ from bpx.constants.enums import (
     BorrowLendMarketHistoryIntervalType,
 )
 
-default_http_client = AsyncHttpClient()
+if TYPE_CHECKING:
+    from bpx.http_client.async_http_client import AsyncHttpClient
+
+_default_http_client = LazyClient(
+    "bpx.http_client.async_http_client", "AsyncHttpClient"
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name == "default_http_client":
+        return _default_http_client.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Public(BasePublic):
@@ -17,10 +44,32 @@ class Public(BasePublic):
     def __init__(
         self,
         proxy: Optional[str] = None,
-        http_client: AsyncHttpClient = default_http_client,
+        http_client: Optional["AsyncHttpClient"] = None,
+        reference_cache: Optional[ReferenceCache] = None,
     ):
+        if http_client is None:
+            http_client = _default_http_client.get()
         self.http_client = http_client
         self.http_client.proxy = proxy
+        self._opened = 0
+        self.reference_cache = reference_cache
+
+    async def __aenter__(self) -> "Public":
+        await self.http_client.open()
+        self._opened += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Releases the pooled session opened by ``async with``, the http client
+        closes it once no one else uses it
+        """
+        if self._opened:
+            self._opened -= 1
+            await self.http_client.close()
 
     async def get_assets(self) -> Union[Dict[str, Any], List[Any], str]:
         """
@@ -28,10 +77,12 @@ class Public(BasePublic):
 
         https://docs.backpack.exchange/#tag/Markets/operation/get_assets
         """
-        return await self.http_client.get(self.get_assets_url())
+        return await self._get_reference(ReferenceCache.ASSETS, self.get_assets_url())
 
     async def get_collateral(self) -> Union[Dict[str, Any], List[Any], str]:
-        return await self.http_client.get(self.get_collateral_url())
+        return await self._get_reference(
+            ReferenceCache.COLLATERAL, self.get_collateral_url()
+        )
 
     async def get_borrow_lend_markets(self) -> Union[Dict[str, Any], List[Any], str]:
         """
@@ -39,7 +90,9 @@ class Public(BasePublic):
 
         https://docs.backpack.exchange/#tag/Borrow-Lend-Markets/operation/get_borrow_lend_markets
         """
-        return await self.http_client.get(self.get_borrow_lend_markets_url())
+        return await self._get_reference(
+            ReferenceCache.BORROW_LEND_MARKETS, self.get_borrow_lend_markets_url()
+        )
 
     async def get_borrow_lend_market_history(
         self,
@@ -63,7 +116,28 @@ class Public(BasePublic):
 
         https://docs.backpack.exchange/#tag/Markets/operation/get_markets
         """
-        return await self.http_client.get(self.get_markets_url())
+        return await self._get_reference(ReferenceCache.MARKETS, self.get_markets_url())
+
+    async def get_market(self, symbol: str) -> Union[Dict[str, Any], List[Any], str]:
+        """
+        Returns information about a specified market.
+        With a reference cache the market is resolved from the cached markets.
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_market
+        """
+        if self.reference_cache is not None:
+            await self.get_markets()
+            market = self.reference_cache.market(symbol)
+            if market is not None:
+                return market
+        return await self.http_client.get(self.get_market_url(symbol))
+
+    async def _get_reference(
+        self, name: str, url: str
+    ) -> Union[Dict[str, Any], List[Any], str]:
+        if self.reference_cache is None:
+            return await self.http_client.get(url)
+        return await self.reference_cache.get(name, lambda: self.http_client.get(url))
 
     async def get_ticker(self, symbol: str) -> Union[Dict[str, Any], List[Any], str]:
         """
@@ -105,6 +179,38 @@ class Public(BasePublic):
             self.get_klines_url(symbol, interval, start_time, end_time)
         )
 
+    async def get_klines_backfill(
+        self,
+        symbol: str,
+        interval: Union[TimeIntervalType, TimeIntervalEnum],
+        start_time: int,
+        end_time: Optional[int] = None,
+        klines: Optional[KlineArrays] = None,
+        max_concurrency: int = 4,
+    ) -> KlineArrays:
+        """
+        Returns klines of a long time range as NumPy columns, fetched in concurrent chunks.
+        When klines is given only candles from its last open time on are fetched and appended.
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_klines
+        """
+        if klines is not None and klines.last_open_time is not None:
+            start_time = max(start_time, klines.last_open_time)
+        end_time = int(time()) if end_time is None else end_time
+        urls = self.get_klines_backfill_urls(symbol, interval, start_time, end_time)
+        response = await self._fan_out(urls, self.http_client.get, max_concurrency)
+        if response.errors:
+            raise next(iter(response.errors.values()))
+        chunks = []
+        for url in urls:
+            page = response.results[url]
+            if not isinstance(page, list):
+                raise UnexpectedResponseError(page)
+            chunks.append(KlineArrays.from_klines(page))
+        if klines is not None:
+            chunks.insert(0, klines)
+        return KlineArrays.concatenate(chunks)
+
     async def get_open_interest(
         self, symbol: str
     ) -> Union[Dict[str, Any], List[Any], str]:
@@ -183,3 +289,108 @@ class Public(BasePublic):
         https://docs.backpack.exchange/#tag/Markets/operation/get_mark_prices
         """
         return await self.http_client.get(self.get_all_mark_prices_url(symbol))
+
+    async def get_ticker_many(
+        self, symbols: Iterable[str], max_concurrency: int = 16
+    ) -> BulkResponse:
+        """
+        Returns ticker information for each of the specified markets, requested concurrently
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_ticker
+        """
+        return await self._fan_out(symbols, self.get_ticker, max_concurrency)
+
+    async def get_depth_many(
+        self, symbols: Iterable[str], max_concurrency: int = 16
+    ) -> BulkResponse:
+        """
+        Returns depth for each of the specified markets, requested concurrently
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_depth
+        """
+        return await self._fan_out(symbols, self.get_depth, max_concurrency)
+
+    async def get_klines_many(
+        self,
+        symbols: Iterable[str],
+        interval: Union[TimeIntervalType, TimeIntervalEnum],
+        start_time: int,
+        end_time: Optional[int] = None,
+        max_concurrency: int = 16,
+    ) -> BulkResponse:
+        """
+        Returns klines for each of the specified markets, requested concurrently
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_klines
+        """
+        return await self._fan_out(
+            symbols,
+            lambda symbol: self.get_klines(symbol, interval, start_time, end_time),
+            max_concurrency,
+        )
+
+    async def get_all_mark_prices_many(
+        self, symbols: Iterable[str], max_concurrency: int = 16
+    ) -> BulkResponse:
+        """
+        Returns mark price, index price and funding rate for each of the specified markets
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_mark_prices
+        """
+        return await self._fan_out(symbols, self.get_all_mark_prices, max_concurrency)
+
+    async def get_open_interest_many(
+        self, symbols: Iterable[str], max_concurrency: int = 16
+    ) -> BulkResponse:
+        """
+        Returns open interest for each of the specified markets, requested concurrently
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_open_interest
+        """
+        return await self._fan_out(symbols, self.get_open_interest, max_concurrency)
+
+    async def get_recent_trades_many(
+        self, symbols: Iterable[str], limit: int = 100, max_concurrency: int = 16
+    ) -> BulkResponse:
+        """
+        Returns recent trades for each of the specified markets, requested concurrently
+
+        https://docs.backpack.exchange/#tag/Trades
+        """
+        return await self._fan_out(
+            symbols,
+            lambda symbol: self.get_recent_trades(symbol, limit),
+            max_concurrency,
+        )
+
+    async def _fan_out(
+        self,
+        keys: Iterable[str],
+        request: Callable[[str], Awaitable[Any]],
+        max_concurrency: int,
+    ) -> BulkResponse:
+        """
+        Runs request for every key (usually a symbol) with at most max_concurrency in flight.
+        The calls hold the client's pooled session, opening it if no one else
+        has. Exceptions and exchange error bodies go to errors.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(key: str) -> Any:
+            async with semaphore:
+                return await request(key)
+
+        keys = list(dict.fromkeys(keys))
+        async with self.http_client:
+            outcomes = await asyncio.gather(
+                *(run(key) for key in keys), return_exceptions=True
+            )
+        response = BulkResponse()
+        for key, outcome in zip(keys, outcomes):
+            if isinstance(outcome, Exception):
+                response.errors[key] = outcome
+            elif self.is_error(outcome):
+                response.errors[key] = UnexpectedResponseError(outcome)
+            else:
+                response.results[key] = outcome
+        return response
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from bpx.base.base_reference_cache import BaseReferenceCache
+
+
+class ReferenceCache(BaseReferenceCache):
+    """
+    Reference data cache for the async Public client.
+
+    Concurrent misses of one endpoint await a single request, and refreshes
+    ahead of expiry run as a background task::
+
+        public = Public(reference_cache=ReferenceCache(ttl={"markets": 60}))
+        await public.get_market("SOL_USDC")  # fetches markets once, then resolves locally
+    """
+
+    def __init__(
+        self, ttl: Optional[Dict[str, float]] = None, refresh_ahead: float = 0.8
+    ):
+        super().__init__(ttl, refresh_ahead)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, name: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached value of an endpoint, awaiting fetch when it's missing or expired
+        """
+        fresh, due, value = self.lookup(name)
+        if fresh:
+            if due and name not in self._inflight:
+                self._start(name, fetch).add_done_callback(self._ignore_error)
+            return value
+        task = self._inflight.get(name) or self._start(name, fetch)
+        # shielded so a cancelled caller doesn't cancel the request others wait on
+        return await asyncio.shield(task)
+
+    def _start(self, name: str, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        async def refresh() -> Any:
+            try:
+                return self.store(name, await fetch())
+            finally:
+                self._inflight.pop(name, None)
+
+        task = asyncio.ensure_future(refresh())
+        self._inflight[name] = task
+        return task
+
+    @staticmethod
+    def _ignore_error(task: asyncio.Task) -> None:
+        if not task.cancelled():
+            task.exception()
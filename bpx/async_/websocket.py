@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import ssl
+from collections import deque
+from typing import Optional, Dict, Any, AsyncIterator, Deque, Iterable
+
+import aiohttp
+
+from bpx.async_.account import Account
+from bpx.base.base_websocket import BaseWebSocket
+from bpx.http_client.json_codec import JsonCodec, default_codec
+
+logger = logging.getLogger(__name__)
+
+
+class PublicWebSocket(BaseWebSocket):
+    """
+    Streams public market data over one websocket connection.
+
+    Any number of streams can be subscribed; the connection is re-established
+    with exponential backoff whenever it drops, and every active subscription
+    is sent again after reconnecting.
+
+    Usage::
+
+        async with PublicWebSocket() as ws:
+            await ws.subscribe(ws.depth_stream("SOL_USDC"), ws.trade_stream("SOL_USDC"))
+            async for message in ws:
+                print(message["stream"], message["data"])
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        proxy: Optional[str] = None,
+        heartbeat: Optional[float] = 30.0,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        max_reconnect_attempts: Optional[int] = None,
+        json_codec: Optional[JsonCodec] = None,
+    ):
+        self.url = url or self.WS_URL
+        self.json_codec = default_codec() if json_codec is None else json_codec
+        self.proxy = proxy
+        self.heartbeat = heartbeat
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_reconnect_attempts = max_reconnect_attempts
+        # dict keeps subscription order stable when resubscribing
+        self.subscriptions: Dict[str, None] = {}
+        self.reconnects = 0
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._closed = False
+        self._has_connected = False
+        self._pending: Deque[Dict[str, Any]] = deque()
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def connect(self) -> None:
+        """
+        Opens the connection and sends all active subscriptions
+        """
+        self._closed = False
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        if self.url.startswith("wss://") and self._ssl_context is None:
+            import certifi
+
+            self._ssl_context = ssl.create_default_context(cafile=certifi.where())
+        kwargs = {"ssl": self._ssl_context} if self._ssl_context is not None else {}
+        self._ws = await self._session.ws_connect(
+            self.url, proxy=self.proxy, heartbeat=self.heartbeat, **kwargs
+        )
+        self._has_connected = True
+        if self.subscriptions:
+            await self._send(self.subscribe_message(self.subscriptions))
+
+    async def close(self) -> None:
+        """
+        Closes the connection; iteration stops instead of reconnecting
+        """
+        self._closed = True
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def subscribe(self, *streams: str) -> None:
+        """
+        Subscribes to the given streams, they are resubscribed after every reconnect
+        """
+        new_streams = [stream for stream in streams if stream not in self.subscriptions]
+        self.subscriptions.update(dict.fromkeys(new_streams))
+        if new_streams and self.connected:
+            await self._send(self.subscribe_message(new_streams))
+
+    async def unsubscribe(self, *streams: str) -> None:
+        """
+        Unsubscribes from the given streams
+        """
+        old_streams = [stream for stream in streams if stream in self.subscriptions]
+        for stream in old_streams:
+            del self.subscriptions[stream]
+        if old_streams and self.connected:
+            await self._send(self.unsubscribe_message(old_streams))
+
+    async def _send(self, message: dict) -> None:
+        await self._ws.send_str(self.json_codec.dumps(message))
+
+    async def _reconnect(self) -> None:
+        is_reconnect = self._has_connected
+        delay = self.reconnect_delay
+        attempts = 0
+        while not self._closed:
+            try:
+                await self.connect()
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+                attempts += 1
+                if (
+                    self.max_reconnect_attempts is not None
+                    and attempts >= self.max_reconnect_attempts
+                ):
+                    raise
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            else:
+                if is_reconnect:
+                    self.reconnects += 1
+                    await self._on_reconnect()
+                return
+
+    async def _on_reconnect(self) -> None:
+        """
+        Called after the connection was re-established and streams were resubscribed
+        """
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        while not self._closed:
+            if self._pending:
+                yield self._pending.popleft()
+                continue
+            if not self.connected:
+                await self._reconnect()
+                continue
+            frame = await self._ws.receive()
+            if frame.type == aiohttp.WSMsgType.TEXT:
+                yield self.json_codec.loads(frame.data)
+            elif frame.type in (
+                aiohttp.WSMsgType.CLOSE,
+                aiohttp.WSMsgType.CLOSING,
+                aiohttp.WSMsgType.CLOSED,
+                aiohttp.WSMsgType.ERROR,
+            ):
+                self._ws = None
+
+
+class AccountWebSocket(PublicWebSocket):
+    """
+    Streams private order, fill and position updates of an account.
+
+    Subscriptions are signed with the account key the same way REST requests
+    are. After every reconnect the open orders and positions are fetched over
+    REST and yielded as one ``account.snapshot`` message, so updates missed
+    while disconnected can be reconciled. Updates received right after the
+    snapshot may predate it. A failed snapshot is logged and retried with the
+    reconnect backoff.
+
+    Usage::
+
+        async with AccountWebSocket(account) as ws:
+            await ws.subscribe(ws.order_update_stream(), ws.position_update_stream())
+            async for message in ws:
+                ...
+    """
+
+    SNAPSHOT_STREAM = "account.snapshot"
+
+    def __init__(
+        self,
+        account: Account,
+        url: Optional[str] = None,
+        window: Optional[int] = None,
+        proxy: Optional[str] = None,
+        heartbeat: Optional[float] = 30.0,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        max_reconnect_attempts: Optional[int] = None,
+        json_codec: Optional[JsonCodec] = None,
+    ):
+        super().__init__(
+            url=url,
+            proxy=proxy,
+            heartbeat=heartbeat,
+            reconnect_delay=reconnect_delay,
+            max_reconnect_delay=max_reconnect_delay,
+            max_reconnect_attempts=max_reconnect_attempts,
+            json_codec=json_codec,
+        )
+        self.account = account
+        self.window = account.window if window is None else window
+
+    def subscribe_message(self, streams: Iterable[str]) -> dict:
+        """
+        Returns subscribe message signed with the account key
+        """
+        message = super().subscribe_message(streams)
+        timestamp = self.account._timestamp()
+        signature = self.account._sign({}, "subscribe", timestamp, self.window)
+        message["signature"] = [
+            self.account.public_key,
+            signature,
+            str(timestamp),
+            str(self.window),
+        ]
+        return message
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns open orders and open positions fetched over REST
+        """
+        orders, positions = await asyncio.gather(
+            self.account.get_open_orders(), self.account.get_open_positions()
+        )
+        return {
+            "stream": self.SNAPSHOT_STREAM,
+            "data": {"orders": orders, "positions": positions},
+        }
+
+    async def _on_reconnect(self) -> None:
+        delay = self.reconnect_delay
+        attempts = 0
+        while not self._closed:
+            try:
+                snapshot = await self.snapshot()
+            except Exception as error:
+                attempts += 1
+                if (
+                    self.max_reconnect_attempts is not None
+                    and attempts >= self.max_reconnect_attempts
+                ):
+                    raise
+                logger.warning(
+                    "account snapshot failed, retrying in %.2fs: %r", delay, error
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            else:
+                self._pending.append(snapshot)
+                return
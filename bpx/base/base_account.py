@@ -1,11 +1,26 @@
-from cryptography.hazmat.primitives.asymmetric import ed25519
 import base64
-from typing import Optional, Union
-from bpx.models.objects import RequestConfiguration
-from time import time
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    Union,
+    Iterable,
+    Tuple,
+    List,
+    Dict,
+    Any,
+    Callable,
+)
+from bpx.models.objects import RequestConfiguration, BulkResponse
+from bpx.http_client.deadline import remaining
+from bpx.http_client.metrics import Instrumentation
+from time import time, perf_counter
 from bpx.exceptions import *
 from bpx.constants.enums import *
 
+if TYPE_CHECKING:
+    from bpx.models.order_validator import OrderValidator
+    from bpx.base.base_clock_sync import BaseClockSync
+
 
 class BaseAccount:
     """
@@ -15,7 +30,17 @@ class BaseAccount:
 
     BPX_API_URL = "https://api.backpack.exchange/"
 
-    def __init__(self, public_key: str, secret_key: str, window: int, debug: bool):
+    def __init__(
+        self,
+        public_key: str,
+        secret_key: str,
+        window: int,
+        debug: bool,
+        order_validator: Optional["OrderValidator"] = None,
+        clock: Optional["BaseClockSync"] = None,
+    ):
+        # cryptography is only needed once there is a key to sign with
+        from cryptography.hazmat.primitives.asymmetric import ed25519
 
         self.private_key = ed25519.Ed25519PrivateKey.from_private_bytes(
             base64.b64decode(secret_key)
@@ -23,6 +48,12 @@ class BaseAccount:
         self.public_key = public_key
         self.window = window
         self.debug = debug
+        self.order_validator = order_validator
+        self.clock = clock
+        self._header_template = {
+            "X-API-Key": public_key,
+            "Content-Type": "application/json; charset=utf-8",
+        }
 
     def get_account(self, window: Optional[int] = None) -> RequestConfiguration:
         """
@@ -618,6 +649,73 @@ class BaseAccount:
 
         https://docs.backpack.exchange/#tag/Order/operation/execute_order
         """
+        params = self._order_params(
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            time_in_force=time_in_force,
+            quantity=quantity,
+            price=price,
+            trigger_price=trigger_price,
+            self_trade_prevention=self_trade_prevention,
+            quote_quantity=quote_quantity,
+            client_id=client_id,
+            post_only=post_only,
+            reduce_only=reduce_only,
+            auto_borrow=auto_borrow,
+            auto_borrow_repay=auto_borrow_repay,
+            auto_lend=auto_lend,
+            auto_lend_redeem=auto_lend_redeem,
+            stop_loss_limit_price=stop_loss_limit_price,
+            stop_loss_trigger_by=stop_loss_trigger_by,
+            stop_loss_trigger_price=stop_loss_trigger_price,
+            take_profit_limit_price=take_profit_limit_price,
+            take_profit_trigger_by=take_profit_trigger_by,
+            take_profit_trigger_price=take_profit_trigger_price,
+            triggered_by=triggered_by,
+            trigger_quantity=trigger_quantity,
+        )
+        headers = self._headers(params, "orderExecute", window=window)
+        url = self.BPX_API_URL + "api/v1/order"
+        request_config = RequestConfiguration(url=url, headers=headers, data=params)
+        return request_config
+
+    def _order_params(
+        self,
+        symbol: str,
+        side: str,
+        order_type: Union[OrderTypeEnum, OrderTypeType],
+        time_in_force: Optional[Union[TimeInForceEnum, TimeInForceType]] = None,
+        quantity: Optional[str] = None,
+        price: Optional[str] = None,
+        trigger_price: Optional[str] = None,
+        self_trade_prevention: Optional[
+            Union[SelfTradePreventionEnum, SelfTradePreventionType]
+        ] = None,
+        quote_quantity: Optional[str] = None,
+        client_id: Optional[int] = None,
+        post_only: Optional[bool] = None,
+        reduce_only: Optional[bool] = None,
+        auto_borrow: Optional[bool] = None,
+        auto_borrow_repay: Optional[bool] = None,
+        auto_lend: Optional[bool] = None,
+        auto_lend_redeem: Optional[bool] = None,
+        stop_loss_limit_price: Optional[str] = None,
+        stop_loss_trigger_by: Optional[str] = None,
+        stop_loss_trigger_price: Optional[str] = None,
+        take_profit_limit_price: Optional[str] = None,
+        take_profit_trigger_by: Optional[str] = None,
+        take_profit_trigger_price: Optional[str] = None,
+        triggered_by: Optional[str] = None,
+        trigger_quantity: Optional[str] = None,
+    ) -> dict:
+        """
+        Returns the validated request parameters of a new order
+        """
+        if self.order_validator is not None:
+            quantity, price, trigger_price = self.order_validator.validate(
+                symbol, side, quantity, price, trigger_price, quote_quantity
+            )
 
         params = {
             "symbol": symbol,
@@ -653,7 +751,7 @@ class BaseAccount:
             params["timeInForce"] = time_in_force
         elif time_in_force:
             raise InvalidTimeInForceValue(time_in_force)
-        if client_id:
+        if client_id is not None:
             params["clientId"] = client_id
         if reduce_only:
             params["reduceOnly"] = reduce_only
@@ -681,10 +779,7 @@ class BaseAccount:
             params["takeProfitTriggerBy"] = take_profit_trigger_by
         if take_profit_trigger_price:
             params["takeProfitTriggerPrice"] = take_profit_trigger_price
-        headers = self._headers(params, "orderExecute", window=window)
-        url = self.BPX_API_URL + "api/v1/order"
-        request_config = RequestConfiguration(url=url, headers=headers, data=params)
-        return request_config
+        return params
 
     def cancel_order(
         self,
@@ -698,16 +793,121 @@ class BaseAccount:
 
         https://docs.backpack.exchange/#tag/Order/operation/cancel_order
         """
-        params = {"symbol": symbol}
-        if order_id:
-            params["orderId"] = order_id
-        if client_id:
-            params["clientId"] = str(client_id)
+        params = self._cancel_params(symbol, order_id, client_id)
         headers = self._headers(params, "orderCancel", window=window)
         url = self.BPX_API_URL + "api/v1/order"
         request_config = RequestConfiguration(url=url, headers=headers, data=params)
         return request_config
 
+    @staticmethod
+    def _cancel_params(
+        symbol: str, order_id: Optional[str] = None, client_id: Optional[int] = None
+    ) -> dict:
+        params = {"symbol": symbol}
+        if order_id is not None:
+            params["orderId"] = order_id
+        if client_id is not None:
+            params["clientId"] = str(client_id)
+        return params
+
+    def execute_orders(
+        self, orders: Iterable[Dict[str, Any]], window: Optional[int] = None
+    ) -> RequestConfiguration:
+        """
+        Returns the url, headers and request parameters for placing several orders in one request.
+        Every order is a dict of execute_order keyword arguments, all of them are
+        covered by one signature. Raises ValueError for an empty batch.
+
+        https://docs.backpack.exchange/#tag/Order/operation/execute_order_batch
+        """
+        params = [self._order_params(**order) for order in orders]
+        if not params:
+            raise ValueError("execute_orders needs at least one order")
+        headers = self._headers(params, "orderExecute", window=window)
+        url = self.BPX_API_URL + "api/v1/orders"
+        return RequestConfiguration(url=url, headers=headers, data=params)
+
+    def cancel_orders(
+        self, cancels: Iterable[Dict[str, Any]], window: Optional[int] = None
+    ) -> List[RequestConfiguration]:
+        """
+        Returns one request configuration per cancel, signed with one shared timestamp.
+        Every cancel is a dict with symbol and order_id or client_id.
+
+        https://docs.backpack.exchange/#tag/Order/operation/cancel_order
+        """
+        params = [self._cancel_params(**cancel) for cancel in cancels]
+        headers = self.sign_many(((item, "orderCancel") for item in params), window)
+        url = self.BPX_API_URL + "api/v1/order"
+        return [
+            RequestConfiguration(url=url, headers=item_headers, data=item)
+            for item, item_headers in zip(params, headers)
+        ]
+
+    def _retry_options(
+        self,
+        request_config: RequestConfiguration,
+        instruction: str,
+        window: Optional[int],
+        dedupe: Optional[Callable[[], Any]] = None,
+    ) -> dict:
+        """
+        Returns resign and dedupe callbacks for an http client with a retry policy
+        """
+        if getattr(self.http_client, "retry_policy", None) is None:
+            return {}
+        options = {
+            "resign": lambda: self._headers(request_config.data, instruction, window)
+        }
+        if dedupe is not None:
+            options["dedupe"] = dedupe
+        return options
+
+    @staticmethod
+    def _matching_order(orders: Any, client_id: int) -> Optional[dict]:
+        """
+        Returns the order with client_id from an order history page
+        """
+        if not isinstance(orders, list):
+            return None
+        for order in orders:
+            if isinstance(order, dict) and str(order.get("clientId")) == str(client_id):
+                return order
+        return None
+
+    @staticmethod
+    def is_order(response: Any) -> bool:
+        """
+        Returns whether a response is an order rather than an error
+        """
+        return isinstance(response, dict) and "id" in response
+
+    @staticmethod
+    def order_key(params: dict) -> Optional[Union[int, str]]:
+        """
+        Returns the id an order is known by: its client id, or its order id without one
+        """
+        if params.get("clientId") is not None:
+            return int(params["clientId"])
+        return params.get("orderId")
+
+    @classmethod
+    def bulk_response(cls, params: List[dict], responses: List[Any]) -> BulkResponse:
+        """
+        Returns results keyed by position, with the order_key of every position in ids.
+        Responses that are not orders go to errors
+        """
+        response = BulkResponse()
+        for index, (item, outcome) in enumerate(zip(params, responses)):
+            response.ids[index] = cls.order_key(item)
+            if cls.is_order(outcome):
+                response.results[index] = outcome
+            elif isinstance(outcome, BaseException):
+                response.errors[index] = outcome
+            else:
+                response.errors[index] = UnexpectedResponseError(outcome)
+        return response
+
     def get_open_orders(
         self,
         market_type: Optional[str] = None,
@@ -768,40 +968,126 @@ class BaseAccount:
         request_config = RequestConfiguration(url=url, headers=headers, data=params)
         return request_config
 
-    def _headers(self, params: dict, instruction: str, window: Optional[int]) -> dict:
+    def _window(self, window: Optional[int]) -> int:
         """
-        Returns headers for the given instruction and params
+        Returns the signature window, cut to the time left on the current deadline
         """
         window = self.window if window is None else window
-        timestamp = int(time() * 1e3)
-        encoded_signature = self._sign(params, instruction, timestamp, window)
-        headers = {
-            "X-API-Key": self.public_key,
-            "X-Signature": encoded_signature,
-            "X-Timestamp": str(timestamp),
-            "X-Window": str(window),
-            "Content-Type": "application/json; charset=utf-8",
-        }
+        left = remaining()
+        if left is not None:
+            window = min(window, max(1, int(left * 1e3)))
+        return window
+
+    def _headers(
+        self, params: Union[dict, List[dict]], instruction: str, window: Optional[int]
+    ) -> dict:
+        """
+        Returns headers for the given instruction and params
+        """
+        instrumentation = self._instrumentation()
+        if instrumentation is not None:
+            started = perf_counter()
+        window = self._window(window)
+        timestamp = self._timestamp()
+        headers = self._header_template.copy()
+        headers["X-Signature"] = self._sign(params, instruction, timestamp, window)
+        headers["X-Timestamp"] = str(timestamp)
+        headers["X-Window"] = str(window)
         if self.debug:
             print(headers)
+        if instrumentation is not None:
+            instrumentation.record(
+                Instrumentation.HEADERS, instruction, perf_counter() - started
+            )
         return headers
 
-    def _sign(self, params: dict, instruction: str, timestamp: int, window: int):
+    def _timestamp(self) -> int:
+        """
+        Returns the timestamp to sign, the exchange time estimated by the clock if there is one
+        """
+        if self.clock is None:
+            return int(time() * 1e3)
+        return self.clock.now()
+
+    def _instrumentation(self) -> Optional[Instrumentation]:
+        """
+        Returns the instrumentation of the account's http client, if any
+        """
+        return getattr(getattr(self, "http_client", None), "instrumentation", None)
+
+    def sign_many(
+        self,
+        requests: Iterable[Tuple[dict, str]],
+        window: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Returns headers for every (params, instruction) pair, signed with one shared timestamp
+        """
+        window = self._window(window)
+        timestamp = self._timestamp()
+        template = self._header_template
+        timestamp_str = str(timestamp)
+        window_str = str(window)
+        signed = []
+        for params, instruction in requests:
+            headers = template.copy()
+            headers["X-Signature"] = self._sign(params, instruction, timestamp, window)
+            headers["X-Timestamp"] = timestamp_str
+            headers["X-Window"] = window_str
+            signed.append(headers)
+        return signed
+
+    def _sign(
+        self,
+        params: Union[dict, List[dict]],
+        instruction: str,
+        timestamp: int,
+        window: int,
+    ):
         """
         Returns encoded signature for given parameters, instruction, timestamp and window
         """
-        sign_str = f"instruction={instruction}"
-        sorted_params_list = []
-        for key, value in sorted(params.items()):
-            if isinstance(value, bool):
-                value = str(value).lower()
-            sorted_params_list.append(f"{key}={value}")
-        sorted_params = "&".join(sorted_params_list)
-        if sorted_params:
-            sign_str += "&" + sorted_params
-        sign_str += f"&timestamp={timestamp}&window={window}"
+        instrumentation = self._instrumentation()
+        if instrumentation is not None:
+            started = perf_counter()
+        sign_str = self._signing_payload(params, instruction, timestamp, window)
         if self.debug:
             print(sign_str)
         signature_bytes = self.private_key.sign(sign_str.encode())
-        encoded_signature = base64.b64encode(signature_bytes).decode()
-        return encoded_signature
+        signature = base64.b64encode(signature_bytes).decode()
+        if instrumentation is not None:
+            instrumentation.record(
+                Instrumentation.SIGN, instruction, perf_counter() - started
+            )
+        return signature
+
+    @staticmethod
+    def _signing_payload(
+        params: Union[dict, List[dict]], instruction: str, timestamp: int, window: int
+    ) -> str:
+        """
+        Returns the string to sign: instruction, params sorted by key, timestamp and window.
+        A list of params, as in a batch, gets one instruction and params part per item
+        """
+        if isinstance(params, list):
+            payload = "&".join(
+                BaseAccount._params_payload(item, instruction) for item in params
+            )
+        else:
+            payload = BaseAccount._params_payload(params, instruction)
+        return f"{payload}&timestamp={timestamp}&window={window}"
+
+    @staticmethod
+    def _params_payload(params: dict, instruction: str) -> str:
+        """
+        Returns instruction and params sorted by key, as they appear in the string to sign
+        """
+        parts = [f"instruction={instruction}"]
+        for key in sorted(params):
+            value = params[key]
+            if value is True:
+                value = "true"
+            elif value is False:
+                value = "false"
+            parts.append(f"{key}={value}")
+        return "&".join(parts)
@@ -0,0 +1,75 @@
+import threading
+from collections import deque
+from time import time
+from typing import Any, Deque, List, Optional, Tuple
+
+from bpx.exceptions import UnexpectedResponseError
+
+
+def _median(values: List[float]) -> float:
+    # statistics.median would import fractions and decimal with it
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+class BaseClockSync:
+    """
+    Estimates the offset of the exchange clock from the local one.
+
+    Every sample is a get_time request: the server time is compared to the
+    local time halfway through the round trip. The slower half of the kept
+    samples is dropped, as queueing makes their midpoint unreliable, and the
+    offset is the median of the rest.
+
+    Give it to an Account as clock and signed requests are stamped with
+    ``now()``, the local time corrected by the offset, so a tight window
+    holds up on a drifting local clock.
+    """
+
+    def __init__(self, max_samples: int = 16):
+        self.offset = 0.0
+        self.rtt: Optional[float] = None
+        self.uncertainty: Optional[float] = None
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def now(self) -> int:
+        """
+        Returns the estimated exchange time in milliseconds
+        """
+        return int(time() * 1e3 + self.offset)
+
+    def add_sample(self, sent_at: float, rtt: float, server_time: Any) -> None:
+        """
+        Adds a get_time response, sent at sent_at (time() in seconds) and received
+        rtt seconds later
+        """
+        server_ms = self.parse_server_time(server_time)
+        offset = server_ms - (sent_at + rtt / 2) * 1e3
+        with self._lock:
+            self._samples.append((rtt * 1e3, offset))
+            samples = sorted(self._samples)
+        best = samples[: max(1, len(samples) // 2)]
+        self.offset = _median([offset for _, offset in best])
+        self.rtt = _median([rtt for rtt, _ in samples])
+        self.uncertainty = samples[0][0] / 2
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+        self.offset = 0.0
+        self.rtt = None
+        self.uncertainty = None
+
+    @staticmethod
+    def parse_server_time(response: Any) -> int:
+        """
+        Returns the milliseconds of a get_time response, a json number or its text
+        """
+        try:
+            return int(response)
+        except (TypeError, ValueError):
+            raise UnexpectedResponseError(response) from None
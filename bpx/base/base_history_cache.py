@@ -0,0 +1,361 @@
+import os
+from time import time
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
+
+from bpx.constants.enums import *
+from bpx.exceptions import *
+from bpx.models.klines import KlineArrays, _numpy
+
+
+class BaseHistoryCache:
+    """
+    Stores klines and trades on disk as memory-mapped NumPy record files.
+
+    Klines are kept in one file per symbol, interval and bucket, where a
+    bucket spans exactly the candles one request can return. Only buckets
+    whose candles are all closed are written, so cached buckets never
+    change and the current bucket is always fetched again. Trades are kept in
+    one file per symbol and UTC day.
+
+    Files are opened with ``mmap_mode="r"``: a read covered by one bucket is
+    a view of the mapped file, reads spanning several buckets are joined into
+    one new array.
+    """
+
+    KLINES_PER_BUCKET = 1000
+    TRADES_BUCKET_MS = 24 * 60 * 60 * 1000
+
+    def __init__(self, directory: str):
+        self.directory = os.path.expanduser(directory)
+
+    @staticmethod
+    def trade_dtype() -> Any:
+        np = _numpy()
+        return np.dtype(
+            [
+                ("id", np.int64),
+                ("timestamp", np.int64),
+                ("price", np.float64),
+                ("quantity", np.float64),
+                ("quote_quantity", np.float64),
+                ("is_buyer_maker", np.bool_),
+            ]
+        )
+
+    def kline_bucket_span(
+        self, interval: Union[TimeIntervalEnum, TimeIntervalType]
+    ) -> int:
+        if not TimeIntervalEnum.has_value(interval):
+            raise InvalidTimeIntervalError(interval)
+        return TIME_INTERVAL_SECONDS[str(interval)] * self.KLINES_PER_BUCKET
+
+    def kline_buckets(
+        self,
+        interval: Union[TimeIntervalEnum, TimeIntervalType],
+        start_time: int,
+        end_time: int,
+    ) -> List[int]:
+        """
+        Returns start times of the buckets covering [start_time, end_time)
+        """
+        if start_time < 0:
+            raise NegativeValueError("start_time")
+        span = self.kline_bucket_span(interval)
+        first = start_time - start_time % span
+        return list(range(first, end_time, span))
+
+    def kline_path(
+        self,
+        symbol: str,
+        interval: Union[TimeIntervalEnum, TimeIntervalType],
+        bucket: int,
+    ) -> str:
+        return os.path.join(
+            self.directory, "klines", symbol, str(interval), f"{bucket}.npy"
+        )
+
+    def trade_path(self, symbol: str, bucket: int) -> str:
+        return os.path.join(self.directory, "trades", symbol, f"{bucket}.npy")
+
+    def is_closed(
+        self,
+        interval: Union[TimeIntervalEnum, TimeIntervalType],
+        bucket: int,
+        now: Optional[float] = None,
+    ) -> bool:
+        """
+        Returns whether every candle of the bucket is closed, so it can be stored
+        """
+        now = time() if now is None else now
+        return bucket + self.kline_bucket_span(interval) <= now
+
+    def missing_kline_buckets(
+        self,
+        symbol: str,
+        interval: Union[TimeIntervalEnum, TimeIntervalType],
+        start_time: int,
+        end_time: int,
+    ) -> List[int]:
+        """
+        Returns the buckets of the range that are not on disk yet
+        """
+        return [
+            bucket
+            for bucket in self.kline_buckets(interval, start_time, end_time)
+            if not os.path.exists(self.kline_path(symbol, interval, bucket))
+        ]
+
+    def kline_bucket_url_range(
+        self, interval: Union[TimeIntervalEnum, TimeIntervalType], bucket: int
+    ) -> Tuple[int, int]:
+        """
+        Returns the start_time and end_time to request a bucket with
+        """
+        return bucket, bucket + self.kline_bucket_span(interval)
+
+    def store_kline_bucket(
+        self,
+        symbol: str,
+        interval: Union[TimeIntervalEnum, TimeIntervalType],
+        bucket: int,
+        klines: List[Dict[str, Any]],
+        now: Optional[float] = None,
+    ) -> KlineArrays:
+        """
+        Returns the candles of a fetched bucket and writes them to disk if the bucket is closed
+        """
+        span = self.kline_bucket_span(interval)
+        arrays = KlineArrays.from_klines(klines)
+        inside = (arrays.open_time >= bucket) & (arrays.open_time < bucket + span)
+        records = arrays.to_records()[inside]
+        if self.is_closed(interval, bucket, now):
+            self._save(self.kline_path(symbol, interval, bucket), records)
+        return KlineArrays.from_records(records)
+
+    def load_klines(
+        self,
+        symbol: str,
+        interval: Union[TimeIntervalEnum, TimeIntervalType],
+        start_time: int,
+        end_time: int,
+        fetched: Optional[Dict[int, KlineArrays]] = None,
+    ) -> KlineArrays:
+        """
+        Returns candles opening in [start_time, end_time) from disk and freshly fetched buckets
+        """
+        np = _numpy()
+        fetched = fetched or {}
+        parts = []
+        for bucket in self.kline_buckets(interval, start_time, end_time):
+            if bucket in fetched:
+                records = fetched[bucket].to_records()
+            else:
+                path = self.kline_path(symbol, interval, bucket)
+                if not os.path.exists(path):
+                    continue
+                records = np.load(path, mmap_mode="r")
+            open_time = records["open_time"]
+            low = np.searchsorted(open_time, start_time, side="left")
+            high = np.searchsorted(open_time, end_time, side="left")
+            if high > low:
+                parts.append(records[low:high])
+        if not parts:
+            return KlineArrays()
+        if len(parts) == 1:
+            return KlineArrays.from_records(parts[0])
+        return KlineArrays.from_records(np.concatenate(parts))
+
+    def trade_records(self, trades: List[Dict[str, Any]]) -> Any:
+        np = _numpy()
+        records = np.empty(len(trades), dtype=self.trade_dtype())
+        records["id"] = [int(trade["id"]) for trade in trades]
+        records["timestamp"] = [int(trade["timestamp"]) for trade in trades]
+        records["price"] = [trade["price"] for trade in trades]
+        records["quantity"] = [trade["quantity"] for trade in trades]
+        records["quote_quantity"] = [
+            trade.get("quoteQuantity") or "nan" for trade in trades
+        ]
+        records["is_buyer_maker"] = [
+            bool(trade.get("isBuyerMaker")) for trade in trades
+        ]
+        return records
+
+    def trade_buckets(self, symbol: str) -> List[int]:
+        directory = os.path.join(self.directory, "trades", symbol)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            int(name[: -len(".npy")])
+            for name in os.listdir(directory)
+            if name.endswith(".npy")
+        )
+
+    def newest_trade_id(self, symbol: str) -> Optional[int]:
+        buckets = self.trade_buckets(symbol)
+        if not buckets:
+            return None
+        np = _numpy()
+        records = np.load(self.trade_path(symbol, buckets[-1]), mmap_mode="r")
+        return int(records["id"][-1]) if len(records) else None
+
+    def oldest_trade(self, symbol: str) -> Optional[Tuple[int, int]]:
+        """
+        Returns id and timestamp of the oldest cached trade
+        """
+        buckets = self.trade_buckets(symbol)
+        if not buckets:
+            return None
+        np = _numpy()
+        records = np.load(self.trade_path(symbol, buckets[0]), mmap_mode="r")
+        if not len(records):
+            return None
+        return int(records["id"][0]), int(records["timestamp"][0])
+
+    def trade_count(self, symbol: str) -> int:
+        np = _numpy()
+        return sum(
+            len(np.load(self.trade_path(symbol, bucket), mmap_mode="r"))
+            for bucket in self.trade_buckets(symbol)
+        )
+
+    @staticmethod
+    def reached_cached_trades(
+        page: List[Dict[str, Any]],
+        page_size: int,
+        newest_id: Optional[int],
+        since: Optional[int],
+    ) -> bool:
+        """
+        Returns whether paging back in time can stop after this page
+        """
+        if len(page) < page_size:
+            return True
+        if newest_id is not None:
+            return min(int(trade["id"]) for trade in page) <= newest_id
+        if since is not None:
+            return min(int(trade["timestamp"]) for trade in page) < since
+        return True
+
+    def refresh_plan(
+        self,
+        symbol: str,
+        since: Optional[int],
+        page_size: int,
+        max_pages: Optional[int],
+    ) -> Generator[int, Any, int]:
+        """
+        Drives a trade refresh: yields the offset of the next page to fetch, is
+        sent that page and returns how many trades were added.
+
+        Pages newer than the cache are buffered and stored once they reach the
+        cached trades, so a refresh cut short by max_pages or an error never
+        leaves a gap behind the cache. With since older than the cache, pages
+        below the oldest cached trade are then stored one by one, each one
+        overlapping what is already stored.
+        """
+        newest_id = self.newest_trade_id(symbol)
+        cached = self.trade_count(symbol)
+        pages = 0
+        offset = 0
+        newer: List[Dict[str, Any]] = []
+        complete = False
+        exhausted = False
+        while max_pages is None or pages < max_pages:
+            page = self._trade_page((yield offset))
+            pages += 1
+            newer.extend(page)
+            if self.reached_cached_trades(page, page_size, newest_id, since):
+                complete = True
+                exhausted = len(page) < page_size
+                break
+            offset += page_size
+        if not complete and newest_id is not None:
+            return 0
+        added = self.store_trades(symbol, newer)
+        oldest = self.oldest_trade(symbol)
+        if since is None or oldest is None or oldest[1] < since or exhausted:
+            return added
+        oldest_id = oldest[0]
+        newer_count = sum(
+            1 for trade in newer if newest_id is None or int(trade["id"]) > newest_id
+        )
+        # offset of the oldest cached trade, the first page overlaps the cache
+        offset = max(newer_count + cached - 1, 0)
+        anchored = False
+        while max_pages is None or pages < max_pages:
+            page = self._trade_page((yield offset))
+            pages += 1
+            if not page:
+                break
+            # later pages follow the stored one, new trades only make them overlap
+            if not anchored and max(int(trade["id"]) for trade in page) < oldest_id:
+                # fewer trades above the cache than counted, step back to overlap it
+                if offset == 0:
+                    break
+                offset = max(offset - page_size, 0)
+                continue
+            anchored = True
+            added += self.store_trades(symbol, page)
+            if (
+                len(page) < page_size
+                or min(int(trade["timestamp"]) for trade in page) < since
+            ):
+                break
+            offset += page_size
+        return added
+
+    @staticmethod
+    def _trade_page(page: Any) -> List[Dict[str, Any]]:
+        if not isinstance(page, list):
+            raise UnexpectedResponseError(page)
+        return page
+
+    def store_trades(self, symbol: str, trades: List[Dict[str, Any]]) -> int:
+        """
+        Merges trades into their day buckets, returns how many were new
+        """
+        np = _numpy()
+        if not trades:
+            return 0
+        records = self.trade_records(trades)
+        buckets = records["timestamp"] - records["timestamp"] % self.TRADES_BUCKET_MS
+        added = 0
+        for bucket in np.unique(buckets):
+            new = records[buckets == bucket]
+            path = self.trade_path(symbol, int(bucket))
+            if os.path.exists(path):
+                old = np.load(path)
+                merged = np.concatenate([old, new])
+            else:
+                old = ()
+                merged = new
+            _, unique = np.unique(merged["id"], return_index=True)
+            merged = merged[unique]
+            added += len(merged) - len(old)
+            self._save(path, merged)
+        return added
+
+    def load_trades(self, symbol: str, start_time: int, end_time: int) -> Any:
+        """
+        Returns stored trades with timestamp in [start_time, end_time) sorted by id
+        """
+        np = _numpy()
+        parts = []
+        for bucket in self.trade_buckets(symbol):
+            if bucket + self.TRADES_BUCKET_MS <= start_time or bucket >= end_time:
+                continue
+            records = np.load(self.trade_path(symbol, bucket), mmap_mode="r")
+            timestamp = records["timestamp"]
+            parts.append(records[(timestamp >= start_time) & (timestamp < end_time)])
+        if not parts:
+            return np.empty(0, dtype=self.trade_dtype())
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    @staticmethod
+    def _save(path: str, records: Any) -> None:
+        np = _numpy()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            np.save(file, records)
+        os.replace(temporary, path)
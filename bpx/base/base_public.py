@@ -4,15 +4,25 @@ from bpx.constants.enums import (
     BorrowLendMarketHistoryIntervalEnum,
     BorrowLendMarketHistoryIntervalType,
 )
-from typing import Union, Optional
+from typing import Any, Union, Optional, List
 
 
 class BasePublic:
     BASE_URL = "https://api.backpack.exchange/"
+    MAX_KLINES_PER_REQUEST = 1000
 
     def _endpoint(self, path) -> str:
         return f"{self.BASE_URL}{path}"
 
+    @staticmethod
+    def is_error(response: Any) -> bool:
+        """
+        Returns whether a response is an exchange error body with code and message
+        """
+        return (
+            isinstance(response, dict) and "code" in response and "message" in response
+        )
+
     def get_assets_url(self) -> str:
         """
         Returns URL for getting assets
@@ -116,6 +126,31 @@ class BasePublic:
             url += f"&endTime={end_time}"
         return self._endpoint(url)
 
+    def get_klines_backfill_urls(
+        self,
+        symbol: str,
+        interval: Union[TimeIntervalEnum, TimeIntervalType],
+        start_time: int,
+        end_time: int,
+    ) -> List[str]:
+        """
+        Returns URLs for getting klines of a long time range, split into chunks
+        of at most MAX_KLINES_PER_REQUEST candles
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_klines
+        """
+        if not TimeIntervalEnum.has_value(interval):
+            raise InvalidTimeIntervalError(interval)
+        if end_time < start_time:
+            raise NegativeValueError(f"end_time - start_time = {end_time - start_time}")
+        step = TIME_INTERVAL_SECONDS[str(interval)] * self.MAX_KLINES_PER_REQUEST
+        return [
+            self.get_klines_url(
+                symbol, interval, chunk_start, min(chunk_start + step, end_time)
+            )
+            for chunk_start in range(start_time, end_time, step)
+        ]
+
     def get_all_mark_prices_url(self, symbol: Optional[str] = None) -> str:
         """
         Returns URL for getting all market prices
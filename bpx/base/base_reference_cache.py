@@ -0,0 +1,82 @@
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+
+
+class BaseReferenceCache:
+    """
+    Keeps rarely changing reference data (markets, assets, collateral, borrow lend
+    markets) in memory for a per-endpoint time to live.
+
+    Once an entry is older than refresh_ahead * ttl it's still served, and a
+    single background refresh replaces it, so callers only wait on the network
+    when an entry is missing or fully expired. Only list responses are cached,
+    error responses are passed through.
+    """
+
+    MARKETS = "markets"
+    ASSETS = "assets"
+    COLLATERAL = "collateral"
+    BORROW_LEND_MARKETS = "borrow_lend_markets"
+
+    DEFAULT_TTL = {
+        MARKETS: 300.0,
+        ASSETS: 300.0,
+        COLLATERAL: 60.0,
+        BORROW_LEND_MARKETS: 60.0,
+    }
+
+    def __init__(
+        self, ttl: Optional[Dict[str, float]] = None, refresh_ahead: float = 0.8
+    ):
+        unknown = set(ttl or ()) - set(self.DEFAULT_TTL)
+        if unknown:
+            raise KeyError(f"No reference endpoint named {', '.join(sorted(unknown))}")
+        self.ttl = {**self.DEFAULT_TTL, **(ttl or {})}
+        self.refresh_ahead = refresh_ahead
+        self.markets_by_symbol: Dict[str, Dict[str, Any]] = {}
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+
+    def lookup(self, name: str) -> Tuple[bool, bool, Any]:
+        """
+        Returns whether the entry is fresh, whether it's due for a background refresh
+        and its value, read from one snapshot of the entry
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            return False, False, None
+        value, stored_at = entry
+        age = monotonic() - stored_at
+        ttl = self.ttl[name]
+        return age < ttl, age >= ttl * self.refresh_ahead, value
+
+    def is_fresh(self, name: str) -> bool:
+        return self.lookup(name)[0]
+
+    def cached(self, name: str) -> Any:
+        return self.lookup(name)[2]
+
+    def market(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached market of a symbol, None when it isn't cached
+        """
+        if not self.is_fresh(self.MARKETS):
+            return None
+        return self.markets_by_symbol.get(symbol)
+
+    def store(self, name: str, value: Any) -> Any:
+        if not isinstance(value, list):
+            return value
+        if name == self.MARKETS:
+            self.markets_by_symbol = {market["symbol"]: market for market in value}
+        self._entries[name] = (value, monotonic())
+        return value
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drops one entry, or every entry when name is None
+        """
+        names = list(self._entries) if name is None else [name]
+        for name in names:
+            self._entries.pop(name, None)
+            if name == self.MARKETS:
+                self.markets_by_symbol = {}
@@ -0,0 +1,103 @@
+from bpx.exceptions import *
+from bpx.constants.enums import *
+from typing import Union, Iterable, Optional
+
+
+class BaseWebSocket:
+    """
+    Contains functions returning stream names and messages for the Backpack websocket API
+    """
+
+    WS_URL = "wss://ws.backpack.exchange"
+
+    def depth_stream(self, symbol: str) -> str:
+        """
+        Returns name of the depth stream for a specified market
+
+        https://docs.backpack.exchange/#tag/Streams
+        """
+        return f"depth.{symbol}"
+
+    def trade_stream(self, symbol: str) -> str:
+        """
+        Returns name of the trade stream for a specified market
+
+        https://docs.backpack.exchange/#tag/Streams
+        """
+        return f"trade.{symbol}"
+
+    def ticker_stream(self, symbol: str) -> str:
+        """
+        Returns name of the ticker stream for a specified market
+
+        https://docs.backpack.exchange/#tag/Streams
+        """
+        return f"ticker.{symbol}"
+
+    def book_ticker_stream(self, symbol: str) -> str:
+        """
+        Returns name of the book ticker stream for a specified market
+
+        https://docs.backpack.exchange/#tag/Streams
+        """
+        return f"bookTicker.{symbol}"
+
+    def kline_stream(
+        self, symbol: str, interval: Union[TimeIntervalEnum, TimeIntervalType]
+    ) -> str:
+        """
+        Returns name of the kline stream for a specified market and interval
+
+        https://docs.backpack.exchange/#tag/Streams
+        """
+        if not TimeIntervalEnum.has_value(interval):
+            raise InvalidTimeIntervalError(interval)
+        return f"kline.{interval}.{symbol}"
+
+    def mark_price_stream(self, symbol: str) -> str:
+        """
+        Returns name of the mark price stream for a specified market
+
+        https://docs.backpack.exchange/#tag/Streams
+        """
+        return f"markPrice.{symbol}"
+
+    def open_interest_stream(self, symbol: str) -> str:
+        """
+        Returns name of the open interest stream for a specified market
+
+        https://docs.backpack.exchange/#tag/Streams
+        """
+        return f"openInterest.{symbol}"
+
+    def order_update_stream(self, symbol: Optional[str] = None) -> str:
+        """
+        Returns name of the private order update stream, for all or a specified market
+
+        https://docs.backpack.exchange/#tag/Streams
+        """
+        if symbol:
+            return f"account.orderUpdate.{symbol}"
+        return "account.orderUpdate"
+
+    def position_update_stream(self, symbol: Optional[str] = None) -> str:
+        """
+        Returns name of the private position update stream, for all or a specified market
+
+        https://docs.backpack.exchange/#tag/Streams
+        """
+        if symbol:
+            return f"account.positionUpdate.{symbol}"
+        return "account.positionUpdate"
+
+    def subscribe_message(self, streams: Iterable[str]) -> dict:
+        """
+        Returns message subscribing to the given streams
+        """
+        return {"method": "SUBSCRIBE", "params": list(streams)}
+
+    def unsubscribe_message(self, streams: Iterable[str]) -> dict:
+        """
+        Returns message unsubscribing from the given streams
+        """
+        return {"method": "UNSUBSCRIBE", "params": list(streams)}
@@ -0,0 +1,46 @@
+import threading
+from time import perf_counter, time
+
+from bpx.base.base_clock_sync import BaseClockSync
+
+
+class ClockSync(BaseClockSync):
+    """
+    Clock offset estimator sampling a sync Public client::
+
+        clock = ClockSync(public)
+        clock.sync()
+        stop = clock.start()
+        account = Account(public_key, secret_key, window=1000, clock=clock)
+    """
+
+    def __init__(self, public, max_samples: int = 16):
+        super().__init__(max_samples)
+        self.public = public
+
+    def sync(self, samples: int = 4) -> float:
+        """
+        Takes samples get_time round trips and returns the new offset in milliseconds
+        """
+        for _ in range(samples):
+            sent_at = time()
+            started = perf_counter()
+            server_time = self.public.get_time()
+            self.add_sample(sent_at, perf_counter() - started, server_time)
+        return self.offset
+
+    def start(self, interval: float = 30.0, samples: int = 2) -> threading.Event:
+        """
+        Samples every interval seconds in a daemon thread, set the returned event to stop
+        """
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.sync(samples)
+                except Exception:
+                    continue
+
+        threading.Thread(target=run, daemon=True).start()
+        return stop
@@ -45,6 +45,25 @@ TimeIntervalType = Literal[
     "1month",
 ]
 
+# length of one candle in seconds, a month is counted as 30 days
+TIME_INTERVAL_SECONDS = {
+    "1m": 60,
+    "3m": 3 * 60,
+    "5m": 5 * 60,
+    "15m": 15 * 60,
+    "30m": 30 * 60,
+    "1h": 60 * 60,
+    "2h": 2 * 60 * 60,
+    "4h": 4 * 60 * 60,
+    "6h": 6 * 60 * 60,
+    "8h": 8 * 60 * 60,
+    "12h": 12 * 60 * 60,
+    "1d": 24 * 60 * 60,
+    "3d": 3 * 24 * 60 * 60,
+    "1w": 7 * 24 * 60 * 60,
+    "1month": 30 * 24 * 60 * 60,
+}
+
 
 class TimeInForceEnum(str, Enum):
     GTC = "GTC"
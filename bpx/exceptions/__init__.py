@@ -77,3 +77,36 @@ class OrderQuantityNotSpecifiedError(Exception):
             f"Order quantity must be specified for limit order"
             f"See the documentation for more details: {documentation_url}"
         )
+
+
+class UnexpectedResponseError(Exception):
+    """Exception when the response doesn't have the expected shape, e.g. an error instead of a page"""
+
+    def __init__(self, response):
+        self.response = response
+        super().__init__(f"Unexpected response: {response}")
+
+
+class OrderValidationError(Exception):
+    """Exception when an order breaks the price or quantity filters of its market"""
+
+    def __init__(self, symbol, reason):
+        self.symbol = symbol
+        self.reason = reason
+        super().__init__(f"Invalid order for {symbol}: {reason}")
+
+
+class DeadlineExceededError(Exception):
+    """Exception when a request deadline passed before the request could be sent or completed"""
+
+    def __init__(self):
+        super().__init__("Request deadline exceeded")
+
+
+class ReplayError(Exception):
+    """Exception when a replayed request has no recorded response left"""
+
+    def __init__(self, method, url):
+        self.method = method
+        self.url = url
+        super().__init__(f"No recorded response for {method} {url}")
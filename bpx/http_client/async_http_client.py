@@ -1,86 +1,344 @@
 import aiohttp
-from typing import Union, List, Dict, Any, Awaitable
+import asyncio
+import time
+from typing import Union, List, Dict, Any, Optional, Callable, Awaitable, Tuple, Mapping
 from bpx.http_client.base.http_client import HttpClient
-import json
-import certifi
+from bpx.http_client.rate_limiter import RateLimiter
+from bpx.http_client.retry import RetryPolicy
+from bpx.http_client.deadline import expires_at, remaining, socket_timeout
+from bpx.http_client.metrics import Instrumentation
+from bpx.http_client.json_codec import JsonCodec, default_codec
+from bpx.exceptions import DeadlineExceededError
 import ssl
 
 
 class AsyncHttpClient(HttpClient):
+    """
+    aiohttp based client.
 
-    def __init__(self, proxy: str = ""):
+    Outside of a session every request opens its own connection, like before.
+    Within ``async with client:`` (or after ``await client.open()``) requests
+    share one pooled ``aiohttp.ClientSession``. open() and close() are counted,
+    the session is closed by the close() matching the first open(), so
+    clients shared by several users don't lose the session under each other.
+
+    With a retry_policy, connection errors, timeouts and retryable statuses
+    are retried as the policy allows.
+
+    connect_timeout and read_timeout bound every socket operation. deadline,
+    or the timeout argument of a call, bounds the whole call including retries,
+    as does an enclosing ``bpx.http_client.deadline.deadline()`` block.
+
+    With instrumentation, dns, connect, response, decode and request timings
+    are recorded per url path, the first two through aiohttp request tracing.
+
+    Bodies go through json_codec, by default the fastest installed one.
+    """
+
+    RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+    def __init__(
+        self,
+        proxy: str = "",
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        ttl_dns_cache: Optional[int] = 10,
+        use_dns_cache: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 30.0,
+        deadline: Optional[float] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        json_codec: Optional[JsonCodec] = None,
+    ):
         self.proxy = proxy
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.instrumentation = instrumentation
+        self.json_codec = default_codec() if json_codec is None else json_codec
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.use_dns_cache = use_dns_cache
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._users = 0
+
+    @property
+    def ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            import certifi
+
+            self._ssl_context = ssl.create_default_context(cafile=certifi.where())
+        return self._ssl_context
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        if self._session is None or self._session.closed:
+            return None
+        return self._session
+
+    def _connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=self.use_dns_cache,
+            ssl=self.ssl_context,
+        )
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            connector=self._connector(), trace_configs=self._trace_configs()
+        )
+
+    def _trace_configs(self) -> Optional[List[aiohttp.TraceConfig]]:
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return None
+
+        async def on_request_start(session, context, params):
+            context.endpoint = instrumentation.endpoint(str(params.url))
+            context.started = time.perf_counter()
+
+        async def on_request_end(session, context, params):
+            instrumentation.record(
+                Instrumentation.RESPONSE,
+                context.endpoint,
+                time.perf_counter() - context.started,
+            )
+
+        async def on_dns_start(session, context, params):
+            context.dns_started = time.perf_counter()
+
+        async def on_dns_end(session, context, params):
+            instrumentation.record(
+                Instrumentation.DNS,
+                context.endpoint,
+                time.perf_counter() - context.dns_started,
+            )
+
+        async def on_connect_start(session, context, params):
+            context.connect_started = time.perf_counter()
+
+        async def on_connect_end(session, context, params):
+            instrumentation.record(
+                Instrumentation.CONNECT,
+                context.endpoint,
+                time.perf_counter() - context.connect_started,
+            )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_dns_resolvehost_start.append(on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_end)
+        trace_config.on_connection_create_start.append(on_connect_start)
+        trace_config.on_connection_create_end.append(on_connect_end)
+        return [trace_config]
+
+    async def open(self) -> aiohttp.ClientSession:
+        """Opens the long-lived session, or returns it if it is already open."""
+        self._users += 1
+        if self.session is None:
+            self._session = self._new_session()
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Releases one open(), the last one closes the session and its pooled connections
+        """
+        self._users = max(self._users - 1, 0)
+        if self._users == 0 and self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _request(
+        self, method: str, url, **kwargs
+    ) -> Union[Dict[str, Any], List[Any], str]:
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return await self._request_in_session(method, url, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await self._request_in_session(method, url, **kwargs)
+        finally:
+            instrumentation.record(
+                Instrumentation.REQUEST,
+                instrumentation.endpoint(str(url)),
+                time.perf_counter() - started,
+            )
+
+    async def _request_in_session(
+        self, method: str, url, **kwargs
+    ) -> Union[Dict[str, Any], List[Any], str]:
+        session = self.session
+        if session is not None:
+            return await self._send_with_retries(session, method, url, **kwargs)
+        async with self._new_session() as session:
+            return await self._send_with_retries(session, method, url, **kwargs)
+
+    async def _send_with_retries(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url,
+        headers=None,
+        resign: Optional[Callable[[], dict]] = None,
+        dedupe: Optional[Callable[[], Awaitable[Any]]] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Union[Dict[str, Any], List[Any], str]:
+        policy = self.retry_policy
+        started = time.monotonic()
+        expires = expires_at(self.deadline if timeout is None else timeout, started)
+        attempt = 0
+        while True:
+            left = remaining(expires)
+            try:
+                status, response_headers, body = await self._send(
+                    session,
+                    method,
+                    url,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(
+                        total=left,
+                        sock_connect=socket_timeout(self.connect_timeout, left),
+                        sock_read=socket_timeout(self.read_timeout, left),
+                    ),
+                    **kwargs,
+                )
+            except self.RETRY_EXCEPTIONS as e:
+                error, status, response_headers, body = e, None, None, None
+            else:
+                error = None
+            delay = None
+            if policy is not None:
+                delay = policy.retry_delay(
+                    method,
+                    attempt,
+                    started,
+                    status=status,
+                    error=error,
+                    response_headers=response_headers,
+                    request_headers=headers,
+                    can_resign=resign is not None,
+                    can_dedupe=dedupe is not None,
+                )
+            if (
+                delay is not None
+                and expires is not None
+                and time.monotonic() + delay >= expires
+            ):
+                delay = None
+            if delay is None:
+                if error is not None:
+                    if expires is not None and time.monotonic() >= expires:
+                        raise DeadlineExceededError() from error
+                    raise error
+                return body
+            await asyncio.sleep(delay)
+            attempt += 1
+            if dedupe is not None:
+                existing = await dedupe()
+                if existing is not None:
+                    return existing
+            if resign is not None:
+                headers = resign()
+
+    async def _send(
+        self, session: aiohttp.ClientSession, method: str, url, headers=None, **kwargs
+    ) -> Tuple[int, Mapping[str, str], Union[Dict[str, Any], List[Any], str]]:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(method, url, headers)
+        async with session.request(
+            method, url, proxy=self.proxy or None, headers=headers, **kwargs
+        ) as response:
+            if self.rate_limiter is not None:
+                self.rate_limiter.feedback(
+                    method, url, headers, response.status, response.headers
+                )
+            if self.instrumentation is not None:
+                await response.read()
+                decode_started = time.perf_counter()
+            try:
+                body = await response.json(loads=self.json_codec.loads)
+            except self.json_codec.decode_error:
+                body = await response.text()
+            except aiohttp.client_exceptions.ContentTypeError:
+                body = await response.text()
+            if self.instrumentation is not None:
+                self.instrumentation.record(
+                    Instrumentation.DECODE,
+                    self.instrumentation.endpoint(str(response.url)),
+                    time.perf_counter() - decode_started,
+                )
+            return response.status, response.headers, body
 
     async def get(
-        self, url, headers=None, params=None
+        self, url, headers=None, params=None, resign=None, timeout=None
     ) -> Union[Dict[str, Any], List[Any], str]:
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url, proxy=self.proxy, params=params, headers=headers, ssl=ssl_context
-            ) as response:
-
-                try:
-                    return await response.json()
-                except json.JSONDecodeError:
-                    return await response.text()
-                except aiohttp.client_exceptions.ContentTypeError:
-                    return await response.text()
+        return await self._request(
+            "GET",
+            url,
+            params=params,
+            headers=headers,
+            resign=resign,
+            timeout=timeout,
+        )
 
     async def post(
-        self, url, headers=None, data=None
+        self, url, headers=None, data=None, resign=None, dedupe=None, timeout=None
     ) -> Union[Dict[str, Any], List[Any], str]:
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                proxy=self.proxy,
-                headers=headers,
-                data=json.dumps(data),
-                ssl=ssl_context,
-            ) as response:
-
-                try:
-                    return await response.json()
-                except json.JSONDecodeError:
-                    return await response.text()
-                except aiohttp.client_exceptions.ContentTypeError:
-                    return await response.text()
+        """
+        With a retry policy, resign returns fresh headers for a retry and dedupe
+        (a coroutine function) returns the already placed order, or None to send
+        the request again
+        """
+        return await self._request(
+            "POST",
+            url,
+            headers=headers,
+            data=self.json_codec.dumps(data),
+            resign=resign,
+            dedupe=dedupe,
+            timeout=timeout,
+        )
 
     async def delete(
-        self, url, headers=None, data=None
+        self, url, headers=None, data=None, resign=None, timeout=None
+    ) -> Union[Dict[str, Any], List[Any], str]:
+        return await self._request(
+            "DELETE",
+            url,
+            headers=headers,
+            data=self.json_codec.dumps(data),
+            resign=resign,
+            timeout=timeout,
+        )
+
+    async def patch(
+        self, url, headers=None, data=None, resign=None, timeout=None
     ) -> Union[Dict[str, Any], List[Any], str]:
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(
-                url,
-                proxy=self.proxy,
-                headers=headers,
-                data=json.dumps(data),
-                ssl=ssl_context,
-            ) as response:
-
-                try:
-                    return await response.json()
-                except json.JSONDecodeError:
-                    return await response.text()
-                except aiohttp.client_exceptions.ContentTypeError:
-                    return await response.text()
-
-    async def patch(self, url, headers=None, data=None):
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        async with aiohttp.ClientSession() as session:
-            async with session.patch(
-                url,
-                proxy=self.proxy,
-                headers=headers,
-                data=json.dumps(data),
-                ssl=ssl_context,
-            ) as response:
-
-                try:
-                    return await response.json()
-                except json.JSONDecodeError:
-                    return await response.text()
-                except aiohttp.client_exceptions.ContentTypeError:
-                    return await response.text()
+        return await self._request(
+            "PATCH",
+            url,
+            headers=headers,
+            data=self.json_codec.dumps(data),
+            resign=resign,
+            timeout=timeout,
+        )
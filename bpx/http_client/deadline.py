@@ -0,0 +1,76 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from bpx.exceptions import DeadlineExceededError
+
+_deadline: ContextVar[Optional[float]] = ContextVar("bpx_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Bounds every request made inside the block, including retries, to finish
+    within seconds. Nested blocks can only shorten the deadline. Signed
+    requests get their window cut to the time left, so the exchange drops
+    them once the deadline has passed::
+
+        with deadline(0.5):
+            account.execute_order(...)
+
+    The deadline is kept in a context variable, so it follows the current
+    thread or asyncio task.
+    """
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """
+    Returns the time.monotonic() the current deadline expires at, None without one
+    """
+    return _deadline.get()
+
+
+def remaining(expires: Optional[float] = None) -> Optional[float]:
+    """
+    Returns seconds left until expires (the current deadline by default),
+    raising DeadlineExceededError when none are left
+    """
+    if expires is None:
+        expires = _deadline.get()
+    if expires is None:
+        return None
+    left = expires - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceededError()
+    return left
+
+
+def expires_at(seconds: Optional[float], started: float) -> Optional[float]:
+    """
+    Returns when a request started at started (time.monotonic()) with a budget of
+    seconds has to finish, the earlier of that and the current deadline
+    """
+    expires = _deadline.get()
+    if seconds is not None:
+        own = started + seconds
+        expires = own if expires is None else min(expires, own)
+    return expires
+
+
+def socket_timeout(limit: Optional[float], left: Optional[float]) -> Optional[float]:
+    """
+    Returns a socket timeout no longer than the time left
+    """
+    if left is None:
+        return limit
+    return left if limit is None else min(limit, left)
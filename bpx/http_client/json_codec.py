@@ -0,0 +1,79 @@
+import json
+from typing import Any, Optional, Tuple, Type, Union
+
+
+class JsonCodec:
+    """
+    Encodes request bodies and decodes responses, with the standard library.
+
+    The http clients and websockets take a codec as json_codec. Without one
+    they use ``default_codec()``: orjson when it's installed, then ujson, then
+    this one. Subclasses replace loads, dumps and decode_error.
+    """
+
+    name = "json"
+    decode_error: Type[ValueError] = json.JSONDecodeError
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self.decode_error = orjson.JSONDecodeError
+        self.loads = orjson.loads
+        self._dumps = orjson.dumps
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj).decode()
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self.decode_error = getattr(ujson, "JSONDecodeError", ValueError)
+        self.loads = ujson.loads
+        self._dumps = ujson.dumps
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+
+
+CODECS: Tuple[Type[JsonCodec], ...] = (OrjsonCodec, UjsonCodec, JsonCodec)
+
+_default: Optional[JsonCodec] = None
+
+
+def default_codec() -> JsonCodec:
+    """
+    Returns the fastest installed codec, detected on first use
+    """
+    global _default
+    if _default is None:
+        for codec in CODECS:
+            try:
+                _default = codec()
+                break
+            except ImportError:
+                continue
+    return _default
+
+
+def get_codec(name: str) -> JsonCodec:
+    """
+    Returns a codec by name: json, orjson or ujson
+    """
+    for codec in CODECS:
+        if codec.name == name:
+            return codec()
+    raise ValueError(f"Unknown json codec {name}")
@@ -0,0 +1,30 @@
+import threading
+from importlib import import_module
+from typing import Any, Optional
+
+
+class LazyClient:
+    """
+    Default http client of a module, created on first use.
+
+    The clients import requests or aiohttp, so building one at import time
+    made ``import bpx.account`` pay for the whole http stack even when the
+    caller passes a client of its own. Every caller of get() shares the one
+    client, like the module level instances did.
+    """
+
+    def __init__(self, module: str, name: str):
+        self.module = module
+        self.name = name
+        self._client: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """
+        Returns the shared client, creating it the first time
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = getattr(import_module(self.module), self.name)()
+        return self._client
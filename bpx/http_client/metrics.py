@@ -0,0 +1,246 @@
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Pattern, Sequence, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram, in seconds.
+
+    counts[i] is the number of observations no larger than buckets[i] and
+    above the previous bound, the last count is for the +Inf bucket.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Returns an estimate of the q quantile, interpolated within its bucket
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def copy(self) -> "LatencyHistogram":
+        histogram = LatencyHistogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.sum = self.sum
+        return histogram
+
+
+class Instrumentation:
+    """
+    Collects hot-path timings of the http clients and accounts.
+
+    Pass one instance to ``SyncHttpClient``/``AsyncHttpClient`` as
+    instrumentation; accounts using that client report their signing time to it
+    too. Every timing goes to the listeners as ``(phase, endpoint, seconds)``
+    and into a histogram per phase and endpoint. Endpoints are route templates
+    (see endpoint()), or the signed instruction for the signing phases. A
+    listener that raises is logged and skipped, the request goes on.
+
+    Phases:
+
+    - sign: ed25519 signature of one request
+    - headers: building signed headers, signing included
+    - dns: host name resolution (async client)
+    - connect: opening a new connection, TLS included (async client)
+    - response: sending one attempt until its response headers arrive, the
+      network and the exchange
+    - decode: parsing the response body
+    - request: a whole http client call, retries and decoding included
+    """
+
+    SIGN = "sign"
+    HEADERS = "headers"
+    DNS = "dns"
+    CONNECT = "connect"
+    RESPONSE = "response"
+    DECODE = "decode"
+    REQUEST = "request"
+
+    DEFAULT_BUCKETS = (
+        0.0001,
+        0.00025,
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+
+    # url paths with parameters in them and the template they are labelled by
+    ROUTE_TEMPLATES: Tuple[Tuple[Pattern[str], str], ...] = (
+        (re.compile(r"/api/v1/markets/[^/]+"), "/api/v1/markets/{symbol}"),
+    )
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.listeners: List[Callable[[str, str, float], None]] = []
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self.started_ns = time.time_ns()
+
+    def add_listener(self, listener: Callable[[str, str, float], None]) -> None:
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, str, float], None]) -> None:
+        self.listeners.remove(listener)
+
+    def record(self, phase: str, endpoint: str, seconds: float) -> None:
+        key = (phase, endpoint)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+        for listener in self.listeners:
+            try:
+                listener(phase, endpoint, seconds)
+            except Exception:
+                logger.exception("instrumentation listener %r failed", listener)
+
+    @classmethod
+    def endpoint(cls, url: str) -> str:
+        """
+        Returns the endpoint label of url: its path without the query string,
+        with path parameters replaced by their ROUTE_TEMPLATES template
+        """
+        path = urlsplit(url).path
+        for pattern, template in cls.ROUTE_TEMPLATES:
+            if pattern.fullmatch(path):
+                return template
+        return path
+
+    def histogram(self, phase: str, endpoint: str) -> Optional[LatencyHistogram]:
+        """
+        Returns a copy of the histogram of phase for endpoint, None if nothing was recorded
+        """
+        with self._lock:
+            histogram = self._histograms.get((phase, endpoint))
+            return None if histogram is None else histogram.copy()
+
+    def snapshot(self) -> Dict[Tuple[str, str], LatencyHistogram]:
+        """
+        Returns copies of all histograms keyed by (phase, endpoint)
+        """
+        with self._lock:
+            return {key: h.copy() for key, h in self._histograms.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {}
+            self.started_ns = time.time_ns()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(
+    instrumentation: Instrumentation, name: str = "bpx_phase_seconds"
+) -> str:
+    """
+    Returns the histograms in the Prometheus text exposition format
+    """
+    lines = [
+        f"# HELP {name} Latency of bpx client phases in seconds",
+        f"# TYPE {name} histogram",
+    ]
+    for (phase, endpoint), histogram in sorted(instrumentation.snapshot().items()):
+        labels = f'phase="{_escape(phase)}",endpoint="{_escape(endpoint)}"'
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound!r}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def otlp_metrics(
+    instrumentation: Instrumentation,
+    name: str = "bpx.phase.duration",
+    scope: str = "bpx",
+) -> dict:
+    """
+    Returns the histograms as an OTLP/JSON metrics export request, ready to be
+    posted to an OpenTelemetry collector's /v1/metrics endpoint
+    """
+    now = str(time.time_ns())
+    start = str(instrumentation.started_ns)
+    data_points = [
+        {
+            "attributes": [
+                {"key": "phase", "value": {"stringValue": phase}},
+                {"key": "endpoint", "value": {"stringValue": endpoint}},
+            ],
+            "startTimeUnixNano": start,
+            "timeUnixNano": now,
+            "count": str(histogram.count),
+            "sum": histogram.sum,
+            "bucketCounts": [str(count) for count in histogram.counts],
+            "explicitBounds": list(histogram.buckets),
+        }
+        for (phase, endpoint), histogram in sorted(instrumentation.snapshot().items())
+    ]
+    return {
+        "resourceMetrics": [
+            {
+                "resource": {"attributes": []},
+                "scopeMetrics": [
+                    {
+                        "scope": {"name": scope},
+                        "metrics": [
+                            {
+                                "name": name,
+                                "unit": "s",
+                                "histogram": {
+                                    # cumulative
+                                    "aggregationTemporality": 2,
+                                    "dataPoints": data_points,
+                                },
+                            }
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Mapping, Dict
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate tokens per second up to capacity.
+
+    Tokens are reserved under a lock and the caller sleeps outside of it, so
+    one bucket can pace threads and coroutines at the same time.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Takes tokens and returns how many seconds to wait before using them
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def acquire(self, tokens: float = 1) -> None:
+        """
+        Blocks until tokens are available
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """
+        Waits without blocking the event loop until tokens are available
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back every request for the given number of seconds and drains the bucket
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0)
+
+
+class RateLimiter:
+    """
+    Paces requests with one token bucket per endpoint class:
+
+    - ``public`` - unsigned market data requests
+    - ``query`` - signed requests that only read account state
+    - ``order`` - signed requests placing or cancelling orders and quotes
+
+    The same instance can be given to a SyncHttpClient and an AsyncHttpClient.
+    Responses with status 429 or a ``Retry-After`` header pause the bucket of
+    their class. Default rates are conservative, tune them to your limits.
+    """
+
+    PUBLIC = "public"
+    QUERY = "query"
+    ORDER = "order"
+
+    ORDER_PATHS = ("/api/v1/order", "/api/v1/orders", "/api/v1/rfq/quote")
+    DEFAULT_BACKOFF = 1.0
+
+    def __init__(
+        self,
+        public: Optional[TokenBucket] = None,
+        query: Optional[TokenBucket] = None,
+        order: Optional[TokenBucket] = None,
+    ):
+        self.buckets: Dict[str, TokenBucket] = {
+            self.PUBLIC: public or TokenBucket(rate=20, capacity=20),
+            self.QUERY: query or TokenBucket(rate=10, capacity=10),
+            self.ORDER: order or TokenBucket(rate=20, capacity=20),
+        }
+
+    def classify(
+        self, method: str, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> str:
+        """
+        Returns the endpoint class of a request
+        """
+        if not headers or "X-Signature" not in headers:
+            return self.PUBLIC
+        if method != "GET" and urlsplit(url).path in self.ORDER_PATHS:
+            return self.ORDER
+        return self.QUERY
+
+    def acquire(
+        self, method: str, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        self.buckets[self.classify(method, url, headers)].acquire()
+
+    async def acquire_async(
+        self, method: str, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        await self.buckets[self.classify(method, url, headers)].acquire_async()
+
+    def feedback(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]],
+        status: int,
+        response_headers: Mapping[str, str],
+    ) -> None:
+        """
+        Pauses the bucket of the request when the server asks to slow down
+        """
+        retry_after = self.retry_after(response_headers)
+        if retry_after is None and status == 429:
+            retry_after = self.DEFAULT_BACKOFF
+        if retry_after:
+            self.buckets[self.classify(method, url, headers)].pause(retry_after)
+
+    @staticmethod
+    def retry_after(response_headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Returns seconds from a Retry-After header given as seconds or as an HTTP date
+        """
+        value = response_headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,238 @@
+import json
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from bpx.exceptions import ReplayError
+from bpx.http_client.async_http_client import AsyncHttpClient
+from bpx.http_client.base.http_client import HttpClient
+from bpx.http_client.sync_http_client import SyncHttpClient
+
+
+class Cassette:
+    """
+    Request/response pairs kept in a json lines file.
+
+    Requests are matched on method, url, query params and body. Headers aren't
+    recorded, they hold the api key and signatures that change every call.
+    Identical requests replay their recorded responses in order.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._pending: Dict[str, Deque[Any]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method: str, url: str, params: Any = None, data: Any = None) -> str:
+        return json.dumps([method, url, params, data], sort_keys=True, default=str)
+
+    def load(self) -> "Cassette":
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    key = self.key(
+                        entry["method"], entry["url"], entry["params"], entry["data"]
+                    )
+                    self._pending[key].append(entry["response"])
+        return self
+
+    def record(
+        self, method: str, url: str, params: Any, data: Any, response: Any
+    ) -> None:
+        line = json.dumps(
+            {
+                "method": method,
+                "url": url,
+                "params": params,
+                "data": data,
+                "response": response,
+            },
+            default=str,
+        )
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    def take(
+        self, method: str, url: str, params: Any = None, data: Any = None
+    ) -> Union[Dict[str, Any], List[Any], str]:
+        """
+        Returns the next recorded response of a request
+        """
+        with self._lock:
+            pending = self._pending.get(self.key(method, url, params, data))
+            if not pending:
+                raise ReplayError(method, url)
+            return pending.popleft()
+
+
+class RecordingHttpClient(HttpClient):
+    """
+    Sync client that sends requests through http_client and appends every
+    request/response pair to a cassette file, for ReplayHttpClient::
+
+        account = Account(public_key, secret_key,
+                          default_http_client=RecordingHttpClient("orders.jsonl"))
+    """
+
+    def __init__(self, path: str, http_client: Optional[SyncHttpClient] = None):
+        self.http_client = SyncHttpClient() if http_client is None else http_client
+        self.cassette = Cassette(path)
+
+    @property
+    def proxies(self):
+        return self.http_client.proxies
+
+    @proxies.setter
+    def proxies(self, proxies):
+        self.http_client.proxies = proxies
+
+    def close(self) -> None:
+        self.http_client.close()
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        response = self.http_client.get(url, headers=headers, params=params, **kwargs)
+        self.cassette.record("GET", url, params, None, response)
+        return response
+
+    def post(self, url, headers=None, data=None, **kwargs):
+        response = self.http_client.post(url, headers=headers, data=data, **kwargs)
+        self.cassette.record("POST", url, None, data, response)
+        return response
+
+    def delete(self, url, headers=None, data=None, **kwargs):
+        response = self.http_client.delete(url, headers=headers, data=data, **kwargs)
+        self.cassette.record("DELETE", url, None, data, response)
+        return response
+
+    def patch(self, url, headers=None, data=None, **kwargs):
+        response = self.http_client.patch(url, headers=headers, data=data, **kwargs)
+        self.cassette.record("PATCH", url, None, data, response)
+        return response
+
+
+class ReplayHttpClient(HttpClient):
+    """
+    Sync client answering from a cassette without any network, raising
+    ReplayError for requests that weren't recorded
+    """
+
+    proxies = None
+
+    def __init__(self, path: str):
+        self.cassette = Cassette(path).load()
+
+    def close(self) -> None:
+        pass
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        return self.cassette.take("GET", url, params)
+
+    def post(self, url, headers=None, data=None, **kwargs):
+        return self.cassette.take("POST", url, None, data)
+
+    def delete(self, url, headers=None, data=None, **kwargs):
+        return self.cassette.take("DELETE", url, None, data)
+
+    def patch(self, url, headers=None, data=None, **kwargs):
+        return self.cassette.take("PATCH", url, None, data)
+
+
+class AsyncRecordingHttpClient(HttpClient):
+    """
+    RecordingHttpClient for the async clients
+    """
+
+    def __init__(self, path: str, http_client: Optional[AsyncHttpClient] = None):
+        self.http_client = AsyncHttpClient() if http_client is None else http_client
+        self.cassette = Cassette(path)
+
+    @property
+    def proxy(self):
+        return self.http_client.proxy
+
+    @proxy.setter
+    def proxy(self, proxy):
+        self.http_client.proxy = proxy
+
+    @property
+    def session(self):
+        return self.http_client.session
+
+    async def open(self):
+        return await self.http_client.open()
+
+    async def close(self) -> None:
+        await self.http_client.close()
+
+    async def __aenter__(self) -> "AsyncRecordingHttpClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def get(self, url, headers=None, params=None, **kwargs):
+        response = await self.http_client.get(
+            url, headers=headers, params=params, **kwargs
+        )
+        self.cassette.record("GET", url, params, None, response)
+        return response
+
+    async def post(self, url, headers=None, data=None, **kwargs):
+        response = await self.http_client.post(
+            url, headers=headers, data=data, **kwargs
+        )
+        self.cassette.record("POST", url, None, data, response)
+        return response
+
+    async def delete(self, url, headers=None, data=None, **kwargs):
+        response = await self.http_client.delete(
+            url, headers=headers, data=data, **kwargs
+        )
+        self.cassette.record("DELETE", url, None, data, response)
+        return response
+
+    async def patch(self, url, headers=None, data=None, **kwargs):
+        response = await self.http_client.patch(
+            url, headers=headers, data=data, **kwargs
+        )
+        self.cassette.record("PATCH", url, None, data, response)
+        return response
+
+
+class AsyncReplayHttpClient(HttpClient):
+    """
+    ReplayHttpClient for the async clients
+    """
+
+    proxy = ""
+    session = None
+
+    def __init__(self, path: str):
+        self.cassette = Cassette(path).load()
+
+    async def open(self):
+        return None
+
+    async def close(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "AsyncReplayHttpClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    async def get(self, url, headers=None, params=None, **kwargs):
+        return self.cassette.take("GET", url, params)
+
+    async def post(self, url, headers=None, data=None, **kwargs):
+        return self.cassette.take("POST", url, None, data)
+
+    async def delete(self, url, headers=None, data=None, **kwargs):
+        return self.cassette.take("DELETE", url, None, data)
+
+    async def patch(self, url, headers=None, data=None, **kwargs):
+        return self.cassette.take("PATCH", url, None, data)
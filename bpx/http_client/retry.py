@@ -0,0 +1,102 @@
+import random
+import time
+from typing import Collection, Mapping, Optional
+
+from bpx.http_client.rate_limiter import RateLimiter
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is sent again.
+
+    Delays grow exponentially from backoff up to max_backoff with full
+    jitter, a Retry-After header is honoured, and no retry starts once the
+    deadline (seconds since the first attempt) would be exceeded.
+
+    Requests are only repeated when that can't duplicate a side effect:
+
+    - methods in idempotent_methods, on any retryable status or error
+    - any method on 429, the server didn't process it
+    - other methods when the caller passed a dedupe check, e.g. orders with
+      a client_id, which are looked up before being sent again
+
+    Signed requests are re-signed with a fresh timestamp when the caller
+    passes a resign callback. Otherwise a retry that would land past the
+    signature window isn't attempted. The window is counted from the first
+    attempt on the local monotonic clock rather than compared with
+    X-Timestamp, which may be stamped with a corrected exchange clock.
+    """
+
+    RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+    IDEMPOTENT_METHODS = frozenset(("GET", "DELETE"))
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0,
+        jitter: bool = True,
+        deadline: Optional[float] = 10.0,
+        retry_statuses: Collection[int] = RETRY_STATUSES,
+        idempotent_methods: Collection[str] = IDEMPOTENT_METHODS,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+
+    def retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        started: float,
+        status: Optional[int] = None,
+        error: Optional[BaseException] = None,
+        response_headers: Optional[Mapping[str, str]] = None,
+        request_headers: Optional[Mapping[str, str]] = None,
+        can_resign: bool = False,
+        can_dedupe: bool = False,
+    ) -> Optional[float]:
+        """
+        Returns seconds to wait before attempt + 1 (attempts count from 0),
+        or None when the outcome is final. started is a time.monotonic() of the
+        first attempt, error is set when the request raised a transport error.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if error is None and status not in self.retry_statuses:
+            return None
+        if method not in self.idempotent_methods and status != 429 and not can_dedupe:
+            return None
+        delay = self.backoff_delay(attempt)
+        retry_after = RateLimiter.retry_after(response_headers or {})
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        now = time.monotonic()
+        if self.deadline is not None and now - started + delay > self.deadline:
+            return None
+        if not can_resign and not self._signature_valid_after(
+            request_headers, started, now + delay
+        ):
+            return None
+        return delay
+
+    def backoff_delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2**attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def _signature_valid_after(
+        request_headers: Optional[Mapping[str, str]], signed: float, at: float
+    ) -> bool:
+        """
+        Returns whether headers signed right before signed (a time.monotonic())
+        are still within their window at the monotonic time at
+        """
+        if not request_headers or "X-Timestamp" not in request_headers:
+            return True
+        window = int(request_headers.get("X-Window", 5000))
+        return at < signed + window / 1e3
@@ -1,52 +1,293 @@
 import requests
-from typing import Dict, Any, List, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Union, Optional, Callable
 from bpx.http_client.base.http_client import HttpClient
+from bpx.http_client.rate_limiter import RateLimiter
+from bpx.http_client.retry import RetryPolicy
+from bpx.http_client.deadline import expires_at, remaining, socket_timeout
+from bpx.http_client.metrics import Instrumentation
+from bpx.http_client.json_codec import JsonCodec, default_codec
+from bpx.exceptions import DeadlineExceededError
 import json
+import threading
+import time
+import weakref
 
 
 class SyncHttpClient(HttpClient):
-    def __init__(self, proxies: dict = None):
+    """
+    requests based client with keep-alive connection pooling.
+
+    Every thread gets its own ``requests.Session``, and all of them mount the
+    same ``HTTPAdapter``, so connections are pooled across threads while
+    session state (cookies) is never shared between them. A session goes
+    away with its thread.
+
+    With a retry_policy, connection errors, timeouts and retryable statuses
+    are retried as the policy allows.
+
+    connect_timeout and read_timeout bound every socket operation. deadline,
+    or the timeout argument of a call, bounds the whole call including retries,
+    as does an enclosing ``bpx.http_client.deadline.deadline()`` block.
+
+    With instrumentation, response, decode and request timings are recorded
+    per url path. requests doesn't expose connection setup, so connect time is
+    part of the response phase here.
+
+    Bodies go through json_codec, by default the fastest installed one. With
+    the standard library codec requests encodes and decodes them itself.
+    """
+
+    RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(
+        self,
+        proxies: dict = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        max_retries: Union[int, Retry] = 0,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 30.0,
+        deadline: Optional[float] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        json_codec: Optional[JsonCodec] = None,
+    ):
         self.proxies = proxies
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.instrumentation = instrumentation
+        self.json_codec = default_codec() if json_codec is None else json_codec
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=max_retries,
+        )
+        self._local = threading.local()
+        # weak, the thread-local keeps a session alive while its thread runs
+        self._sessions: "weakref.WeakValueDictionary[int, requests.Session]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
 
-    def get(
-        self, url, headers=None, params=None
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            with self._lock:
+                self._sessions[threading.get_ident()] = session
+            self._local.session = session
+        return session
+
+    def close(self) -> None:
+        """Closes every session and the pooled connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        self._local = threading.local()
+        for session in sessions:
+            session.close()
+        self.adapter.close()
+
+    def __enter__(self) -> "SyncHttpClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _request(
+        self,
+        method: str,
+        url,
+        headers=None,
+        resign: Optional[Callable[[], dict]] = None,
+        dedupe: Optional[Callable[[], Any]] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
     ) -> Union[Dict[str, Any], List[Any], str]:
-        response = requests.get(
-            url=url, proxies=self.proxies, headers=headers, params=params
-        )
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self._send_with_retries(
+                method, url, headers, resign, dedupe, timeout, None, **kwargs
+            )
+        endpoint = instrumentation.endpoint(url)
+        started = time.perf_counter()
+        try:
+            return self._send_with_retries(
+                method, url, headers, resign, dedupe, timeout, endpoint, **kwargs
+            )
+        finally:
+            instrumentation.record(
+                Instrumentation.REQUEST, endpoint, time.perf_counter() - started
+            )
 
+    def _send_with_retries(
+        self,
+        method: str,
+        url,
+        headers,
+        resign: Optional[Callable[[], dict]],
+        dedupe: Optional[Callable[[], Any]],
+        timeout: Optional[float],
+        endpoint: Optional[str],
+        **kwargs,
+    ) -> Union[Dict[str, Any], List[Any], str]:
+        policy = self.retry_policy
+        started = time.monotonic()
+        expires = expires_at(self.deadline if timeout is None else timeout, started)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method, url, headers)
+            left = remaining(expires)
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    proxies=self.proxies,
+                    headers=headers,
+                    timeout=(
+                        socket_timeout(self.connect_timeout, left),
+                        socket_timeout(self.read_timeout, left),
+                    ),
+                    **kwargs,
+                )
+            except self.RETRY_EXCEPTIONS as e:
+                error, status, response_headers = e, None, None
+            else:
+                if endpoint is not None:
+                    self.instrumentation.record(
+                        Instrumentation.RESPONSE,
+                        endpoint,
+                        response.elapsed.total_seconds(),
+                    )
+                if self.rate_limiter is not None:
+                    self.rate_limiter.feedback(
+                        method, url, headers, response.status_code, response.headers
+                    )
+                error, status, response_headers = (
+                    None,
+                    response.status_code,
+                    response.headers,
+                )
+            delay = None
+            if policy is not None:
+                delay = policy.retry_delay(
+                    method,
+                    attempt,
+                    started,
+                    status=status,
+                    error=error,
+                    response_headers=response_headers,
+                    request_headers=headers,
+                    can_resign=resign is not None,
+                    can_dedupe=dedupe is not None,
+                )
+            if (
+                delay is not None
+                and expires is not None
+                and time.monotonic() + delay >= expires
+            ):
+                delay = None
+            if delay is None:
+                if error is not None:
+                    if expires is not None and time.monotonic() >= expires:
+                        raise DeadlineExceededError() from error
+                    raise error
+                if endpoint is None:
+                    return self._decode(response)
+                decode_started = time.perf_counter()
+                body = self._decode(response)
+                self.instrumentation.record(
+                    Instrumentation.DECODE,
+                    endpoint,
+                    time.perf_counter() - decode_started,
+                )
+                return body
+            time.sleep(delay)
+            attempt += 1
+            if dedupe is not None:
+                existing = dedupe()
+                if existing is not None:
+                    return existing
+            if resign is not None:
+                headers = resign()
+
+    def _decode(
+        self, response: requests.Response
+    ) -> Union[Dict[str, Any], List[Any], str]:
+        codec = self.json_codec
+        if type(codec) is JsonCodec:
+            try:
+                return response.json()
+            except json.JSONDecodeError:
+                return response.text
         try:
-            return response.json()
-        except json.JSONDecodeError:
+            return codec.loads(response.content)
+        except codec.decode_error:
             return response.text
 
+    def _body(self, headers, data) -> Dict[str, Any]:
+        """
+        Returns the request keyword arguments sending data as a json body
+        """
+        if data is None or type(self.json_codec) is JsonCodec:
+            return {"headers": headers, "json": data}
+        if headers is None or "Content-Type" not in headers:
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+        return {"headers": headers, "data": self.json_codec.dumps(data).encode()}
+
+    def get(
+        self, url, headers=None, params=None, resign=None, timeout=None
+    ) -> Union[Dict[str, Any], List[Any], str]:
+        return self._request(
+            "GET", url, headers=headers, params=params, resign=resign, timeout=timeout
+        )
+
     def post(
-        self, url, headers=None, data=None
+        self, url, headers=None, data=None, resign=None, dedupe=None, timeout=None
     ) -> Union[Dict[str, Any], List[Any], str]:
-        response = requests.post(
-            url=url, proxies=self.proxies, headers=headers, json=data
+        """
+        With a retry policy, resign returns fresh headers for a retry and dedupe
+        returns the already placed order, or None to send the request again
+        """
+        return self._request(
+            "POST",
+            url,
+            resign=resign,
+            dedupe=dedupe,
+            timeout=timeout,
+            **self._body(headers, data),
         )
-        try:
-            return response.json()
-        except json.JSONDecodeError:
-            return response.text
 
     def delete(
-        self, url, headers=None, data=None
+        self, url, headers=None, data=None, resign=None, timeout=None
     ) -> Union[Dict[str, Any], List[Any], str]:
-        response = requests.delete(
-            url, proxies=self.proxies, headers=headers, json=data
+        return self._request(
+            "DELETE",
+            url,
+            resign=resign,
+            timeout=timeout,
+            **self._body(headers, data),
         )
-        try:
-            return response.json()
-        except json.JSONDecodeError:
-            return response.text
 
     def patch(
-        self, url, headers=None, data=None
+        self, url, headers=None, data=None, resign=None, timeout=None
     ) -> Union[Dict[str, Any], List[Any], str]:
-        response = requests.patch(url, proxies=self.proxies, headers=headers, json=data)
-        try:
-            return response.json()
-        except json.JSONDecodeError:
-            return response.text
+        return self._request(
+            "PATCH",
+            url,
+            resign=resign,
+            timeout=timeout,
+            **self._body(headers, data),
+        )
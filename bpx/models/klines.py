@@ -0,0 +1,144 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "numpy is required for columnar klines, install it with: pip install bpx-py[numpy]"
+        ) from e
+    return numpy
+
+
+class KlineArrays:
+    """
+    Klines of one market stored column-wise in NumPy arrays.
+
+    open_time holds the candle start as unix seconds, the price and volume
+    columns are float64 and trades is int64. Rows are sorted by open_time and
+    unique, appending overlapping data keeps the newest copy of a candle.
+    """
+
+    FIELDS = (
+        "open_time",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "quote_volume",
+        "trades",
+    )
+    _FLOAT_KEYS = (
+        ("open", "open"),
+        ("high", "high"),
+        ("low", "low"),
+        ("close", "close"),
+        ("volume", "volume"),
+        ("quote_volume", "quoteVolume"),
+    )
+
+    __slots__ = FIELDS
+
+    def __init__(self, **columns: Any):
+        np = _numpy()
+        self.open_time = np.asarray(columns.get("open_time", ()), dtype=np.int64)
+        for field, _ in self._FLOAT_KEYS:
+            setattr(self, field, np.asarray(columns.get(field, ()), dtype=np.float64))
+        self.trades = np.asarray(columns.get("trades", ()), dtype=np.int64)
+
+    @classmethod
+    def from_klines(cls, klines: Iterable[Dict[str, Any]]) -> "KlineArrays":
+        """
+        Builds the arrays from get_klines rows, sorted and without duplicates
+        """
+        np = _numpy()
+        klines = list(klines)
+        columns = {
+            "open_time": np.array(
+                [kline["start"] for kline in klines], dtype="datetime64[s]"
+            ).astype(np.int64),
+            "trades": [int(kline.get("trades") or 0) for kline in klines],
+        }
+        for field, key in cls._FLOAT_KEYS:
+            columns[field] = np.array(
+                [kline.get(key) or "nan" for kline in klines], dtype=np.float64
+            )
+        return cls(**columns)._deduplicated()
+
+    @classmethod
+    def from_records(cls, records: Any) -> "KlineArrays":
+        """
+        Wraps a structured array with one field per column, without copying it
+        """
+        return cls(**{field: records[field] for field in cls.FIELDS})
+
+    def to_records(self) -> Any:
+        """
+        Returns the candles as one structured array, the format used on disk
+        """
+        np = _numpy()
+        records = np.empty(len(self), dtype=self.record_dtype())
+        for field in self.FIELDS:
+            records[field] = getattr(self, field)
+        return records
+
+    @classmethod
+    def record_dtype(cls) -> Any:
+        np = _numpy()
+        return np.dtype(
+            [("open_time", np.int64)]
+            + [(field, np.float64) for field, _ in cls._FLOAT_KEYS]
+            + [("trades", np.int64)]
+        )
+
+    @classmethod
+    def concatenate(cls, parts: Iterable["KlineArrays"]) -> "KlineArrays":
+        """
+        Joins several arrays sets into one sorted set without duplicate candles
+        """
+        np = _numpy()
+        parts = list(parts)
+        if not parts:
+            return cls()
+        columns = {
+            field: np.concatenate([getattr(part, field) for part in parts])
+            for field in cls.FIELDS
+        }
+        return cls(**columns)._deduplicated()
+
+    def append(self, other: "KlineArrays") -> "KlineArrays":
+        """
+        Returns a new arrays set with other's candles added, other wins on overlap
+        """
+        return self.concatenate([self, other])
+
+    def _deduplicated(self) -> "KlineArrays":
+        np = _numpy()
+        # a stable sort keeps later rows after earlier ones with the same open_time,
+        # so the last row of every run is the newest one
+        order = np.argsort(self.open_time, kind="stable")
+        open_time = self.open_time[order]
+        keep = np.ones(len(open_time), dtype=bool)
+        keep[:-1] = open_time[1:] != open_time[:-1]
+        selected = order[keep]
+        return type(self)(
+            **{field: getattr(self, field)[selected] for field in self.FIELDS}
+        )
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        if not len(self.open_time):
+            return None
+        return int(self.open_time[-1])
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    def __repr__(self):
+        return (
+            f"KlineArrays(rows={len(self)}, "
+            f"first_open_time={int(self.open_time[0]) if len(self) else None}, "
+            f"last_open_time={self.last_open_time})"
+        )
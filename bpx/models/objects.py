@@ -1,4 +1,4 @@
-from typing import Optional, Literal, TypedDict
+from typing import Optional, Literal, TypedDict, Dict, Any
 
 
 class RequestConfiguration:
@@ -24,6 +24,58 @@ class RequestConfiguration:
         )
 
 
+class BulkResponse:
+    """
+    Responses of a request made for many symbols or orders, keyed by symbol,
+    or for orders by position. Keys whose request failed are in errors
+    instead of results. For orders, ids maps every position to the order's
+    client id, or its order id without one (None when it has neither).
+    """
+
+    def __init__(
+        self,
+        results: Optional[Dict[Any, Any]] = None,
+        errors: Optional[Dict[Any, BaseException]] = None,
+        ids: Optional[Dict[int, Any]] = None,
+    ):
+        self.results = {} if results is None else results
+        self.errors = {} if errors is None else errors
+        self.ids = {} if ids is None else ids
+
+    def __repr__(self):
+        return (
+            f"BulkResponse(results={self.results!r}, errors={self.errors!r}, "
+            f"ids={self.ids!r})"
+        )
+
+
+class CancelReplaceResult:
+    """
+    Responses of a cancel-replace and how long each leg took, in seconds:
+    cancel_sign, cancel, replace_sign, replace and total.
+    order is None when the replacement wasn't sent because the cancel failed,
+    or because building it raised error after the cancel had gone out.
+    """
+
+    def __init__(
+        self,
+        cancel: Any,
+        order: Any = None,
+        timings: Optional[Dict[str, float]] = None,
+        error: Optional[Exception] = None,
+    ):
+        self.cancel = cancel
+        self.order = order
+        self.timings = {} if timings is None else timings
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"CancelReplaceResult(cancel={self.cancel!r}, "
+            f"order={self.order!r}, timings={self.timings!r}, error={self.error!r})"
+        )
+
+
 class MMFFunction(TypedDict):
     type: Literal["sqrt"]
     base: str
@@ -0,0 +1,263 @@
+from bisect import bisect_left
+from typing import Optional, List, Tuple, Callable, Any, Union, Dict
+
+
+class BookSide:
+    """
+    One side of an order book kept in two parallel sorted lists.
+
+    Keys are sorted ascending and the best level is always the last element,
+    so reading the top of book is O(1) and updates at or near the top don't
+    shift the rest of the list. Asks are stored with negated keys to get
+    that ordering.
+
+    Finding a level is a binary search, O(log n), but adding or removing a
+    level shifts the levels behind it, so it is O(n) in the worst case. This
+    is deliberate: deltas mostly touch the levels near the top, where little
+    is shifted, and plain lists stay compact and fast to read in order.
+    """
+
+    __slots__ = ("is_bid", "_keys", "_sizes")
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._keys: List[Any] = []
+        self._sizes: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, price):
+        return price if self.is_bid else -price
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._sizes.clear()
+
+    def update(self, price, size) -> None:
+        """
+        Sets the size at a price level, a zero size removes the level
+        """
+        keys = self._keys
+        key = self._key(price)
+        index = bisect_left(keys, key)
+        exists = index < len(keys) and keys[index] == key
+        if not size:
+            if exists:
+                del keys[index]
+                del self._sizes[index]
+        elif exists:
+            self._sizes[index] = size
+        else:
+            keys.insert(index, key)
+            self._sizes.insert(index, size)
+
+    def best(self) -> Optional[Tuple[Any, Any]]:
+        """
+        Returns the best (price, size) or None if the side is empty
+        """
+        if not self._keys:
+            return None
+        return self._key(self._keys[-1]), self._sizes[-1]
+
+    def size_at(self, price):
+        """
+        Returns the size resting at a price, 0 if there is no such level
+        """
+        keys = self._keys
+        key = self._key(price)
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            return self._sizes[index]
+        return 0
+
+    def levels(self, depth: Optional[int] = None) -> List[Tuple[Any, Any]]:
+        """
+        Returns up to depth (price, size) levels starting from the best one
+        """
+        count = len(self._keys) if depth is None else min(depth, len(self._keys))
+        key = self._key
+        return [(key(self._keys[-i]), self._sizes[-i]) for i in range(1, count + 1)]
+
+    def vwap(self, quantity):
+        """
+        Returns the average price of filling quantity against this side,
+        None if the side is not deep enough
+        """
+        remaining = quantity
+        notional = 0
+        for i in range(len(self._keys) - 1, -1, -1):
+            size = self._sizes[i]
+            price = self._key(self._keys[i])
+            if size >= remaining:
+                notional += price * remaining
+                return notional / quantity
+            notional += price * size
+            remaining -= size
+        return None
+
+
+class OrderBook:
+    """
+    Local order book of one market kept up to date from depth stream deltas.
+
+    It is initialised from a ``get_depth`` snapshot and applies deltas by
+    their update ids. A delta that doesn't follow the last applied update id
+    marks the book as out of sync; deltas are buffered until a new snapshot
+    is loaded and replayed on top of it. When a ``Public`` client is given,
+    the book fetches that snapshot by itself, up to MAX_RESYNC_ATTEMPTS times
+    per delta (use ``apply_delta_async`` with the async client). A response
+    that is not a snapshot, e.g. a rate limit error, ends the attempts for
+    that delta and leaves the book out of sync with its deltas buffered.
+
+    Prices and sizes are parsed with ``number_type`` (float by default,
+    ``decimal.Decimal`` for exact arithmetic).
+    """
+
+    MAX_BUFFERED_DELTAS = 1000
+    MAX_RESYNC_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        symbol: str,
+        snapshot: Optional[Dict[str, Any]] = None,
+        public: Optional[Any] = None,
+        number_type: Callable[[str], Any] = float,
+    ):
+        self.symbol = symbol
+        self.public = public
+        self.number_type = number_type
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id: Optional[int] = None
+        self.synced = False
+        self._buffer: List[Dict[str, Any]] = []
+        if snapshot is not None:
+            self.load_snapshot(snapshot)
+
+    def load_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Replaces the book with a get_depth snapshot and replays buffered deltas.
+        A gap among them leaves the book out of sync with the rest buffered.
+        """
+        number = self.number_type
+        for side, levels in (
+            (self.bids, snapshot["bids"]),
+            (self.asks, snapshot["asks"]),
+        ):
+            side.clear()
+            for price, size in levels:
+                side.update(number(price), number(size))
+        self.last_update_id = int(snapshot["lastUpdateId"])
+        self.synced = True
+        buffered, self._buffer = self._buffer, []
+        for delta in buffered:
+            self._apply(delta)
+
+    @staticmethod
+    def is_snapshot(response: Any) -> bool:
+        """
+        Returns whether a get_depth response is a snapshot rather than an error body
+        """
+        return isinstance(response, dict) and all(
+            key in response for key in ("bids", "asks", "lastUpdateId")
+        )
+
+    def _apply(self, delta: Dict[str, Any]) -> bool:
+        if self.synced:
+            first_id = int(delta["U"])
+            last_id = int(delta["u"])
+            if last_id <= self.last_update_id:
+                return True
+            if first_id <= self.last_update_id + 1:
+                number = self.number_type
+                for price, size in delta["b"]:
+                    self.bids.update(number(price), number(size))
+                for price, size in delta["a"]:
+                    self.asks.update(number(price), number(size))
+                self.last_update_id = last_id
+                return True
+            self.synced = False
+        self._buffer.append(delta)
+        if len(self._buffer) > self.MAX_BUFFERED_DELTAS:
+            del self._buffer[0]
+        return False
+
+    def apply_delta(self, delta: Dict[str, Any]) -> bool:
+        """
+        Applies a depth stream delta, returns False if the book is out of sync.
+        With a sync Public client the snapshot is reloaded right away.
+        """
+        if self._apply(delta):
+            return True
+        if self.public is not None:
+            for _ in range(self.MAX_RESYNC_ATTEMPTS):
+                snapshot = self.public.get_depth(self.symbol)
+                if not self.is_snapshot(snapshot):
+                    break
+                self.load_snapshot(snapshot)
+                if self.synced:
+                    break
+        return self.synced
+
+    async def apply_delta_async(self, delta: Dict[str, Any]) -> bool:
+        """
+        Applies a depth stream delta, reloading the snapshot with an async Public client on a gap
+        """
+        if self._apply(delta):
+            return True
+        if self.public is not None:
+            for _ in range(self.MAX_RESYNC_ATTEMPTS):
+                snapshot = await self.public.get_depth(self.symbol)
+                if not self.is_snapshot(snapshot):
+                    break
+                self.load_snapshot(snapshot)
+                if self.synced:
+                    break
+        return self.synced
+
+    def best_bid(self) -> Optional[Tuple[Any, Any]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[Any, Any]]:
+        return self.asks.best()
+
+    def mid_price(self):
+        bid = self.bids.best()
+        ask = self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        bid = self.bids.best()
+        ask = self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def size_at(self, side: str, price: Union[str, Any]):
+        """
+        Returns the size resting at a price on the "Bid" or "Ask" side
+        """
+        if isinstance(price, str):
+            price = self.number_type(price)
+        book_side = self.bids if side == "Bid" else self.asks
+        return book_side.size_at(price)
+
+    def vwap(self, side: str, quantity: Union[str, Any]):
+        """
+        Returns the average fill price of an order of the given side ("Bid" buys from asks)
+        """
+        if isinstance(quantity, str):
+            quantity = self.number_type(quantity)
+        book_side = self.asks if side == "Bid" else self.bids
+        return book_side.vwap(quantity)
+
+    def __repr__(self):
+        return (
+            f"OrderBook(symbol={self.symbol!r}, "
+            f"best_bid={self.best_bid()!r}, "
+            f"best_ask={self.best_ask()!r}, "
+            f"last_update_id={self.last_update_id!r})"
+        )
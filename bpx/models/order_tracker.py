@@ -0,0 +1,245 @@
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+class OrderTracker:
+    """
+    In-memory index of the orders placed through an Account, by order id,
+    client id and symbol.
+
+    Pass it as Account(order_tracker=...) and every order, cancel and batch
+    response is recorded, so open orders can be looked up without a request.
+    Only the max_closed most recently closed orders are kept, older ones are
+    forgotten so long-running quoting doesn't grow the index without bound::
+
+        tracker = OrderTracker()
+        account = Account(public_key, secret_key, order_tracker=tracker)
+        account.execute_order("SOL_USDC", "Bid", "Limit", quantity="1", price="100")
+        tracker.open_orders("SOL_USDC")
+
+    Fills from get_fill_history and orderUpdate events of the account stream
+    advance the executed quantity. Orders and stream events report it
+    cumulatively, fills are summed per order, and the larger of the two wins.
+    reconcile() compares the index with get_open_orders to catch orders that
+    were closed without the tracker seeing it.
+    """
+
+    OPEN_STATUSES = frozenset(("New", "PartiallyFilled", "TriggerPending"))
+    # status of orders that reconciliation found closed without knowing how
+    CLOSED = "Closed"
+
+    # account stream orderUpdate keys and the REST keys they stand for
+    _STREAM_KEYS = {
+        "i": "id",
+        "c": "clientId",
+        "s": "symbol",
+        "S": "side",
+        "o": "orderType",
+        "f": "timeInForce",
+        "q": "quantity",
+        "Q": "quoteQuantity",
+        "p": "price",
+        "P": "triggerPrice",
+        "X": "status",
+        "z": "executedQuantity",
+        "Z": "executedQuoteQuantity",
+    }
+
+    def __init__(self, max_closed: int = 1000):
+        self.max_closed = max_closed
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self._by_client_id: Dict[int, str] = {}
+        self._open_by_symbol: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._seen_at: Dict[str, float] = {}
+        self._trade_ids: Dict[str, Set[Any]] = {}
+        self._filled: Dict[str, Decimal] = {}
+        # ids of closed orders, least recently closed first
+        self._closed: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def on_order(self, order: Any) -> None:
+        """
+        Records an order response, e.g. from execute_order, cancel_order or get_open_order.
+        Responses that are not orders are ignored.
+        """
+        if not isinstance(order, dict) or "id" not in order:
+            return
+        with self._lock:
+            order_id = order["id"]
+            tracked = self.orders.setdefault(order_id, {})
+            tracked.update(order)
+            self._apply_fills(tracked)
+            self._seen_at[order_id] = monotonic()
+            if tracked.get("clientId") is not None:
+                self._by_client_id[int(tracked["clientId"])] = order_id
+            self._index(tracked)
+
+    def on_orders(self, orders: Iterable[Any]) -> None:
+        for order in orders:
+            self.on_order(order)
+
+    def on_order_update(self, event: Dict[str, Any]) -> None:
+        """
+        Records an orderUpdate event of the account stream
+        """
+        order = {
+            key: event[short]
+            for short, key in self._STREAM_KEYS.items()
+            if short in event
+        }
+        self.on_order(order)
+
+    def on_fill(self, fill: Dict[str, Any]) -> None:
+        """
+        Adds a fill of get_fill_history to the fills of its order, once per trade id.
+        Fills without a trade id are told apart by timestamp, price and quantity,
+        and ignored without a timestamp.
+        """
+        order_id = fill.get("orderId")
+        trade_id = fill.get("tradeId")
+        if trade_id is None:
+            if fill.get("timestamp") is None:
+                return
+            trade_id = (fill["timestamp"], fill.get("price"), fill["quantity"])
+        with self._lock:
+            tracked = self.orders.get(order_id)
+            if tracked is None:
+                return
+            trade_ids = self._trade_ids.setdefault(order_id, set())
+            if trade_id in trade_ids:
+                return
+            trade_ids.add(trade_id)
+            self._filled[order_id] = self._filled.get(order_id, Decimal(0)) + Decimal(
+                fill["quantity"]
+            )
+            self._apply_fills(tracked)
+            self._index(tracked)
+
+    def get(
+        self, order_id: Optional[str] = None, client_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns a tracked order by order id or client id
+        """
+        with self._lock:
+            if order_id is None and client_id is not None:
+                order_id = self._by_client_id.get(int(client_id))
+            return self.orders.get(order_id)
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns tracked open orders, of one symbol or of all of them
+        """
+        with self._lock:
+            if symbol is not None:
+                return list(self._open_by_symbol.get(symbol, {}).values())
+            return [
+                order
+                for orders in self._open_by_symbol.values()
+                for order in orders.values()
+            ]
+
+    def reconcile(
+        self,
+        open_orders: Any,
+        symbol: Optional[str] = None,
+        requested_at: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Brings the index in line with a get_open_orders response and returns the
+        orders it marked CLOSED. Orders recorded after requested_at (a monotonic()
+        taken before the request) are kept, the response may predate them.
+        """
+        if not isinstance(open_orders, list):
+            return []
+        with self._lock:
+            self.on_orders(open_orders)
+            listed = {order["id"] for order in open_orders if isinstance(order, dict)}
+            closed = []
+            for order in self.open_orders(symbol):
+                order_id = order["id"]
+                if order_id in listed:
+                    continue
+                if requested_at is not None and self._seen_at[order_id] > requested_at:
+                    continue
+                order["status"] = self.CLOSED
+                self._index(order)
+                closed.append(order)
+            return closed
+
+    def start_reconciliation(self, account, interval: float = 30.0) -> threading.Event:
+        """
+        Reconciles with a sync Account every interval seconds in a daemon thread,
+        set the returned event to stop
+        """
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                requested_at = monotonic()
+                try:
+                    open_orders = account.get_open_orders()
+                except Exception:
+                    continue
+                self.reconcile(open_orders, requested_at=requested_at)
+
+        threading.Thread(target=run, daemon=True).start()
+        return stop
+
+    async def reconcile_periodically(self, account, interval: float = 30.0) -> None:
+        """
+        Reconciles with an async Account every interval seconds until cancelled
+        """
+        import asyncio
+
+        while True:
+            await asyncio.sleep(interval)
+            requested_at = monotonic()
+            try:
+                open_orders = await account.get_open_orders()
+            except Exception:
+                continue
+            self.reconcile(open_orders, requested_at=requested_at)
+
+    def _apply_fills(self, order: Dict[str, Any]) -> None:
+        filled = self._filled.get(order["id"])
+        if filled is None or filled <= Decimal(order.get("executedQuantity") or 0):
+            return
+        order["executedQuantity"] = str(filled)
+        if order.get("status", "New") not in self.OPEN_STATUSES:
+            return
+        quantity = order.get("quantity")
+        if quantity is not None and filled >= Decimal(quantity):
+            order["status"] = "Filled"
+        else:
+            order["status"] = "PartiallyFilled"
+
+    def _index(self, order: Dict[str, Any]) -> None:
+        order_id = order["id"]
+        symbol = order.get("symbol")
+        if order.get("status", "New") in self.OPEN_STATUSES:
+            self._open_by_symbol.setdefault(symbol, {})[order_id] = order
+            self._closed.pop(order_id, None)
+            return
+        orders = self._open_by_symbol.get(symbol)
+        if orders is not None:
+            orders.pop(order_id, None)
+            if not orders:
+                del self._open_by_symbol[symbol]
+        self._closed[order_id] = None
+        self._closed.move_to_end(order_id)
+        while len(self._closed) > self.max_closed:
+            self._forget(self._closed.popitem(last=False)[0])
+
+    def _forget(self, order_id: str) -> None:
+        order = self.orders.pop(order_id, None)
+        self._seen_at.pop(order_id, None)
+        self._trade_ids.pop(order_id, None)
+        self._filled.pop(order_id, None)
+        if order is not None and order.get("clientId") is not None:
+            client_id = int(order["clientId"])
+            if self._by_client_id.get(client_id) == order_id:
+                del self._by_client_id[client_id]
@@ -0,0 +1,204 @@
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from bpx.exceptions import OrderValidationError
+
+Number = Union[str, int, float, Decimal]
+
+
+def _decimal(value: Optional[Number]) -> Optional[Decimal]:
+    if value is None or value == "":
+        return None
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+class MarketRules:
+    """
+    Price and quantity filters of one market, parsed once into Decimals
+    """
+
+    __slots__ = (
+        "symbol",
+        "tick_size",
+        "min_price",
+        "max_price",
+        "step_size",
+        "min_quantity",
+        "max_quantity",
+        "min_notional",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        tick_size: Optional[Number] = None,
+        min_price: Optional[Number] = None,
+        max_price: Optional[Number] = None,
+        step_size: Optional[Number] = None,
+        min_quantity: Optional[Number] = None,
+        max_quantity: Optional[Number] = None,
+        min_notional: Optional[Number] = None,
+    ):
+        self.symbol = symbol
+        self.tick_size = _decimal(tick_size)
+        self.min_price = _decimal(min_price)
+        self.max_price = _decimal(max_price)
+        self.step_size = _decimal(step_size)
+        self.min_quantity = _decimal(min_quantity)
+        self.max_quantity = _decimal(max_quantity)
+        self.min_notional = _decimal(min_notional)
+
+    @classmethod
+    def from_market(cls, market: Dict[str, Any]) -> "MarketRules":
+        """
+        Builds the rules from one item of the get_markets response
+        """
+        filters = market.get("filters") or {}
+        price = filters.get("price") or {}
+        quantity = filters.get("quantity") or {}
+        notional = filters.get("notional") or {}
+        return cls(
+            symbol=market["symbol"],
+            tick_size=price.get("tickSize"),
+            min_price=price.get("minPrice"),
+            max_price=price.get("maxPrice"),
+            step_size=quantity.get("stepSize"),
+            min_quantity=quantity.get("minQuantity"),
+            max_quantity=quantity.get("maxQuantity"),
+            min_notional=notional.get("minNotional"),
+        )
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"MarketRules({fields})"
+
+
+class OrderValidator:
+    """
+    Checks orders against market filters before they are signed and sent.
+
+    With round_values=True prices are moved onto the tick grid away from the book
+    (bids down, asks up) and quantities down onto the step grid, otherwise
+    any value off the grid is rejected. Limits and minimal notional are
+    always enforced by raising OrderValidationError. Symbols without rules
+    are passed through unchanged::
+
+        validator = OrderValidator.from_markets(public.get_markets())
+        account = Account(public_key, secret_key, order_validator=validator)
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, MarketRules]] = None,
+        round_values: bool = True,
+    ):
+        self.rules = rules or {}
+        self.round_values = round_values
+
+    @classmethod
+    def from_markets(
+        cls, markets: Iterable[Dict[str, Any]], round_values: bool = True
+    ) -> "OrderValidator":
+        validator = cls(round_values=round_values)
+        validator.load_markets(markets)
+        return validator
+
+    def load_markets(self, markets: Iterable[Dict[str, Any]]) -> None:
+        """
+        Replaces the rule table with rules built from a get_markets response
+        """
+        self.rules = {
+            market["symbol"]: MarketRules.from_market(market) for market in markets
+        }
+
+    def validate(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Optional[Number] = None,
+        price: Optional[Number] = None,
+        trigger_price: Optional[Number] = None,
+        quote_quantity: Optional[Number] = None,
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Returns quantity, price and trigger_price as strings on the market's grid
+        """
+        rules = self.rules.get(symbol)
+        if rules is None:
+            return quantity, price, trigger_price
+        quantity = self._quantity(rules, _decimal(quantity))
+        price = self._price(rules, side, _decimal(price), "price")
+        trigger_price = self._price(
+            rules, side, _decimal(trigger_price), "trigger price"
+        )
+        if rules.min_notional is not None:
+            notional = _decimal(quote_quantity)
+            if notional is None and quantity is not None and price is not None:
+                notional = quantity * price
+            if notional is not None and notional < rules.min_notional:
+                raise OrderValidationError(
+                    symbol, f"notional {notional} is below {rules.min_notional}"
+                )
+        return (
+            None if quantity is None else format(quantity, "f"),
+            None if price is None else format(price, "f"),
+            None if trigger_price is None else format(trigger_price, "f"),
+        )
+
+    def _price(
+        self, rules: MarketRules, side: str, price: Optional[Decimal], name: str
+    ) -> Optional[Decimal]:
+        if price is None:
+            return None
+        if rules.tick_size:
+            price = self._on_grid(
+                rules,
+                price,
+                rules.tick_size,
+                ROUND_FLOOR if side == "Bid" else ROUND_CEILING,
+                name,
+            )
+        if rules.min_price is not None and price < rules.min_price:
+            raise OrderValidationError(
+                rules.symbol, f"{name} {price} is below {rules.min_price}"
+            )
+        if rules.max_price is not None and price > rules.max_price:
+            raise OrderValidationError(
+                rules.symbol, f"{name} {price} is above {rules.max_price}"
+            )
+        return price
+
+    def _quantity(
+        self, rules: MarketRules, quantity: Optional[Decimal]
+    ) -> Optional[Decimal]:
+        if quantity is None:
+            return None
+        if rules.step_size:
+            quantity = self._on_grid(
+                rules, quantity, rules.step_size, ROUND_FLOOR, "quantity"
+            )
+        if rules.min_quantity is not None and quantity < rules.min_quantity:
+            raise OrderValidationError(
+                rules.symbol, f"quantity {quantity} is below {rules.min_quantity}"
+            )
+        if rules.max_quantity is not None and quantity > rules.max_quantity:
+            raise OrderValidationError(
+                rules.symbol, f"quantity {quantity} is above {rules.max_quantity}"
+            )
+        return quantity
+
+    def _on_grid(
+        self,
+        rules: MarketRules,
+        value: Decimal,
+        increment: Decimal,
+        rounding: str,
+        name: str,
+    ) -> Decimal:
+        steps = value / increment
+        whole = steps.to_integral_value(rounding=rounding)
+        if whole != steps and not self.round_values:
+            raise OrderValidationError(
+                rules.symbol, f"{name} {value} is not a multiple of {increment}"
+            )
+        return (whole * increment).quantize(increment)
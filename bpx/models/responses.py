@@ -0,0 +1,250 @@
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple, Type, TypeVar, Union
+
+from bpx.exceptions import UnexpectedResponseError
+
+_MISSING = object()
+
+Model = TypeVar("Model", bound="ResponseModel")
+
+
+class _Field:
+    """
+    Descriptor decoding one key of the raw response the first time it's read
+    """
+
+    __slots__ = ("key", "kind", "index")
+
+    def __init__(self, key: str, kind: str):
+        self.key = key
+        self.kind = kind
+        self.index = -1
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = instance._values
+        value = values[self.index]
+        if value is _MISSING:
+            value = instance._decode(self.kind, instance._raw.get(self.key))
+            values[self.index] = value
+        return value
+
+
+def text(key: str) -> Any:
+    return _Field(key, "text")
+
+
+def number(key: str) -> Any:
+    return _Field(key, "number")
+
+
+def integer(key: str) -> Any:
+    return _Field(key, "integer")
+
+
+def flag(key: str) -> Any:
+    return _Field(key, "flag")
+
+
+def levels(key: str) -> Any:
+    return _Field(key, "levels")
+
+
+class ResponseModel:
+    """
+    Read-only view of one response object.
+
+    The raw dict is kept as is and each field is decoded on first access and
+    cached. Prices and quantities are decoded with number_type:
+    ``decimal.Decimal`` by default, ``float`` for a faster path.
+
+    Models are opt-in, clients keep returning plain dicts::
+
+        ticker = Ticker.parse(public.get_ticker("SOL_USDC"), number_type=float)
+        fills = Fill.parse(account.get_fill_history("SOL_USDC"))
+    """
+
+    __slots__ = ("_raw", "_values", "_number_type")
+    _fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = list(cls._fields)
+        for name, attribute in vars(cls).items():
+            if isinstance(attribute, _Field):
+                attribute.index = len(fields)
+                fields.append(name)
+        cls._fields = tuple(fields)
+
+    def __init__(
+        self, raw: Dict[str, Any], number_type: Callable[[str], Any] = Decimal
+    ):
+        self._raw = raw
+        self._values = [_MISSING] * len(self._fields)
+        self._number_type = number_type
+
+    def _decode(self, kind: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if kind == "number":
+            return self._number_type(value)
+        if kind == "integer":
+            return int(value)
+        if kind == "flag":
+            return value if isinstance(value, bool) else value == "true"
+        if kind == "levels":
+            number_type = self._number_type
+            return [(number_type(price), number_type(size)) for price, size in value]
+        return value
+
+    @classmethod
+    def parse(
+        cls: Type[Model],
+        response: Union[Dict[str, Any], List[Any], str],
+        number_type: Callable[[str], Any] = Decimal,
+    ) -> Union[Model, List[Model]]:
+        """
+        Returns a model for a dict response or a list of models for a list response
+        """
+        if isinstance(response, list):
+            return [cls(item, number_type) for item in response]
+        if isinstance(response, dict):
+            return cls(response, number_type)
+        raise UnexpectedResponseError(response)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._raw
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._raw == other._raw
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class Ticker(ResponseModel):
+    __slots__ = ()
+
+    symbol = text("symbol")
+    first_price = number("firstPrice")
+    last_price = number("lastPrice")
+    price_change = number("priceChange")
+    price_change_percent = number("priceChangePercent")
+    high = number("high")
+    low = number("low")
+    volume = number("volume")
+    quote_volume = number("quoteVolume")
+    trades = integer("trades")
+
+
+class Depth(ResponseModel):
+    __slots__ = ()
+
+    bids = levels("bids")
+    asks = levels("asks")
+    last_update_id = integer("lastUpdateId")
+    timestamp = integer("timestamp")
+
+
+class Kline(ResponseModel):
+    __slots__ = ()
+
+    start = text("start")
+    end = text("end")
+    open = number("open")
+    high = number("high")
+    low = number("low")
+    close = number("close")
+    volume = number("volume")
+    quote_volume = number("quoteVolume")
+    trades = integer("trades")
+
+
+class Trade(ResponseModel):
+    __slots__ = ()
+
+    id = integer("id")
+    price = number("price")
+    quantity = number("quantity")
+    quote_quantity = number("quoteQuantity")
+    timestamp = integer("timestamp")
+    is_buyer_maker = flag("isBuyerMaker")
+
+
+class Order(ResponseModel):
+    __slots__ = ()
+
+    id = text("id")
+    client_id = integer("clientId")
+    symbol = text("symbol")
+    side = text("side")
+    order_type = text("orderType")
+    time_in_force = text("timeInForce")
+    status = text("status")
+    price = number("price")
+    trigger_price = number("triggerPrice")
+    quantity = number("quantity")
+    quote_quantity = number("quoteQuantity")
+    executed_quantity = number("executedQuantity")
+    executed_quote_quantity = number("executedQuoteQuantity")
+    self_trade_prevention = text("selfTradePrevention")
+    post_only = flag("postOnly")
+    reduce_only = flag("reduceOnly")
+    created_at = integer("createdAt")
+
+
+class Fill(ResponseModel):
+    __slots__ = ()
+
+    trade_id = integer("tradeId")
+    order_id = text("orderId")
+    client_id = integer("clientId")
+    symbol = text("symbol")
+    side = text("side")
+    price = number("price")
+    quantity = number("quantity")
+    fee = number("fee")
+    fee_symbol = text("feeSymbol")
+    is_maker = flag("isMaker")
+    timestamp = text("timestamp")
+
+
+class Position(ResponseModel):
+    __slots__ = ()
+
+    position_id = text("positionId")
+    symbol = text("symbol")
+    net_quantity = number("netQuantity")
+    net_exposure_quantity = number("netExposureQuantity")
+    net_exposure_notional = number("netExposureNotional")
+    entry_price = number("entryPrice")
+    mark_price = number("markPrice")
+    break_even_price = number("breakEvenPrice")
+    est_liquidation_price = number("estLiquidationPrice")
+    pnl_realized = number("pnlRealized")
+    pnl_unrealized = number("pnlUnrealized")
+
+
+class Balance(ResponseModel):
+    __slots__ = ()
+
+    available = number("available")
+    locked = number("locked")
+    staked = number("staked")
+
+    @classmethod
+    def parse_balances(
+        cls,
+        response: Union[Dict[str, Any], List[Any], str],
+        number_type: Callable[[str], Any] = Decimal,
+    ) -> Dict[str, "Balance"]:
+        """
+        Returns balances keyed by asset from a get_balances response
+        """
+        if not isinstance(response, dict):
+            raise UnexpectedResponseError(response)
+        return {asset: cls(raw, number_type) for asset, raw in response.items()}
@@ -1,5 +1,5 @@
 from bpx.base.base_public import BasePublic
-from bpx.http_client.sync_http_client import SyncHttpClient
+from bpx.http_client.lazy import LazyClient
 from bpx.models.objects import (
     MMFFunction,
     IMFFunction,
@@ -11,9 +11,24 @@ from bpx.constants.enums import (
     BorrowLendMarketHistoryIntervalType,
     BorrowLendMarketHistoryIntervalEnum,
 )
-from typing import Optional, Union, Dict, Any, List
+from bpx.models.klines import KlineArrays
+from bpx.exceptions import UnexpectedResponseError
+from bpx.reference_cache import ReferenceCache
+from typing import TYPE_CHECKING, Optional, Union, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from time import time
 
-default_http_client = SyncHttpClient()
+if TYPE_CHECKING:
+    from bpx.http_client.sync_http_client import SyncHttpClient
+
+_default_http_client = LazyClient("bpx.http_client.sync_http_client", "SyncHttpClient")
+
+
+def __getattr__(name: str) -> Any:
+    if name == "default_http_client":
+        return _default_http_client.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Public(BasePublic):
@@ -21,10 +36,30 @@ class Public(BasePublic):
     def __init__(
         self,
         proxy: Optional[dict] = None,
-        http_client: SyncHttpClient = default_http_client,
+        http_client: Optional["SyncHttpClient"] = None,
+        reference_cache: Optional[ReferenceCache] = None,
     ):
+        # the shared default client stays open when this instance is closed
+        self._shared_http_client = http_client is None
+        if http_client is None:
+            http_client = _default_http_client.get()
         self.http_client = http_client
         self.http_client.proxies = proxy
+        self.reference_cache = reference_cache
+
+    def __enter__(self) -> "Public":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the pooled sessions of the http client passed in, the shared
+        default client is left open for the other instances
+        """
+        if not self._shared_http_client:
+            self.http_client.close()
 
     def get_assets(self):
         """
@@ -32,10 +67,10 @@ class Public(BasePublic):
 
         https://docs.backpack.exchange/#tag/Markets/operation/get_assets
         """
-        return self.http_client.get(self.get_assets_url())
+        return self._get_reference(ReferenceCache.ASSETS, self.get_assets_url())
 
     def get_collateral(self) -> Union[str, IMFFunction, MMFFunction, HaircutFunction]:
-        return self.http_client.get(self.get_collateral_url())
+        return self._get_reference(ReferenceCache.COLLATERAL, self.get_collateral_url())
 
     def get_borrow_lend_markets(self):
         """
@@ -43,7 +78,9 @@ class Public(BasePublic):
 
         https://docs.backpack.exchange/#tag/Borrow-Lend-Markets/operation/get_borrow_lend_markets
         """
-        return self.http_client.get(self.get_borrow_lend_markets_url())
+        return self._get_reference(
+            ReferenceCache.BORROW_LEND_MARKETS, self.get_borrow_lend_markets_url()
+        )
 
     def get_borrow_lend_market_history(
         self,
@@ -61,13 +98,21 @@ class Public(BasePublic):
             self.get_borrow_lend_market_history_url(interval, symbol)
         )
 
-    def get_market(self):
+    def get_market(self, symbol: Optional[str] = None):
         """
-        Returns all markets
+        Returns information about a specified market, all markets when symbol is None.
+        With a reference cache the market is resolved from the cached markets.
 
-        https://docs.backpack.exchange/#tag/Markets/operation/get_markets
+        https://docs.backpack.exchange/#tag/Markets/operation/get_market
         """
-        return self.http_client.get(self.get_markets_url())
+        if symbol is None:
+            return self.get_markets()
+        if self.reference_cache is not None:
+            self.get_markets()
+            market = self.reference_cache.market(symbol)
+            if market is not None:
+                return market
+        return self.http_client.get(self.get_market_url(symbol))
 
     def get_markets(self):
         """
@@ -75,7 +120,12 @@ class Public(BasePublic):
 
         https://docs.backpack.exchange/#tag/Markets/operation/get_markets
         """
-        return self.http_client.get(self.get_markets_url())
+        return self._get_reference(ReferenceCache.MARKETS, self.get_markets_url())
+
+    def _get_reference(self, name: str, url: str):
+        if self.reference_cache is None:
+            return self.http_client.get(url)
+        return self.reference_cache.get(name, lambda: self.http_client.get(url))
 
     def get_ticker(self, symbol: str):
         """
@@ -122,6 +172,40 @@ class Public(BasePublic):
             )
         )
 
+    def get_klines_backfill(
+        self,
+        symbol: str,
+        interval: Union[TimeIntervalType, TimeIntervalEnum],
+        start_time: int,
+        end_time: Optional[int] = None,
+        klines: Optional[KlineArrays] = None,
+        max_workers: int = 4,
+    ) -> KlineArrays:
+        """
+        Returns klines of a long time range as NumPy columns, fetched in concurrent chunks.
+        When klines is given only candles from its last open time on are fetched and appended.
+
+        https://docs.backpack.exchange/#tag/Markets/operation/get_klines
+        """
+        if klines is not None and klines.last_open_time is not None:
+            start_time = max(start_time, klines.last_open_time)
+        end_time = int(time()) if end_time is None else end_time
+        urls = self.get_klines_backfill_urls(symbol, interval, start_time, end_time)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(copy_context().run, self.http_client.get, url)
+                for url in urls
+            ]
+            pages = [future.result() for future in futures]
+        chunks = []
+        for page in pages:
+            if not isinstance(page, list):
+                raise UnexpectedResponseError(page)
+            chunks.append(KlineArrays.from_klines(page))
+        if klines is not None:
+            chunks.insert(0, klines)
+        return KlineArrays.concatenate(chunks)
+
     def get_open_interest(self, symbol: Optional[str] = None):
         """
         Returns open interest for a specified market
@@ -0,0 +1,59 @@
+import threading
+from typing import Any, Callable, Dict, Optional, Set
+
+from bpx.base.base_reference_cache import BaseReferenceCache
+
+
+class ReferenceCache(BaseReferenceCache):
+    """
+    Thread-safe reference data cache for the sync Public client.
+
+    Concurrent misses of one endpoint wait on a single request, and refreshes
+    ahead of expiry run in a daemon thread::
+
+        public = Public(reference_cache=ReferenceCache(ttl={"markets": 60}))
+        public.get_market("SOL_USDC")  # fetches markets once, then resolves locally
+    """
+
+    def __init__(
+        self, ttl: Optional[Dict[str, float]] = None, refresh_ahead: float = 0.8
+    ):
+        super().__init__(ttl, refresh_ahead)
+        self._locks = {name: threading.Lock() for name in self.ttl}
+        self._refreshing: Set[str] = set()
+        self._refreshing_lock = threading.Lock()
+
+    def get(self, name: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value of an endpoint, calling fetch when it's missing or expired
+        """
+        fresh, due, value = self.lookup(name)
+        if fresh:
+            if due:
+                self._refresh_in_background(name, fetch)
+            return value
+        with self._locks[name]:
+            fresh, _, value = self.lookup(name)
+            if fresh:
+                return value
+            return self.store(name, fetch())
+
+    def _refresh_in_background(self, name: str, fetch: Callable[[], Any]) -> None:
+        with self._refreshing_lock:
+            if name in self._refreshing:
+                return
+            self._refreshing.add(name)
+        threading.Thread(target=self._refresh, args=(name, fetch), daemon=True).start()
+
+    def _refresh(self, name: str, fetch: Callable[[], Any]) -> None:
+        try:
+            with self._locks[name]:
+                fresh, due, _ = self.lookup(name)
+                if due or not fresh:
+                    self.store(name, fetch())
+        except Exception:
+            # the entry stays as it is, the next read past its ttl fetches again
+            pass
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(name)
@@ -0,0 +1,481 @@
+import base64
+import json
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from time import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from bpx.base.base_account import BaseAccount
+from bpx.constants.enums import TIME_INTERVAL_SECONDS
+
+Response = Tuple[int, Any]
+
+OPEN_STATUSES = ("New", "PartiallyFilled")
+
+
+def _error(status: int, code: str, message: str) -> Response:
+    return status, {"code": code, "message": message}
+
+
+def _iso(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1e3, timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%S.%f"
+    )[:-3]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class ExchangeSimulator:
+    """
+    Local stand-in for the exchange REST api, for tests and benchmarks
+    without network access.
+
+    Serves market data, order placement and cancellation, open orders and
+    order/fill history over http. Signed requests are checked like the
+    exchange does: the X-API-Key is the base64 ed25519 public key (or an alias
+    from api_keys), and the signature, timestamp and window have to match the
+    signing scheme of BaseAccount.
+
+    Every market trades at a fixed price. Orders that cross it fill there
+    in full, other limit orders rest until cancelled::
+
+        with ExchangeSimulator() as simulator:
+            account = Account(public_key, secret_key)
+            account.BPX_API_URL = simulator.url
+            public = Public()
+            public.BASE_URL = simulator.url
+    """
+
+    DEFAULT_PRICES = {"SOL_USDC": "100", "BTC_USDC": "60000"}
+
+    SIGNED = {
+        ("GET", "/api/v1/order"): "orderQuery",
+        ("POST", "/api/v1/order"): "orderExecute",
+        ("DELETE", "/api/v1/order"): "orderCancel",
+        ("GET", "/api/v1/orders"): "orderQueryAll",
+        ("POST", "/api/v1/orders"): "orderExecute",
+        ("DELETE", "/api/v1/orders"): "orderCancelAll",
+        ("GET", "/wapi/v1/history/orders"): "orderHistoryQueryAll",
+        ("GET", "/wapi/v1/history/fills"): "fillHistoryQueryAll",
+    }
+
+    def __init__(
+        self,
+        prices: Optional[Mapping[str, str]] = None,
+        api_keys: Optional[Mapping[str, str]] = None,
+        clock_offset: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.prices = {
+            symbol: Decimal(price)
+            for symbol, price in (prices or self.DEFAULT_PRICES).items()
+        }
+        self.api_keys = dict(api_keys or {})
+        self.clock_offset = clock_offset
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.fills: List[Dict[str, Any]] = []
+        self._order_ids = count(1)
+        self._trade_ids = count(1)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "ExchangeSimulator":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "ExchangeSimulator":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def now(self) -> int:
+        return int(time() * 1e3) + self.clock_offset
+
+    def _handler(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out in one segment, no delayed ack stalls
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, payload = simulator.handle(
+                    self.command,
+                    url.path,
+                    dict(parse_qsl(url.query)),
+                    body,
+                    self.headers,
+                )
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = do_PATCH = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, str],
+        body: bytes,
+        headers: Mapping[str, str],
+    ) -> Response:
+        """
+        Returns the status and json payload of a request
+        """
+        instruction = self.SIGNED.get((method, path))
+        if instruction is None:
+            if method != "GET":
+                return _error(404, "NOT_FOUND", f"No route for {method} {path}")
+            return self._public(path, query)
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return _error(400, "INVALID_CLIENT_REQUEST", "Invalid json body")
+        params = query if method == "GET" else data
+        if params is None:
+            params = {}
+        rejected = self._verify(headers, params, instruction)
+        if rejected is not None:
+            return rejected
+        with self._lock:
+            return self._private(method, path, params)
+
+    def _verify(
+        self, headers: Mapping[str, str], params: Any, instruction: str
+    ) -> Optional[Response]:
+        try:
+            api_key = headers["X-API-Key"]
+            signature = base64.b64decode(headers["X-Signature"])
+            timestamp = int(headers["X-Timestamp"])
+            window = int(headers.get("X-Window", 5000))
+        except (KeyError, ValueError):
+            return _error(401, "UNAUTHORIZED", "Missing or invalid signature headers")
+        try:
+            public_key = ed25519.Ed25519PublicKey.from_public_bytes(
+                base64.b64decode(self.api_keys.get(api_key, api_key))
+            )
+        except ValueError:
+            return _error(401, "UNAUTHORIZED", "Invalid api key")
+        if window > 60000:
+            return _error(400, "INVALID_CLIENT_REQUEST", "Window is too large")
+        now = self.now()
+        if now > timestamp + window or timestamp > now + window:
+            return _error(400, "INVALID_CLIENT_REQUEST", "Request has expired")
+        payload = BaseAccount._signing_payload(params, instruction, timestamp, window)
+        try:
+            public_key.verify(signature, payload.encode())
+        except InvalidSignature:
+            return _error(401, "UNAUTHORIZED", "Invalid signature")
+        return None
+
+    def _public(self, path: str, query: Dict[str, str]) -> Response:
+        symbol = query.get("symbol")
+        if path == "/api/v1/time":
+            return 200, self.now()
+        if path == "/api/v1/ping":
+            return 200, "pong"
+        if path == "/api/v1/status":
+            return 200, {"status": "Ok", "message": None}
+        if path == "/api/v1/markets":
+            return 200, [self.market(symbol) for symbol in self.prices]
+        if path.startswith("/api/v1/markets/"):
+            symbol = path.rsplit("/", 1)[1]
+            if symbol not in self.prices:
+                return _error(404, "RESOURCE_NOT_FOUND", "Market not found")
+            return 200, self.market(symbol)
+        if path == "/api/v1/tickers":
+            return 200, [self.ticker(symbol) for symbol in self.prices]
+        if path not in (
+            "/api/v1/ticker",
+            "/api/v1/depth",
+            "/api/v1/klines",
+            "/api/v1/trades",
+            "/api/v1/trades/history",
+        ):
+            return _error(404, "NOT_FOUND", f"No route for GET {path}")
+        if symbol not in self.prices:
+            return _error(400, "INVALID_MARKET", "Invalid market")
+        if path == "/api/v1/ticker":
+            return 200, self.ticker(symbol)
+        if path == "/api/v1/depth":
+            return 200, self.depth(symbol)
+        if path == "/api/v1/klines":
+            return self.klines(symbol, query)
+        limit = int(query.get("limit", 100))
+        offset = int(query.get("offset", 0))
+        with self._lock:
+            trades = [
+                self._public_trade(f) for f in self.fills if f["symbol"] == symbol
+            ]
+        trades.reverse()
+        return 200, trades[offset : offset + limit]
+
+    def market(self, symbol: str) -> Dict[str, Any]:
+        base, quote = symbol.split("_")[:2]
+        return {
+            "symbol": symbol,
+            "baseSymbol": base,
+            "quoteSymbol": quote,
+            "marketType": "SPOT",
+            "orderBookState": "Open",
+            "filters": {
+                "price": {"tickSize": "0.01", "minPrice": "0.01", "maxPrice": None},
+                "quantity": {
+                    "stepSize": "0.01",
+                    "minQuantity": "0.01",
+                    "maxQuantity": None,
+                },
+            },
+        }
+
+    def ticker(self, symbol: str) -> Dict[str, Any]:
+        price = str(self.prices[symbol])
+        with self._lock:
+            fills = [f for f in self.fills if f["symbol"] == symbol]
+        volume = sum((Decimal(f["quantity"]) for f in fills), Decimal(0))
+        return {
+            "symbol": symbol,
+            "firstPrice": price,
+            "lastPrice": price,
+            "high": price,
+            "low": price,
+            "priceChange": "0",
+            "priceChangePercent": "0",
+            "volume": str(volume),
+            "quoteVolume": str(volume * self.prices[symbol]),
+            "trades": str(len(fills)),
+        }
+
+    def depth(self, symbol: str, levels: int = 5) -> Dict[str, Any]:
+        price = self.prices[symbol]
+        tick = Decimal("0.01")
+        return {
+            "asks": [[str(price + tick * i), "10"] for i in range(1, levels + 1)],
+            "bids": [[str(price - tick * i), "10"] for i in range(levels, 0, -1)],
+            "lastUpdateId": str(len(self.fills)),
+            "timestamp": self.now(),
+        }
+
+    def klines(self, symbol: str, query: Dict[str, str]) -> Response:
+        try:
+            step = TIME_INTERVAL_SECONDS[query["interval"]]
+            start = int(query["startTime"])
+            end = int(query.get("endTime") or self.now() // 1000)
+        except (KeyError, ValueError):
+            return _error(400, "INVALID_CLIENT_REQUEST", "Invalid interval or time")
+        price = str(self.prices[symbol])
+        first = -(-start // step) * step
+        now = self.now() // 1000
+        klines = []
+        for open_time in range(first, min(end, now), step)[:1000]:
+            klines.append(
+                {
+                    "start": datetime.fromtimestamp(open_time, timezone.utc).strftime(
+                        "%Y-%m-%d %H:%M:%S"
+                    ),
+                    "end": datetime.fromtimestamp(
+                        open_time + step, timezone.utc
+                    ).strftime("%Y-%m-%d %H:%M:%S"),
+                    "open": price,
+                    "high": price,
+                    "low": price,
+                    "close": price,
+                    "volume": "0",
+                    "quoteVolume": "0",
+                    "trades": "0",
+                }
+            )
+        return 200, klines
+
+    def _public_trade(self, fill: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": fill["tradeId"],
+            "price": fill["price"],
+            "quantity": fill["quantity"],
+            "quoteQuantity": str(Decimal(fill["price"]) * Decimal(fill["quantity"])),
+            "timestamp": fill["ms"],
+            "isBuyerMaker": fill["side"] == "Ask",
+        }
+
+    def _private(self, method: str, path: str, params: Any) -> Response:
+        if (method, path) == ("POST", "/api/v1/orders"):
+            if not isinstance(params, list):
+                return _error(
+                    400, "INVALID_CLIENT_REQUEST", "Expected a list of orders"
+                )
+            return 200, [self._execute(order)[1] for order in params]
+        if not isinstance(params, dict):
+            return _error(400, "INVALID_CLIENT_REQUEST", "Expected an object")
+        if (method, path) == ("POST", "/api/v1/order"):
+            return self._execute(params)
+        if path == "/api/v1/order":
+            order = self._find_open(params)
+            if order is None:
+                return _error(404, "RESOURCE_NOT_FOUND", "Order not found")
+            if method == "DELETE":
+                order["status"] = "Cancelled"
+            return 200, dict(order)
+        symbol = params.get("symbol")
+        if path == "/api/v1/orders":
+            orders = [
+                order
+                for order in self.orders.values()
+                if order["status"] in OPEN_STATUSES
+                and (symbol is None or order["symbol"] == symbol)
+            ]
+            if method == "DELETE":
+                for order in orders:
+                    order["status"] = "Cancelled"
+            return 200, [dict(order) for order in orders]
+        try:
+            limit = int(params.get("limit", 100))
+            offset = int(params.get("offset", 0))
+            start = int(params.get("from", 0))
+            end = int(params["to"]) if params.get("to") is not None else None
+        except ValueError:
+            return _error(400, "INVALID_CLIENT_REQUEST", "Invalid limit or time")
+
+        def in_range(ms: int) -> bool:
+            return start <= ms and (end is None or ms <= end)
+
+        if path == "/wapi/v1/history/orders":
+            rows = [
+                dict(order)
+                for order in self.orders.values()
+                if (symbol is None or order["symbol"] == symbol)
+                and params.get("orderId") in (None, order["id"])
+                and in_range(order["createdAt"])
+            ]
+        else:
+            rows = [
+                {key: value for key, value in fill.items() if key != "ms"}
+                for fill in self.fills
+                if (symbol is None or fill["symbol"] == symbol) and in_range(fill["ms"])
+            ]
+        rows.reverse()
+        return 200, rows[offset : offset + limit]
+
+    def _find_open(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        order_id = params.get("orderId")
+        client_id = params.get("clientId")
+        for order in self.orders.values():
+            if (
+                order["symbol"] == params.get("symbol")
+                and order["status"] in OPEN_STATUSES
+                and (order_id is None or order["id"] == order_id)
+                and (client_id is None or str(order["clientId"]) == str(client_id))
+            ):
+                return order
+        return None
+
+    def _execute(self, params: Dict[str, Any]) -> Response:
+        symbol = params.get("symbol")
+        if symbol not in self.prices:
+            return _error(400, "INVALID_MARKET", "Invalid market")
+        side = params.get("side")
+        order_type = params.get("orderType")
+        if side not in ("Bid", "Ask") or order_type not in ("Limit", "Market"):
+            return _error(400, "INVALID_ORDER", "Invalid side or order type")
+        market_price = self.prices[symbol]
+        try:
+            price = Decimal(params["price"]) if "price" in params else None
+            if "quantity" in params:
+                quantity = Decimal(params["quantity"])
+            else:
+                quantity = Decimal(params["quoteQuantity"]) / market_price
+        except (KeyError, InvalidOperation):
+            return _error(400, "INVALID_ORDER", "Invalid price or quantity")
+        if order_type == "Limit" and price is None:
+            return _error(400, "INVALID_ORDER", "Limit orders need a price")
+        crosses = (
+            order_type == "Market"
+            or (side == "Bid" and price >= market_price)
+            or (side == "Ask" and price <= market_price)
+        )
+        if crosses and params.get("postOnly"):
+            return _error(400, "INVALID_ORDER", "Order would immediately match")
+        now = self.now()
+        order = {
+            "id": str(next(self._order_ids)),
+            "clientId": params.get("clientId"),
+            "symbol": symbol,
+            "side": side,
+            "orderType": order_type,
+            "quantity": str(quantity),
+            "price": None if price is None else str(price),
+            "triggerPrice": params.get("triggerPrice"),
+            "timeInForce": params.get("timeInForce", "GTC"),
+            "selfTradePrevention": params.get("selfTradePrevention", "RejectTaker"),
+            "postOnly": bool(params.get("postOnly")),
+            "reduceOnly": params.get("reduceOnly"),
+            "status": "New",
+            "executedQuantity": "0",
+            "executedQuoteQuantity": "0",
+            "createdAt": now,
+        }
+        if crosses:
+            order["status"] = "Filled"
+            order["executedQuantity"] = str(quantity)
+            order["executedQuoteQuantity"] = str(quantity * market_price)
+            self.fills.append(
+                {
+                    "tradeId": next(self._trade_ids),
+                    "orderId": order["id"],
+                    "clientId": order["clientId"],
+                    "symbol": symbol,
+                    "side": side,
+                    "price": str(market_price),
+                    "quantity": str(quantity),
+                    "fee": "0",
+                    "feeSymbol": symbol.split("_")[1],
+                    "isMaker": False,
+                    "timestamp": _iso(now),
+                    "ms": now,
+                }
+            )
+        elif order["timeInForce"] in ("IOC", "FOK"):
+            order["status"] = "Expired"
+        self.orders[order["id"]] = order
+        return 200, dict(order)
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from bpx.async_.public import Public
+from bpx.exceptions import UnexpectedResponseError
+from bpx.http_client.async_http_client import AsyncHttpClient
+
+
+class FakeHttpClient(AsyncHttpClient):
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sessions_opened = 0
+
+    async def open(self):
+        self.sessions_opened += 1
+        return await super().open()
+
+    async def get(self, url, headers=None, params=None):
+        assert self.session is not None
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if "BAD" in url:
+            raise ValueError(url)
+        if "ERR" in url:
+            return {"code": "INVALID_MARKET", "message": "Market not found"}
+        return {"url": url}
+
+
+@pytest.mark.asyncio
+async def test_get_ticker_many():
+    http_client = FakeHttpClient()
+    public = Public(http_client=http_client)
+    symbols = [f"S{i}_USDC" for i in range(10)] + ["BAD_USDC", "S0_USDC"]
+    response = await public.get_ticker_many(symbols, max_concurrency=3)
+    assert list(response.results) == [f"S{i}_USDC" for i in range(10)]
+    assert response.results["S1_USDC"]["url"].endswith("ticker?symbol=S1_USDC")
+    assert isinstance(response.errors["BAD_USDC"], ValueError)
+    assert http_client.max_in_flight == 3
+    assert http_client.sessions_opened == 1
+    assert http_client.session is None
+
+
+@pytest.mark.asyncio
+async def test_get_klines_many_keeps_open_session():
+    http_client = FakeHttpClient()
+    async with Public(http_client=http_client) as public:
+        response = await public.get_klines_many(["SOL_USDC", "BTC_USDC"], "1h", 10)
+        assert http_client.session is not None
+    assert "interval=1h&startTime=10" in response.results["BTC_USDC"]["url"]
+    assert response.errors == {}
+
+
+@pytest.mark.asyncio
+async def test_error_bodies_go_to_errors():
+    public = Public(http_client=FakeHttpClient())
+    response = await public.get_depth_many(["SOL_USDC", "ERR_USDC"])
+    assert list(response.results) == ["SOL_USDC"]
+    error = response.errors["ERR_USDC"]
+    assert isinstance(error, UnexpectedResponseError)
+    assert error.response["code"] == "INVALID_MARKET"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fan_outs_share_the_session():
+    http_client = FakeHttpClient()
+    public = Public(http_client=http_client)
+    short, long = await asyncio.gather(
+        public.get_ticker_many(["SOL_USDC"]),
+        public.get_depth_many([f"S{i}_USDC" for i in range(5)], max_concurrency=1),
+    )
+    assert short.errors == {} and long.errors == {}
+    assert len(long.results) == 5
+    assert http_client.session is None
+
+
+@pytest.mark.asyncio
+async def test_closing_one_user_keeps_the_session():
+    http_client = FakeHttpClient()
+    async with Public(http_client=http_client):
+        public = Public(http_client=http_client)
+        await public.close()
+        async with public:
+            pass
+        assert http_client.session is not None
+    assert http_client.session is None
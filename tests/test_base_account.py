@@ -6,6 +6,7 @@ from bpx.exceptions import (
     LimitValueError,
 )
 import os
+import base64
 
 public_key = os.getenv("PUBLIC_KEY")
 secret_key = os.getenv("SECRET_KEY")
@@ -75,3 +76,47 @@ def test_withdrawal(account):
     )
     assert request_config.data["address"] == "1BitcoinAddress"
     assert request_config.data["blockchain"] == "Bitcoin"
+
+
+def test_signing_payload():
+    payload = BaseAccount._signing_payload(
+        {"symbol": "SOL_USDC", "postOnly": True, "quantity": "1", "reduceOnly": False},
+        "orderExecute",
+        1700000000000,
+        5000,
+    )
+    assert payload == (
+        "instruction=orderExecute&postOnly=true&quantity=1&reduceOnly=false"
+        "&symbol=SOL_USDC&timestamp=1700000000000&window=5000"
+    )
+    assert (
+        BaseAccount._signing_payload({}, "balanceQuery", 1, 5000)
+        == "instruction=balanceQuery&timestamp=1&window=5000"
+    )
+
+
+def test_signature_verifies(account):
+    headers = account._headers({"symbol": "SOL_USDC"}, "orderQuery", window=None)
+    payload = BaseAccount._signing_payload(
+        {"symbol": "SOL_USDC"}, "orderQuery", headers["X-Timestamp"], 10000
+    )
+    account.private_key.public_key().verify(
+        base64.b64decode(headers["X-Signature"]), payload.encode()
+    )
+    assert headers["X-API-Key"] == public_key
+    assert headers["X-Window"] == "10000"
+
+
+def test_sign_many(account):
+    signed = account.sign_many(
+        [({"symbol": "SOL_USDC"}, "orderCancel"), ({}, "balanceQuery")], window=3000
+    )
+    assert len(signed) == 2
+    assert signed[0]["X-Timestamp"] == signed[1]["X-Timestamp"]
+    assert all(headers["X-Window"] == "3000" for headers in signed)
+    payload = BaseAccount._signing_payload(
+        {}, "balanceQuery", signed[1]["X-Timestamp"], 3000
+    )
+    account.private_key.public_key().verify(
+        base64.b64decode(signed[1]["X-Signature"]), payload.encode()
+    )
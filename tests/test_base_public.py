@@ -73,3 +73,16 @@ def test_get_ping_url(base_public):
 
 def test_get_time_url(base_public):
     assert base_public.get_time_url() == "https://api.backpack.exchange/api/v1/time"
+
+
+def test_get_klines_backfill_urls(base_public):
+    urls = base_public.get_klines_backfill_urls("SOL_USDC", "1h", 0, 7_200_000 + 3600)
+    assert urls == [
+        "https://api.backpack.exchange/api/v1/klines?symbol=SOL_USDC&interval=1h&startTime=0&endTime=3600000",
+        "https://api.backpack.exchange/api/v1/klines?symbol=SOL_USDC&interval=1h&startTime=3600000&endTime=7200000",
+        "https://api.backpack.exchange/api/v1/klines?symbol=SOL_USDC&interval=1h&startTime=7200000&endTime=7203600",
+    ]
+    assert base_public.get_klines_backfill_urls("SOL_USDC", "1m", 60, 60) == []
+
+    with pytest.raises(InvalidTimeIntervalError):
+        base_public.get_klines_backfill_urls("SOL_USDC", "7m", 0, 60)
@@ -0,0 +1,164 @@
+import base64
+import os
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from bpx.account import Account
+from bpx.async_.account import Account as AsyncAccount
+from bpx.base.base_account import BaseAccount
+from bpx.exceptions import UnexpectedResponseError
+
+secret_key = base64.b64encode(os.urandom(32)).decode()
+
+ORDERS = [
+    {
+        "symbol": "SOL_USDC",
+        "side": "Bid",
+        "order_type": "Limit",
+        "quantity": "1",
+        "price": "100",
+        "client_id": 11,
+        "post_only": True,
+    },
+    {
+        "symbol": "SOL_USDC",
+        "side": "Ask",
+        "order_type": "Limit",
+        "quantity": "1",
+        "price": "101",
+        "client_id": 12,
+    },
+]
+
+
+def verify(headers, payload):
+    private_key = ed25519.Ed25519PrivateKey.from_private_bytes(
+        base64.b64decode(secret_key)
+    )
+    private_key.public_key().verify(
+        base64.b64decode(headers["X-Signature"]), payload.encode()
+    )
+
+
+def test_execute_orders_signs_every_item():
+    account = BaseAccount("pk", secret_key, window=5000, debug=False)
+    request_config = account.execute_orders(ORDERS)
+    assert request_config.url.endswith("api/v1/orders")
+    assert [order["clientId"] for order in request_config.data] == [11, 12]
+    headers = request_config.headers
+    verify(
+        headers,
+        "instruction=orderExecute&clientId=11&orderType=Limit&postOnly=true"
+        "&price=100&quantity=1&side=Bid&symbol=SOL_USDC"
+        "&instruction=orderExecute&clientId=12&orderType=Limit"
+        "&price=101&quantity=1&side=Ask&symbol=SOL_USDC"
+        f"&timestamp={headers['X-Timestamp']}&window=5000",
+    )
+
+
+def test_cancel_orders_share_one_timestamp():
+    account = BaseAccount("pk", secret_key, window=5000, debug=False)
+    request_configs = account.cancel_orders(
+        [
+            {"symbol": "SOL_USDC", "client_id": 11},
+            {"symbol": "SOL_USDC", "order_id": "abc"},
+        ]
+    )
+    timestamps = {
+        request_config.headers["X-Timestamp"] for request_config in request_configs
+    }
+    assert len(timestamps) == 1
+    verify(
+        request_configs[1].headers,
+        "instruction=orderCancel&orderId=abc&symbol=SOL_USDC"
+        f"&timestamp={timestamps.pop()}&window=5000",
+    )
+
+
+def test_sync_batch_results_map_to_client_ids():
+    http_client = Mock()
+    http_client.post.return_value = [
+        {"id": "1", "clientId": 11},
+        {"code": "INVALID_ORDER", "message": "Price out of bounds"},
+    ]
+    account = Account("pk", secret_key, default_http_client=http_client)
+
+    response = account.execute_orders(ORDERS)
+    assert response.results == {0: {"id": "1", "clientId": 11}}
+    assert isinstance(response.errors[1], UnexpectedResponseError)
+    assert response.ids == {0: 11, 1: 12}
+    assert http_client.post.call_args.kwargs["data"][1]["price"] == "101"
+
+    http_client.delete.side_effect = [{"id": "1"}, ConnectionError()]
+    response = account.cancel_orders(
+        [
+            {"symbol": "SOL_USDC", "client_id": 11},
+            {"symbol": "SOL_USDC", "order_id": "abc"},
+        ],
+        max_workers=1,
+    )
+    assert response.results == {0: {"id": "1"}}
+    assert isinstance(response.errors[1], ConnectionError)
+    assert response.ids == {0: 11, 1: "abc"}
+
+
+def test_sync_batch_request_error_fails_every_order():
+    http_client = Mock()
+    http_client.post.return_value = {"code": "UNAUTHORIZED", "message": "nope"}
+    account = Account("pk", secret_key, default_http_client=http_client)
+    response = account.execute_orders(ORDERS)
+    assert response.results == {}
+    assert set(response.errors) == {0, 1}
+
+
+def test_batch_results_do_not_collide():
+    http_client = Mock()
+    http_client.post.return_value = [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+    account = Account("pk", secret_key, default_http_client=http_client)
+    orders = [
+        dict(ORDERS[0], client_id=1),
+        dict(ORDERS[1], client_id=None),
+        dict(ORDERS[1], client_id=0),
+    ]
+    response = account.execute_orders(orders)
+    assert response.results == {0: {"id": "1"}, 1: {"id": "2"}, 2: {"id": "3"}}
+    assert response.ids == {0: 1, 1: None, 2: 0}
+    assert http_client.post.call_args.kwargs["data"][2]["clientId"] == 0
+
+
+def test_empty_batch_makes_no_request():
+    http_client = Mock()
+    account = Account("pk", secret_key, default_http_client=http_client)
+    assert account.execute_orders([]).results == {}
+    assert account.cancel_orders(iter([])).results == {}
+    http_client.post.assert_not_called()
+    http_client.delete.assert_not_called()
+    with pytest.raises(ValueError):
+        BaseAccount("pk", secret_key, window=5000, debug=False).execute_orders([])
+
+
+@pytest.mark.asyncio
+async def test_async_batch():
+    http_client = MagicMock()
+    http_client.post = AsyncMock(return_value=[{"id": "1"}, {"id": "2"}])
+    http_client.delete = AsyncMock(side_effect=[{"id": "1"}, {"id": "2"}])
+    account = AsyncAccount("pk", secret_key, http_client=http_client)
+
+    response = await account.execute_orders(ORDERS)
+    assert set(response.results) == {0, 1}
+    assert response.ids == {0: 11, 1: 12}
+
+    response = await account.cancel_orders(
+        [
+            {"symbol": "SOL_USDC", "client_id": 11},
+            {"symbol": "SOL_USDC", "client_id": 12},
+        ]
+    )
+    assert set(response.results) == {0, 1}
+    assert http_client.delete.await_count == 2
+
+    assert (await account.execute_orders(iter([]))).results == {}
+    assert (await account.cancel_orders([])).results == {}
+    assert http_client.post.await_count == 1
@@ -0,0 +1,36 @@
+import inspect
+
+from benchmarks.harness import Result, regressions
+from benchmarks.suites import ACCOUNT_CALLS, PUBLIC_CALLS, run
+from bpx.base.base_account import BaseAccount
+from bpx.base.base_public import BasePublic
+
+
+def test_every_request_builder_is_benchmarked():
+    builders = {
+        name
+        for name, method in inspect.getmembers(BaseAccount, inspect.isfunction)
+        if not name.startswith("_")
+        and "RequestConfiguration" in str(inspect.signature(method).return_annotation)
+    }
+    assert builders == set(ACCOUNT_CALLS)
+    urls = {
+        name
+        for name, _ in inspect.getmembers(BasePublic, inspect.isfunction)
+        if name.startswith("get_") and "_url" in name
+    }
+    assert urls == set(PUBLIC_CALLS)
+
+
+def test_suites_run():
+    results = run(min_time=0.01)
+    names = {result.name for result in results}
+    assert {"sign.order", "decode.fills", "sync.get_depth", "async.get_depth"} <= names
+    assert all(result.ops_per_sec > 0 for result in results)
+
+
+def test_regressions():
+    result = Result("sign.order", [100_000] * 10, 1_000_000)
+    assert result.percentile(50) == 100.0
+    assert regressions([result], {"sign.order": {"p50_us": 90.0}}, 0.25) == []
+    assert regressions([result], {"sign.order": {"p50_us": 50.0}}, 0.25)
@@ -0,0 +1,136 @@
+import asyncio
+import base64
+import os
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from bpx.account import Account
+from bpx.async_.account import Account as AsyncAccount
+from bpx.exceptions import InvalidTimeInForceValue
+from bpx.models.order_tracker import OrderTracker
+
+secret_key = base64.b64encode(os.urandom(32)).decode()
+
+REPLACEMENT = {
+    "side": "Bid",
+    "order_type": "Limit",
+    "quantity": "1",
+    "price": "101",
+    "client_id": 2,
+}
+
+
+def test_cancel_replace():
+    http_client = Mock()
+    http_client.delete.return_value = {"id": "1", "clientId": 1, "status": "Cancelled"}
+    http_client.post.return_value = {"id": "2", "clientId": 2, "status": "New"}
+    tracker = OrderTracker()
+    account = Account(
+        "pk", secret_key, default_http_client=http_client, order_tracker=tracker
+    )
+
+    result = account.cancel_replace("SOL_USDC", REPLACEMENT, client_id=1)
+    assert result.cancel["status"] == "Cancelled"
+    assert result.order["id"] == "2"
+    assert http_client.post.call_args.kwargs["data"]["symbol"] == "SOL_USDC"
+    assert set(result.timings) == {
+        "cancel_sign",
+        "cancel",
+        "replace_sign",
+        "replace",
+        "total",
+    }
+    assert tracker.get(client_id=2)["status"] == "New"
+    assert tracker.get(client_id=1)["status"] == "Cancelled"
+
+
+def test_failed_cancel_skips_replacement():
+    http_client = Mock()
+    http_client.delete.return_value = {"code": "RESOURCE_NOT_FOUND"}
+    account = Account("pk", secret_key, default_http_client=http_client)
+
+    result = account.cancel_replace("SOL_USDC", REPLACEMENT, order_id="1")
+    assert result.order is None
+    assert "replace" not in result.timings
+    http_client.post.assert_not_called()
+
+    result = account.cancel_replace(
+        "SOL_USDC", REPLACEMENT, order_id="1", wait_for_cancel=False
+    )
+    http_client.post.assert_called_once()
+
+
+def test_worker_threads_are_reused_until_close():
+    http_client = Mock()
+    http_client.delete.return_value = {"id": "1", "status": "Cancelled"}
+    http_client.post.return_value = {"id": "2", "status": "New"}
+    account = Account("pk", secret_key, default_http_client=http_client)
+
+    account.cancel_replace("SOL_USDC", REPLACEMENT, order_id="1")
+    executor = account._executor
+    account.cancel_replace("SOL_USDC", REPLACEMENT, order_id="1")
+    account.cancel_orders([{"symbol": "SOL_USDC", "order_id": "1"}] * 3)
+    assert account._executor is executor
+
+    account.close()
+    assert account._executor is None
+    assert executor._shutdown
+
+
+def test_invalid_replacement_keeps_cancel_response():
+    http_client = Mock()
+    http_client.delete.return_value = {"id": "1", "status": "Cancelled"}
+    tracker = OrderTracker()
+    tracker.on_order({"id": "1", "symbol": "SOL_USDC", "status": "New"})
+    account = Account(
+        "pk", secret_key, default_http_client=http_client, order_tracker=tracker
+    )
+
+    replacement = dict(REPLACEMENT, time_in_force="Forever")
+    result = account.cancel_replace("SOL_USDC", replacement, order_id="1")
+    assert isinstance(result.error, InvalidTimeInForceValue)
+    assert result.cancel["status"] == "Cancelled"
+    assert result.order is None
+    http_client.post.assert_not_called()
+    assert tracker.get("1")["status"] == "Cancelled"
+
+
+@pytest.mark.asyncio
+async def test_async_invalid_replacement_keeps_cancel_response():
+    http_client = Mock()
+    http_client.delete = AsyncMock(return_value={"id": "1", "status": "Cancelled"})
+    http_client.post = AsyncMock()
+    account = AsyncAccount("pk", secret_key, http_client=http_client)
+
+    replacement = dict(REPLACEMENT, time_in_force="Forever")
+    result = await account.cancel_replace("SOL_USDC", replacement, order_id="1")
+    assert isinstance(result.error, InvalidTimeInForceValue)
+    assert result.cancel["status"] == "Cancelled"
+    http_client.post.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_async_cancel_replace_signs_while_cancel_is_in_flight():
+    events = []
+
+    async def delete(**kwargs):
+        events.append("cancel sent")
+        await asyncio.sleep(0.01)
+        events.append("cancel done")
+        return {"id": "1"}
+
+    async def post(**kwargs):
+        events.append("replace sent")
+        return {"id": "2"}
+
+    http_client = Mock()
+    http_client.delete = AsyncMock(side_effect=delete)
+    http_client.post = AsyncMock(side_effect=post)
+    account = AsyncAccount("pk", secret_key, http_client=http_client)
+
+    result = await account.cancel_replace("SOL_USDC", REPLACEMENT, order_id="1")
+    assert result.order == {"id": "2"}
+    assert events == ["cancel sent", "cancel done", "replace sent"]
+    assert result.timings["cancel"] >= 0.01
+    assert result.timings["total"] >= result.timings["cancel"]
@@ -0,0 +1,86 @@
+import base64
+import os
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from bpx.account import Account
+from bpx.async_.account import Account as AsyncAccount
+from bpx.async_.websocket import AccountWebSocket
+from bpx.async_.clock_sync import ClockSync as AsyncClockSync
+from bpx.base.base_clock_sync import BaseClockSync
+from bpx.clock_sync import ClockSync
+from bpx.exceptions import UnexpectedResponseError
+
+
+def test_estimate_prefers_fast_round_trips():
+    clock = BaseClockSync()
+    sent_at = 1000.0
+    # 2s ahead with a 10ms round trip, the slow samples are skewed by queueing
+    clock.add_sample(sent_at, 0.010, 1000.005 * 1e3 + 2000)
+    clock.add_sample(sent_at, 0.012, 1000.006 * 1e3 + 2001)
+    clock.add_sample(sent_at, 0.400, 1000.390 * 1e3 + 2000)
+    clock.add_sample(sent_at, 0.500, "1000010")
+    assert clock.offset == pytest.approx(2000.5)
+    assert clock.rtt == pytest.approx(206)
+    assert clock.uncertainty == pytest.approx(5)
+
+    with pytest.raises(UnexpectedResponseError):
+        clock.add_sample(sent_at, 0.01, {"code": "ERROR"})
+
+
+def test_signed_timestamps_follow_server_clock():
+    public = Mock()
+    public.get_time.side_effect = lambda: int(time.time() * 1e3) + 60_000
+    clock = ClockSync(public)
+    assert clock.sync() == pytest.approx(60_000, abs=100)
+
+    http_client = Mock()
+    account = Account(
+        "pk",
+        base64.b64encode(os.urandom(32)).decode(),
+        default_http_client=http_client,
+        clock=clock,
+    )
+    account.get_balances()
+    stamped = int(http_client.get.call_args.kwargs["headers"]["X-Timestamp"])
+    assert stamped - time.time() * 1e3 == pytest.approx(60_000, abs=1000)
+
+
+def test_stream_subscription_follows_server_clock():
+    clock = BaseClockSync()
+    sent_at = time.time()
+    clock.add_sample(sent_at, 0.01, (sent_at + 0.005) * 1e3 + 60_000)
+    account = AsyncAccount(
+        "pk",
+        base64.b64encode(os.urandom(32)).decode(),
+        http_client=Mock(),
+        clock=clock,
+    )
+    message = AccountWebSocket(account).subscribe_message(["account.orderUpdate"])
+    stamped = int(message["signature"][2])
+    assert stamped - time.time() * 1e3 == pytest.approx(60_000, abs=1000)
+
+
+def test_background_sync():
+    public = Mock()
+    public.get_time.return_value = int(time.time() * 1e3) - 5_000
+    clock = ClockSync(public)
+    stop = clock.start(interval=0.01)
+    try:
+        deadline = time.monotonic() + 2
+        while clock.rtt is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop.set()
+    assert clock.offset == pytest.approx(-5_000, abs=2_000)
+
+
+@pytest.mark.asyncio
+async def test_async_sync():
+    public = Mock()
+    public.get_time = AsyncMock(return_value=str(int(time.time() * 1e3) - 1_000))
+    clock = AsyncClockSync(public)
+    assert await clock.sync(samples=2) == pytest.approx(-1_000, abs=100)
+    assert public.get_time.await_count == 2
@@ -0,0 +1,146 @@
+import asyncio
+import base64
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bpx.account import Account
+from bpx.public import Public
+from bpx.exceptions import DeadlineExceededError
+from bpx.http_client.async_http_client import AsyncHttpClient
+from bpx.http_client.deadline import current_deadline, deadline
+from bpx.http_client.retry import RetryPolicy
+from bpx.http_client.sync_http_client import SyncHttpClient
+
+secret_key = base64.b64encode(os.urandom(32)).decode()
+
+
+def test_nested_deadlines_only_shorten():
+    assert current_deadline() is None
+    with deadline(10):
+        outer = current_deadline()
+        with deadline(60):
+            assert current_deadline() == outer
+        with deadline(1):
+            assert current_deadline() < outer
+        assert current_deadline() == outer
+    assert current_deadline() is None
+
+
+def test_signature_window_is_cut_to_deadline():
+    http_client = Mock()
+    account = Account("pk", secret_key, default_http_client=http_client)
+    account.get_balances()
+    assert http_client.get.call_args.kwargs["headers"]["X-Window"] == "5000"
+
+    with deadline(0.5):
+        account.get_balances()
+        account.cancel_orders([{"symbol": "SOL_USDC", "order_id": "1"}])
+    assert int(http_client.get.call_args.kwargs["headers"]["X-Window"]) <= 500
+    assert int(http_client.delete.call_args.kwargs["headers"]["X-Window"]) <= 500
+
+
+def test_expired_deadline_is_not_sent():
+    http_client = Mock()
+    account = Account("pk", secret_key, default_http_client=http_client)
+    with deadline(0):
+        with pytest.raises(DeadlineExceededError):
+            account.get_balances()
+    http_client.get.assert_not_called()
+
+
+def test_worker_threads_keep_the_deadline():
+    seen = []
+
+    def request(*args, **kwargs):
+        seen.append(current_deadline())
+        return []
+
+    http_client = Mock()
+    http_client.get.side_effect = request
+    http_client.delete.side_effect = request
+    account = Account("pk", secret_key, default_http_client=http_client)
+    public = Public(http_client=http_client)
+    with deadline(5):
+        expires = current_deadline()
+        account.cancel_orders([{"symbol": "SOL_USDC", "order_id": "1"}] * 2)
+        account.cancel_replace(
+            "SOL_USDC",
+            {"side": "Bid", "order_type": "Market", "quantity": "1"},
+            order_id="1",
+        )
+        list(account.iter_fill_history(page_size=10, concurrency=2))
+    with deadline(5):
+        public.get_klines_backfill("SOL_USDC", "1m", 0, 1000 * 60 * 2)
+    # the second prefetched page may be cancelled before it is requested
+    assert seen[:4] == [expires] * 4
+    assert len(seen) >= 6
+    assert None not in seen
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(0.3)
+        payload = b"{}"
+        self.send_response(503)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sync_client_timeout(slow_server):
+    with SyncHttpClient(retry_policy=RetryPolicy(backoff=0.01)) as client:
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            client.get(slow_server, timeout=0.1)
+        with pytest.raises(DeadlineExceededError):
+            with deadline(0.1):
+                client.get(slow_server)
+        assert time.monotonic() - started < 0.5
+        assert client.get(slow_server, timeout=1) == {}
+
+
+@pytest_asyncio.fixture
+async def slow_async_server():
+    async def slow(request: web.Request):
+        await asyncio.sleep(0.3)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/", slow)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/"))
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_timeout(slow_async_server):
+    async with AsyncHttpClient() as client:
+        with pytest.raises(DeadlineExceededError):
+            await client.get(slow_async_server, timeout=0.1)
+        with pytest.raises(DeadlineExceededError):
+            with deadline(0.1):
+                await client.get(slow_async_server)
+        assert await client.get(slow_async_server, timeout=1) == {}
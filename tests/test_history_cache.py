@@ -0,0 +1,184 @@
+from datetime import datetime, timezone
+import os
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bpx.async_.history_cache import HistoryCache as AsyncHistoryCache
+from bpx.history_cache import HistoryCache
+
+
+def kline(minute):
+    start = datetime.fromtimestamp(minute * 60, tz=timezone.utc)
+    return {
+        "start": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "open": "1",
+        "high": "2",
+        "low": "0.5",
+        "close": str(minute),
+        "volume": "10",
+        "quoteVolume": "15",
+        "trades": "3",
+    }
+
+
+def get_klines(symbol, interval, start_time, end_time):
+    return [kline(minute) for minute in range(start_time // 60, end_time // 60 + 1)]
+
+
+def trade(trade_id):
+    return {
+        "id": trade_id,
+        "price": "1.5",
+        "quantity": "2",
+        "quoteQuantity": "3",
+        "timestamp": trade_id * 3_600_000,
+        "isBuyerMaker": trade_id % 2 == 0,
+    }
+
+
+def history_trades(newest):
+    def get_history_trades(symbol, limit=100, offset=0):
+        top = newest - offset
+        return [trade(trade_id) for trade_id in range(top, max(top - limit, 0), -1)]
+
+    return get_history_trades
+
+
+def test_get_klines_fetches_missing_buckets_once(tmp_path):
+    public = Mock()
+    public.get_klines.side_effect = get_klines
+    cache = HistoryCache(public, str(tmp_path))
+    cache.KLINES_PER_BUCKET = 10
+
+    klines = cache.get_klines("SOL_USDC", "1m", 5 * 60, 25 * 60)
+    assert klines.open_time.tolist() == [minute * 60 for minute in range(5, 25)]
+    assert klines.close.tolist() == [float(minute) for minute in range(5, 25)]
+    assert public.get_klines.call_count == 3
+
+    again = cache.get_klines("SOL_USDC", "1m", 0, 20 * 60)
+    assert again.open_time.tolist() == [minute * 60 for minute in range(20)]
+    assert public.get_klines.call_count == 3
+
+
+def test_get_klines_single_bucket_is_memory_mapped(tmp_path):
+    public = Mock()
+    public.get_klines.side_effect = get_klines
+    cache = HistoryCache(public, str(tmp_path))
+    cache.KLINES_PER_BUCKET = 10
+    cache.get_klines("SOL_USDC", "1m", 0, 10 * 60)
+
+    klines = cache.get_klines("SOL_USDC", "1m", 2 * 60, 8 * 60)
+    assert klines.open_time.tolist() == [minute * 60 for minute in range(2, 8)]
+    assert isinstance(klines.close.base, np.memmap)
+
+
+def test_open_bucket_is_not_stored(tmp_path):
+    public = Mock()
+    public.get_klines.side_effect = get_klines
+    cache = HistoryCache(public, str(tmp_path))
+    now = int(datetime.now(tz=timezone.utc).timestamp())
+
+    cache.get_klines("SOL_USDC", "1m", now - 120, now)
+    cache.get_klines("SOL_USDC", "1m", now - 120, now)
+    assert public.get_klines.call_count == 2
+
+
+def test_refresh_trades_is_incremental(tmp_path):
+    public = Mock()
+    public.get_history_trades.side_effect = history_trades(50)
+    cache = HistoryCache(public, str(tmp_path))
+
+    assert cache.refresh_trades("SOL_USDC", since=0, page_size=20) == 50
+    assert public.get_history_trades.call_count == 3
+
+    public.get_history_trades.reset_mock()
+    public.get_history_trades.side_effect = history_trades(65)
+    assert cache.refresh_trades("SOL_USDC", page_size=10) == 15
+    assert public.get_history_trades.call_count == 2
+
+    trades = cache.get_trades("SOL_USDC", 0, 100 * 3_600_000)
+    assert trades["id"].tolist() == list(range(1, 66))
+    assert trades["is_buyer_maker"].tolist() == [i % 2 == 0 for i in range(1, 66)]
+    window = cache.get_trades("SOL_USDC", 24 * 3_600_000, 26 * 3_600_000)
+    assert window["id"].tolist() == [24, 25]
+
+
+def test_refresh_trades_without_cache_fetches_newest_page(tmp_path):
+    public = Mock()
+    public.get_history_trades.side_effect = history_trades(50)
+    cache = HistoryCache(public, str(tmp_path))
+
+    assert cache.refresh_trades("SOL_USDC", page_size=20) == 20
+    assert public.get_history_trades.call_count == 1
+
+
+def test_cut_short_refresh_leaves_no_gap(tmp_path):
+    public = Mock()
+    public.get_history_trades.side_effect = history_trades(50)
+    cache = HistoryCache(public, str(tmp_path))
+    cache.refresh_trades("SOL_USDC", since=0, page_size=20)
+
+    public.get_history_trades.side_effect = history_trades(100)
+    assert cache.refresh_trades("SOL_USDC", page_size=10, max_pages=2) == 0
+    assert cache.newest_trade_id("SOL_USDC") == 50
+
+    calls = iter([history_trades(100), ConnectionError("reset")])
+
+    def failing(symbol, limit=100, offset=0):
+        outcome = next(calls)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome(symbol, limit, offset)
+
+    public.get_history_trades.side_effect = failing
+    with pytest.raises(ConnectionError):
+        cache.refresh_trades("SOL_USDC", page_size=10)
+    assert cache.newest_trade_id("SOL_USDC") == 50
+
+    public.get_history_trades.side_effect = history_trades(100)
+    assert cache.refresh_trades("SOL_USDC", page_size=10) == 50
+    assert cache.get_trades("SOL_USDC", 0)["id"].tolist() == list(range(1, 101))
+
+
+def test_refresh_trades_backfills_older_than_cache(tmp_path):
+    public = Mock()
+    public.get_history_trades.side_effect = history_trades(50)
+    cache = HistoryCache(public, str(tmp_path))
+    assert cache.refresh_trades("SOL_USDC", page_size=20) == 20
+
+    public.get_history_trades.reset_mock()
+    public.get_history_trades.side_effect = history_trades(55)
+    assert cache.refresh_trades("SOL_USDC", since=10 * 3_600_000, page_size=20) == 35
+    ids = cache.get_trades("SOL_USDC", 0)["id"].tolist()
+    assert ids[0] <= 10 and ids[-1] == 55
+    assert ids == list(range(ids[0], 56))
+    offsets = [
+        call.kwargs["offset"] for call in public.get_history_trades.call_args_list
+    ]
+    assert offsets == [0, 24, 44]
+
+
+def test_directory_is_expanded():
+    assert HistoryCache(Mock(), "~/bpx-cache").directory == os.path.expanduser(
+        "~/bpx-cache"
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_history_cache(tmp_path):
+    public = MagicMock()
+    public.get_klines = AsyncMock(side_effect=get_klines)
+    public.get_history_trades = AsyncMock(side_effect=history_trades(30))
+    cache = AsyncHistoryCache(public, str(tmp_path))
+    cache.KLINES_PER_BUCKET = 10
+
+    klines = await cache.get_klines("SOL_USDC", "1m", 0, 20 * 60)
+    assert klines.open_time.tolist() == [minute * 60 for minute in range(20)]
+    await cache.get_klines("SOL_USDC", "1m", 0, 20 * 60)
+    assert public.get_klines.await_count == 2
+
+    assert await cache.refresh_trades("SOL_USDC", since=0, page_size=20) == 30
+    assert cache.get_trades("SOL_USDC", 0)["id"].tolist() == list(range(1, 31))
@@ -0,0 +1,133 @@
+import gc
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bpx.http_client.async_http_client import AsyncHttpClient
+from bpx.http_client.json_codec import JsonCodec
+from bpx.http_client.sync_http_client import SyncHttpClient
+from bpx.public import Public
+
+
+@pytest_asyncio.fixture
+async def server():
+    async def echo(request: web.Request):
+        body = await request.text()
+        return web.json_response(
+            {
+                "method": request.method,
+                "query": dict(request.query),
+                "body": body,
+                "peer": request.transport.get_extra_info("peername")[1],
+            }
+        )
+
+    async def plain(request: web.Request):
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_route("*", "/echo", echo)
+    app.router.add_get("/plain", plain)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    yield test_server
+    await test_server.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_without_session(server):
+    client = AsyncHttpClient()
+    response = await client.get(str(server.make_url("/echo")), params={"a": "1"})
+    assert response["method"] == "GET"
+    assert response["query"] == {"a": "1"}
+    assert client.session is None
+
+
+@pytest.mark.asyncio
+async def test_async_client_session_reuses_connection(server):
+    async with AsyncHttpClient(limit=1, json_codec=JsonCodec()) as client:
+        first = await client.get(str(server.make_url("/echo")))
+        second = await client.post(str(server.make_url("/echo")), data={"x": 1})
+        assert first["peer"] == second["peer"]
+        assert second["body"] == '{"x": 1}'
+        assert await client.get(str(server.make_url("/plain"))) == "ok"
+    assert client.session is None
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode()
+        payload = json.dumps(
+            {"method": self.command, "body": body, "peer": self.client_address[1]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_DELETE = do_PATCH = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def sync_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/echo"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sync_client_keeps_connection_alive(sync_server):
+    with SyncHttpClient() as client:
+        first = client.get(sync_server)
+        second = client.patch(sync_server, data={"x": True})
+        assert first["peer"] == second["peer"]
+        assert second["method"] == "PATCH"
+        assert json.loads(second["body"]) == {"x": True}
+
+
+def test_sync_client_shared_across_threads(sync_server):
+    client = SyncHttpClient(pool_maxsize=4, pool_block=True)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(lambda _: client.get(sync_server), range(40)))
+    assert all(response["method"] == "GET" for response in responses)
+    assert len({response["peer"] for response in responses}) <= 4
+    client.close()
+
+
+def test_sync_client_drops_sessions_of_finished_threads(sync_server):
+    client = SyncHttpClient()
+    for _ in range(5):
+        thread = threading.Thread(target=client.get, args=(sync_server,))
+        thread.start()
+        thread.join()
+    gc.collect()
+    assert len(client._sessions) == 0
+    client.get(sync_server)
+    assert len(client._sessions) == 1
+    client.close()
+
+
+def test_close_leaves_shared_default_client_open():
+    public = Public()
+    session = Public().http_client.session
+    public.close()
+    assert public.http_client.session is session
+    own = SyncHttpClient()
+    own.session
+    Public(http_client=own).close()
+    assert len(own._sessions) == 0
@@ -0,0 +1,61 @@
+import base64
+import json
+import subprocess
+import sys
+
+import pytest
+
+SECRET_KEY = base64.b64encode(bytes(range(32))).decode()
+
+# dependencies that must wait until a client is built
+HEAVY = ("requests", "urllib3", "aiohttp", "cryptography", "orjson", "ujson")
+
+
+def imported_after(code: str):
+    script = (
+        "import sys\n"
+        "before = set(sys.modules)\n"
+        f"{code}\n"
+        "print(__import__('json').dumps(sorted(set(sys.modules) - before)))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return {name.split(".")[0] for name in json.loads(output)}
+
+
+@pytest.mark.parametrize(
+    "module", ["bpx.account", "bpx.public", "bpx.async_.account", "bpx.async_.public"]
+)
+def test_import_skips_http_stack(module):
+    assert imported_after(f"import {module}").isdisjoint(HEAVY)
+
+
+def test_sync_import_skips_asyncio():
+    imported = imported_after("import bpx.account, bpx.public, bpx.clock_sync")
+    assert imported.isdisjoint({"asyncio", "ssl", "statistics", "decimal"})
+
+
+def test_default_clients_load_on_first_use():
+    imported = imported_after(
+        f"from bpx.account import Account\nAccount('key', {SECRET_KEY!r})"
+    )
+    assert {"requests", "cryptography"} <= imported
+    assert "aiohttp" not in imported
+    imported = imported_after("from bpx.async_.public import Public\nPublic()")
+    assert "aiohttp" in imported
+    assert "requests" not in imported
+
+
+def test_default_clients_are_shared():
+    import bpx.account
+    import bpx.async_.public
+    from bpx.account import Account
+    from bpx.async_.public import Public
+
+    account = Account("key", SECRET_KEY)
+    assert account.http_client is bpx.account.http_client
+    assert Account("key", SECRET_KEY).http_client is account.http_client
+    assert Public().http_client is bpx.async_.public.default_http_client
+    with pytest.raises(AttributeError):
+        bpx.account.missing
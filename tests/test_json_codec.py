@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bpx.http_client.async_http_client import AsyncHttpClient
+from bpx.http_client.json_codec import (
+    CODECS,
+    JsonCodec,
+    default_codec,
+    get_codec,
+)
+from bpx.http_client.sync_http_client import SyncHttpClient
+from tests.test_http_client import sync_server  # noqa: F401
+
+
+def installed_codecs():
+    codecs = []
+    for codec in CODECS:
+        try:
+            codecs.append(codec())
+        except ImportError:
+            pass
+    return codecs
+
+
+def test_default_codec_is_the_fastest_installed():
+    assert type(default_codec()) is type(installed_codecs()[0])
+    assert type(get_codec("json")) is JsonCodec
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+@pytest.mark.parametrize("codec", installed_codecs(), ids=lambda codec: codec.name)
+def test_codecs_round_trip(codec):
+    payload = {"symbol": "SOL_USDC", "quantity": "1.5", "postOnly": True, "id": 7}
+    assert codec.loads(codec.dumps(payload)) == payload
+    assert codec.loads(codec.dumps(payload).encode()) == payload
+    with pytest.raises(codec.decode_error):
+        codec.loads("not json")
+
+
+@pytest.mark.parametrize("codec", installed_codecs(), ids=lambda codec: codec.name)
+def test_sync_client_codecs(sync_server, codec):  # noqa: F811
+    with SyncHttpClient(json_codec=codec) as client:
+        response = client.post(sync_server, data={"x": [1, "a"]})
+        assert json.loads(response["body"]) == {"x": [1, "a"]}
+        assert client.delete(sync_server)["body"] == ""
+
+
+def test_sync_stdlib_codec_keeps_requests_encoding(sync_server):  # noqa: F811
+    with SyncHttpClient(json_codec=JsonCodec()) as client:
+        assert client.post(sync_server, data={"x": 1})["body"] == '{"x": 1}'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", installed_codecs(), ids=lambda codec: codec.name)
+async def test_async_client_codecs(codec):
+    async def echo(request: web.Request):
+        return web.json_response({"body": await request.text()})
+
+    async def plain(request: web.Request):
+        return web.Response(text="1727000000000")
+
+    app = web.Application()
+    app.router.add_post("/echo", echo)
+    app.router.add_get("/time", plain)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with AsyncHttpClient(json_codec=codec) as client:
+            response = await client.post(str(server.make_url("/echo")), data={"x": 1})
+            assert json.loads(response["body"]) == {"x": 1}
+            assert await client.get(str(server.make_url("/time"))) == "1727000000000"
+    finally:
+        await server.close()
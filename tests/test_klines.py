@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bpx.models.klines import KlineArrays
+from bpx.public import Public
+
+
+def kline(minute, close="1.5"):
+    start = datetime.fromtimestamp(minute * 60, tz=timezone.utc)
+    return {
+        "start": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "open": "1",
+        "high": "2",
+        "low": "0.5",
+        "close": close,
+        "volume": "10",
+        "quoteVolume": "15",
+        "trades": "3",
+    }
+
+
+def test_from_klines_sorts_and_deduplicates():
+    klines = KlineArrays.from_klines(
+        [kline(2), kline(0), kline(1), kline(2, close="1.75")]
+    )
+    assert klines.open_time.tolist() == [0, 60, 120]
+    assert klines.close.tolist() == [1.5, 1.5, 1.75]
+    assert klines.trades.dtype == np.int64
+    assert klines.last_open_time == 120
+
+
+def test_append_overlap():
+    first = KlineArrays.from_klines([kline(0), kline(1, close="1.1")])
+    second = KlineArrays.from_klines([kline(1, close="1.2"), kline(2)])
+    merged = first.append(second)
+    assert merged.open_time.tolist() == [0, 60, 120]
+    assert merged.close.tolist() == [1.5, 1.2, 1.5]
+    assert len(KlineArrays.concatenate([])) == 0
+
+
+def test_get_klines_backfill():
+    http_client = Mock()
+
+    def get(url):
+        start = int(url.split("startTime=")[1].split("&")[0])
+        end = int(url.split("endTime=")[1])
+        return [kline(minute) for minute in range(start // 60, end // 60 + 1)]
+
+    http_client.get.side_effect = get
+    public = Public(http_client=http_client)
+    public.MAX_KLINES_PER_REQUEST = 10
+    klines = public.get_klines_backfill("SOL_USDC", "1m", 0, 25 * 60)
+    assert klines.open_time.tolist() == [minute * 60 for minute in range(26)]
+    assert http_client.get.call_count == 3
+
+    more = public.get_klines_backfill("SOL_USDC", "1m", 0, 30 * 60, klines=klines)
+    assert len(more) == 31
+    assert (
+        http_client.get.call_args_list[3]
+        .args[0]
+        .endswith("startTime=1500&endTime=1800")
+    )
@@ -0,0 +1,150 @@
+import base64
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bpx.account import Account
+from bpx.http_client.async_http_client import AsyncHttpClient
+from bpx.http_client.metrics import (
+    Instrumentation,
+    LatencyHistogram,
+    otlp_metrics,
+    prometheus_text,
+)
+from bpx.http_client.sync_http_client import SyncHttpClient
+
+
+def test_histogram_quantile():
+    histogram = LatencyHistogram((0.1, 0.2, 0.4))
+    assert histogram.quantile(0.5) is None
+    for seconds in (0.05, 0.15, 0.15, 0.3, 1.0):
+        histogram.observe(seconds)
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == pytest.approx(0.175)
+    assert histogram.quantile(1.0) == 0.4
+
+
+def test_exporters():
+    instrumentation = Instrumentation(buckets=(0.01, 0.1))
+    instrumentation.record(Instrumentation.SIGN, "orderExecute", 0.005)
+    instrumentation.record(Instrumentation.SIGN, "orderExecute", 0.05)
+
+    text = prometheus_text(instrumentation)
+    assert (
+        'bpx_phase_seconds_bucket{phase="sign",endpoint="orderExecute",le="0.1"} 2'
+        in text
+    )
+    assert 'bpx_phase_seconds_count{phase="sign",endpoint="orderExecute"} 2' in text
+
+    metric = otlp_metrics(instrumentation)["resourceMetrics"][0]["scopeMetrics"][0][
+        "metrics"
+    ][0]
+    point = metric["histogram"]["dataPoints"][0]
+    assert point["bucketCounts"] == ["1", "1", "0"]
+    assert point["explicitBounds"] == [0.01, 0.1]
+    assert point["count"] == "2"
+
+
+def test_failing_listener_is_skipped():
+    instrumentation = Instrumentation()
+    events = []
+    instrumentation.add_listener(Mock(side_effect=RuntimeError))
+    instrumentation.add_listener(lambda *event: events.append(event))
+    instrumentation.record(Instrumentation.SIGN, "orderExecute", 0.005)
+    assert events == [("sign", "orderExecute", 0.005)]
+
+
+def test_endpoint_labels_are_route_templates():
+    url = "https://api.backpack.exchange/api/v1/markets/SOL_USDC"
+    assert Instrumentation.endpoint(url) == "/api/v1/markets/{symbol}"
+    assert (
+        Instrumentation.endpoint("https://api.backpack.exchange/api/v1/depth?symbol=X")
+        == "/api/v1/depth"
+    )
+
+
+def test_account_signing_is_timed():
+    instrumentation = Instrumentation()
+    events = []
+    instrumentation.add_listener(lambda *event: events.append(event[:2]))
+    http_client = Mock()
+    http_client.instrumentation = instrumentation
+    account = Account(
+        "pk",
+        base64.b64encode(os.urandom(32)).decode(),
+        default_http_client=http_client,
+    )
+    account.get_balances()
+    assert events == [("sign", "balanceQuery"), ("headers", "balanceQuery")]
+    assert instrumentation.histogram("sign", "balanceQuery").count == 1
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        payload = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def json_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), JsonHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/api/v1/markets"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sync_client_phases(json_server):
+    instrumentation = Instrumentation()
+    with SyncHttpClient(instrumentation=instrumentation) as client:
+        assert client.get(json_server) == {"ok": True}
+    assert {phase for phase, _ in instrumentation.snapshot()} == {
+        "response",
+        "decode",
+        "request",
+    }
+    assert instrumentation.histogram("request", "/api/v1/markets").count == 1
+
+    instrumentation.add_listener(Mock(side_effect=RuntimeError))
+    with SyncHttpClient(instrumentation=instrumentation) as client:
+        assert client.get(json_server + "/SOL_USDC?limit=1") == {"ok": True}
+    assert instrumentation.histogram("request", "/api/v1/markets/{symbol}").count == 1
+
+
+@pytest_asyncio.fixture
+async def json_async_server():
+    async def markets(request: web.Request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/markets", markets)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/api/v1/markets"))
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_phases(json_async_server):
+    instrumentation = Instrumentation()
+    client = AsyncHttpClient(instrumentation=instrumentation)
+    assert await client.get(json_async_server) == {"ok": True}
+    snapshot = instrumentation.snapshot()
+    assert {"connect", "response", "decode", "request"} <= {p for p, _ in snapshot}
+    request = snapshot[("request", "/api/v1/markets")]
+    response = snapshot[("response", "/api/v1/markets")]
+    assert request.sum >= response.sum
@@ -0,0 +1,124 @@
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from bpx.models.order_book import OrderBook
+
+
+@pytest.fixture
+def snapshot():
+    return {
+        "bids": [["99.5", "2"], ["100", "1"], ["99", "5"]],
+        "asks": [["101", "1"], ["102", "3"], ["101.5", "2"]],
+        "lastUpdateId": "10",
+    }
+
+
+def delta(first, last, bids=(), asks=()):
+    return {"e": "depth", "U": first, "u": last, "b": list(bids), "a": list(asks)}
+
+
+def test_snapshot_queries(snapshot):
+    book = OrderBook("SOL_USDC", snapshot)
+    assert book.best_bid() == (100.0, 1.0)
+    assert book.best_ask() == (101.0, 1.0)
+    assert book.mid_price() == 100.5
+    assert book.spread() == 1.0
+    assert book.bids.levels(2) == [(100.0, 1.0), (99.5, 2.0)]
+    assert book.asks.levels() == [(101.0, 1.0), (101.5, 2.0), (102.0, 3.0)]
+    assert book.size_at("Ask", "101.5") == 2.0
+    assert book.size_at("Bid", "98") == 0
+    assert book.vwap("Bid", "2") == pytest.approx(101.25)
+    assert book.vwap("Ask", "3") == pytest.approx((100 + 99.5 * 2) / 3)
+    assert book.vwap("Bid", "100") is None
+
+
+def test_apply_deltas(snapshot):
+    book = OrderBook("SOL_USDC", snapshot)
+    assert book.apply_delta(delta(5, 10, bids=[["1", "1"]]))
+    assert book.bids.size_at(1.0) == 0
+    assert book.apply_delta(delta(11, 12, bids=[["100", "0"], ["100.5", "4"]]))
+    assert book.best_bid() == (100.5, 4.0)
+    assert book.apply_delta(delta(13, 13, asks=[["101", "0"]]))
+    assert book.best_ask() == (101.5, 2.0)
+    assert book.last_update_id == 13
+
+
+def test_gap_buffers_until_snapshot(snapshot):
+    book = OrderBook("SOL_USDC", snapshot)
+    assert not book.apply_delta(delta(12, 13, asks=[["100.8", "1"]]))
+    assert not book.synced
+    assert not book.apply_delta(delta(14, 14, bids=[["100.1", "1"]]))
+    newer = dict(snapshot, lastUpdateId="12")
+    book.load_snapshot(newer)
+    assert book.synced
+    assert book.last_update_id == 14
+    assert book.best_ask() == (100.8, 1.0)
+    assert book.best_bid() == (100.1, 1.0)
+
+
+def test_resyncs_with_public(snapshot):
+    public = Mock()
+    public.get_depth.return_value = dict(snapshot, lastUpdateId="20")
+    book = OrderBook("SOL_USDC", snapshot, public=public)
+    assert book.apply_delta(delta(20, 21, bids=[["100", "7"]]))
+    public.get_depth.assert_called_once_with("SOL_USDC")
+    assert book.best_bid() == (100.0, 7.0)
+
+
+def test_decimal_numbers(snapshot):
+    book = OrderBook("SOL_USDC", snapshot, number_type=Decimal)
+    assert book.best_bid() == (Decimal("100"), Decimal("1"))
+    assert book.vwap("Bid", "2") == Decimal("101.25")
+
+
+def test_gap_while_replaying_keeps_later_deltas(snapshot):
+    book = OrderBook("SOL_USDC", snapshot)
+    assert not book.apply_delta(delta(12, 13, asks=[["100.8", "1"]]))
+    book.apply_delta(delta(14, 14))
+    book.apply_delta(delta(16, 16, bids=[["100.1", "1"]]))
+    book.apply_delta(delta(17, 17, bids=[["100.2", "1"]]))
+    book.load_snapshot(dict(snapshot, lastUpdateId="12"))
+    assert not book.synced
+    assert book.last_update_id == 14
+    book.load_snapshot(dict(snapshot, lastUpdateId="15"))
+    assert book.synced
+    assert book.last_update_id == 17
+    assert book.best_bid() == (100.2, 1.0)
+
+
+def test_resync_retries_stale_snapshot(snapshot):
+    public = Mock()
+    public.get_depth.side_effect = [
+        dict(snapshot, lastUpdateId="11"),
+        dict(snapshot, lastUpdateId="20"),
+    ]
+    book = OrderBook("SOL_USDC", snapshot, public=public)
+    assert book.apply_delta(delta(20, 21, bids=[["100", "7"]]))
+    assert public.get_depth.call_count == 2
+    assert book.last_update_id == 21
+
+
+def test_error_body_snapshot_keeps_deltas_buffered(snapshot):
+    public = Mock()
+    public.get_depth.side_effect = [
+        {"code": "TOO_MANY_REQUESTS", "message": "Rate limit exceeded"},
+        dict(snapshot, lastUpdateId="20"),
+    ]
+    book = OrderBook("SOL_USDC", snapshot, public=public)
+    assert not book.apply_delta(delta(20, 21, bids=[["100", "7"]]))
+    assert public.get_depth.call_count == 1
+    assert not book.synced
+    assert book.apply_delta(delta(22, 22))
+    assert book.last_update_id == 22
+    assert book.best_bid() == (100.0, 7.0)
+
+
+@pytest.mark.asyncio
+async def test_async_error_body_snapshot(snapshot):
+    public = Mock()
+    public.get_depth = AsyncMock(return_value={"code": "X", "message": "down"})
+    book = OrderBook("SOL_USDC", snapshot, public=public)
+    assert not await book.apply_delta_async(delta(20, 21))
+    assert not book.synced
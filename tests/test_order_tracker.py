@@ -0,0 +1,161 @@
+import base64
+import os
+from time import monotonic
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from bpx.account import Account
+from bpx.async_.account import Account as AsyncAccount
+from bpx.models.order_tracker import OrderTracker
+
+secret_key = base64.b64encode(os.urandom(32)).decode()
+
+
+def order(order_id, client_id=None, symbol="SOL_USDC", status="New", quantity="2"):
+    return {
+        "id": order_id,
+        "clientId": client_id,
+        "symbol": symbol,
+        "status": status,
+        "quantity": quantity,
+        "executedQuantity": "0",
+    }
+
+
+def test_account_responses_are_indexed():
+    http_client = Mock()
+    tracker = OrderTracker()
+    account = Account(
+        "pk", secret_key, default_http_client=http_client, order_tracker=tracker
+    )
+
+    http_client.post.return_value = order("1", client_id=7)
+    account.execute_order("SOL_USDC", "Bid", "Limit", quantity="2", price="100")
+    http_client.post.return_value = order("2", symbol="BTC_USDC")
+    account.execute_order("BTC_USDC", "Bid", "Limit", quantity="2", price="100")
+
+    assert tracker.get(client_id=7)["id"] == "1"
+    assert [o["id"] for o in tracker.open_orders("SOL_USDC")] == ["1"]
+    assert len(tracker.open_orders()) == 2
+
+    http_client.delete.return_value = order("1", client_id=7, status="Cancelled")
+    account.cancel_order("SOL_USDC", client_id=7)
+    assert tracker.open_orders("SOL_USDC") == []
+    assert tracker.get("1")["status"] == "Cancelled"
+
+    http_client.delete.return_value = {"code": "RESOURCE_NOT_FOUND"}
+    account.cancel_order("SOL_USDC", order_id="404")
+    assert tracker.get("404") is None
+
+
+def test_fills_and_stream_updates():
+    tracker = OrderTracker()
+    tracker.on_order(order("1"))
+    fill = {"orderId": "1", "tradeId": 10, "quantity": "0.5", "price": "100"}
+    tracker.on_fill(fill)
+    tracker.on_fill(fill)
+    assert tracker.get("1")["executedQuantity"] == "0.5"
+    assert tracker.get("1")["status"] == "PartiallyFilled"
+    tracker.on_fill({"orderId": "1", "tradeId": 11, "quantity": "1.5", "price": "100"})
+    assert tracker.get("1")["status"] == "Filled"
+    assert tracker.open_orders() == []
+
+    tracker.on_order_update(
+        {"e": "orderAccepted", "i": "2", "c": 9, "s": "SOL_USDC", "X": "New", "q": "1"}
+    )
+    assert tracker.get(client_id=9)["symbol"] == "SOL_USDC"
+    tracker.on_order_update({"e": "orderFill", "i": "2", "X": "Filled", "z": "1"})
+    assert tracker.open_orders("SOL_USDC") == []
+
+
+def test_fills_do_not_double_count_order_updates():
+    tracker = OrderTracker()
+    tracker.on_order(order("1"))
+    tracker.on_order_update(
+        {"e": "orderFill", "i": "1", "X": "PartiallyFilled", "z": "1"}
+    )
+    tracker.on_fill({"orderId": "1", "tradeId": 10, "quantity": "1", "price": "100"})
+    assert tracker.get("1")["executedQuantity"] == "1"
+    assert tracker.get("1")["status"] == "PartiallyFilled"
+
+    tracker.on_fill({"orderId": "1", "tradeId": 11, "quantity": "0.5", "price": "100"})
+    assert tracker.get("1")["executedQuantity"] == "1.5"
+    # a stale order response does not roll the fills back
+    tracker.on_order(dict(order("1"), status="PartiallyFilled", executedQuantity="1"))
+    assert tracker.get("1")["executedQuantity"] == "1.5"
+
+    fill = {"orderId": "1", "quantity": "0.5", "price": "100", "timestamp": 5}
+    tracker.on_fill(fill)
+    tracker.on_fill(fill)
+    tracker.on_fill({"orderId": "1", "quantity": "0.5", "price": "100"})
+    assert tracker.get("1")["executedQuantity"] == "2.0"
+    assert tracker.get("1")["status"] == "Filled"
+
+
+def test_closed_orders_are_evicted():
+    tracker = OrderTracker(max_closed=2)
+    for i in range(5):
+        tracker.on_order(order(str(i), client_id=i))
+        tracker.on_fill({"orderId": str(i), "tradeId": i, "quantity": "2"})
+    tracker.on_order(order("5", client_id=5))
+    assert sorted(tracker.orders) == ["3", "4", "5"]
+    assert tracker.get(client_id=0) is None
+    assert tracker.get(client_id=4)["status"] == "Filled"
+    assert set(tracker._trade_ids) == set(tracker._filled) == {"3", "4"}
+    assert sorted(tracker._seen_at) == ["3", "4", "5"]
+    assert [o["id"] for o in tracker.open_orders()] == ["5"]
+
+
+def test_reconcile_closes_drifted_orders():
+    tracker = OrderTracker()
+    tracker.on_order(order("1"))
+    tracker.on_order(order("2"))
+    requested_at = monotonic()
+    tracker.on_order(order("3"))
+
+    closed = tracker.reconcile([order("2"), order("4")], requested_at=requested_at)
+    assert [o["id"] for o in closed] == ["1"]
+    assert tracker.get("1")["status"] == OrderTracker.CLOSED
+    assert sorted(o["id"] for o in tracker.open_orders()) == ["2", "3", "4"]
+    assert tracker.reconcile("error") == []
+
+
+@pytest.mark.asyncio
+async def test_async_account_batch_is_tracked():
+    http_client = Mock()
+    http_client.post = AsyncMock(return_value=[order("1", 11), order("2", 12)])
+    tracker = OrderTracker()
+    account = AsyncAccount(
+        "pk", secret_key, http_client=http_client, order_tracker=tracker
+    )
+    await account.execute_orders(
+        [
+            {
+                "symbol": "SOL_USDC",
+                "side": "Bid",
+                "order_type": "Limit",
+                "quantity": "2",
+                "price": "99",
+                "client_id": 11,
+            },
+            {
+                "symbol": "SOL_USDC",
+                "side": "Bid",
+                "order_type": "Limit",
+                "quantity": "2",
+                "price": "98",
+                "client_id": 12,
+            },
+        ]
+    )
+    assert sorted(o["clientId"] for o in tracker.open_orders("SOL_USDC")) == [11, 12]
+
+    http_client.delete = AsyncMock(
+        return_value=[
+            order("1", 11, status="Cancelled"),
+            order("2", 12, status="Cancelled"),
+        ]
+    )
+    await account.cancel_all_orders("SOL_USDC")
+    assert tracker.open_orders() == []
@@ -0,0 +1,107 @@
+import base64
+import os
+
+import pytest
+
+from bpx.base.base_account import BaseAccount
+from bpx.exceptions import OrderValidationError
+from bpx.models.order_validator import MarketRules, OrderValidator
+
+MARKETS = [
+    {
+        "symbol": "SOL_USDC",
+        "filters": {
+            "price": {"minPrice": "0.01", "maxPrice": "1000", "tickSize": "0.01"},
+            "quantity": {
+                "minQuantity": "0.01",
+                "maxQuantity": None,
+                "stepSize": "0.01",
+            },
+            "notional": {"minNotional": "5"},
+        },
+    },
+    {
+        "symbol": "BTC_USDC",
+        "filters": {
+            "price": {"tickSize": "0.5"},
+            "quantity": {"stepSize": "0.00001"},
+        },
+    },
+]
+
+
+@pytest.fixture
+def validator():
+    return OrderValidator.from_markets(MARKETS)
+
+
+def test_rules_are_parsed(validator):
+    rules = validator.rules["SOL_USDC"]
+    assert isinstance(rules, MarketRules)
+    assert str(rules.tick_size) == "0.01"
+    assert rules.max_quantity is None
+    assert str(rules.min_notional) == "5"
+
+
+def test_rounding_away_from_the_book(validator):
+    assert validator.validate("SOL_USDC", "Bid", "1.239", "150.129") == (
+        "1.23",
+        "150.12",
+        None,
+    )
+    assert validator.validate("SOL_USDC", "Ask", "1.239", "150.121") == (
+        "1.23",
+        "150.13",
+        None,
+    )
+    assert validator.validate("BTC_USDC", "Ask", "0.000019", "60000.2") == (
+        "0.00001",
+        "60000.5",
+        None,
+    )
+
+
+def test_rejections(validator):
+    with pytest.raises(OrderValidationError):
+        validator.validate("SOL_USDC", "Bid", "0.001", "150")
+    with pytest.raises(OrderValidationError):
+        validator.validate("SOL_USDC", "Bid", "1", "1001")
+    with pytest.raises(OrderValidationError, match="notional"):
+        validator.validate("SOL_USDC", "Bid", "0.03", "150")
+    with pytest.raises(OrderValidationError, match="notional"):
+        validator.validate("SOL_USDC", "Bid", quote_quantity="1")
+
+    strict = OrderValidator.from_markets(MARKETS, round_values=False)
+    with pytest.raises(OrderValidationError, match="multiple"):
+        strict.validate("SOL_USDC", "Bid", "1.239", "150")
+    assert strict.validate("SOL_USDC", "Bid", "1.23", "150.12") == (
+        "1.23",
+        "150.12",
+        None,
+    )
+
+
+def test_unknown_symbol_is_passed_through(validator):
+    assert validator.validate("ETH_USDC", "Bid", "1.2345", "0.001") == (
+        "1.2345",
+        "0.001",
+        None,
+    )
+
+
+def test_execute_order_validates_before_signing(validator):
+    account = BaseAccount(
+        public_key="pk",
+        secret_key=base64.b64encode(os.urandom(32)).decode(),
+        window=5000,
+        debug=False,
+        order_validator=validator,
+    )
+    request_config = account.execute_order(
+        "SOL_USDC", "Bid", "Limit", quantity="1.239", price="150.129"
+    )
+    assert request_config.data["quantity"] == "1.23"
+    assert request_config.data["price"] == "150.12"
+
+    with pytest.raises(OrderValidationError):
+        account.execute_order("SOL_USDC", "Bid", "Limit", quantity="0.001", price="1")
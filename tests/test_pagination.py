@@ -0,0 +1,68 @@
+import base64
+import os
+import threading
+
+import pytest
+
+from bpx.account import Account
+from bpx.async_.account import Account as AsyncAccount
+from bpx.exceptions import UnexpectedResponseError
+
+secret_key = base64.b64encode(os.urandom(32)).decode()
+
+
+class FakeHistory:
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def page(self, limit, offset, **kwargs):
+        with self.lock:
+            self.calls.append((limit, offset, kwargs))
+        return [{"id": i} for i in range(offset, min(offset + limit, self.total))]
+
+    async def async_page(self, limit, offset, **kwargs):
+        return self.page(limit, offset, **kwargs)
+
+
+@pytest.mark.parametrize("prefetch,concurrency", [(False, 1), (True, 1), (True, 4)])
+def test_iter_fill_history(mocker, prefetch, concurrency):
+    account = Account("public", secret_key)
+    history = FakeHistory(total=25)
+    mocker.patch.object(account, "get_fill_history", side_effect=history.page)
+    fills = account.iter_fill_history(
+        symbol="SOL_USDC",
+        page_size=10,
+        prefetch=prefetch,
+        concurrency=concurrency,
+    )
+    assert [fill["id"] for fill in fills] == list(range(25))
+    offsets = sorted(offset for _, offset, _ in history.calls)
+    assert offsets[:3] == [0, 10, 20]
+    assert history.calls[0][2]["symbol"] == "SOL_USDC"
+
+
+def test_iter_stops_on_error_response(mocker):
+    account = Account("public", secret_key)
+    mocker.patch.object(
+        account, "get_deposits", return_value={"code": "INVALID_CLIENT_REQUEST"}
+    )
+    with pytest.raises(UnexpectedResponseError):
+        list(account.iter_deposits())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch,concurrency", [(False, 1), (True, 3)])
+async def test_async_iter_order_history(mocker, prefetch, concurrency):
+    account = AsyncAccount("public", secret_key)
+    history = FakeHistory(total=30)
+    mocker.patch.object(account, "get_order_history", side_effect=history.async_page)
+    orders = [
+        order["id"]
+        async for order in account.iter_order_history(
+            page_size=10, prefetch=prefetch, concurrency=concurrency
+        )
+    ]
+    assert orders == list(range(30))
+    assert [offset for _, offset, _ in history.calls][:4] == [0, 10, 20, 30]
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from bpx.http_client.rate_limiter import RateLimiter, TokenBucket
+
+ORDER_URL = "https://api.backpack.exchange/api/v1/order"
+SIGNED = {"X-API-Key": "key", "X-Signature": "signature"}
+
+
+def test_bucket_reserve():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_acquire_paces():
+    bucket = TokenBucket(rate=100, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.045
+
+
+@pytest.mark.asyncio
+async def test_bucket_acquire_async_pauses():
+    bucket = TokenBucket(rate=1000, capacity=10)
+    bucket.pause(0.05)
+    start = time.monotonic()
+    await bucket.acquire_async()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_classify():
+    limiter = RateLimiter()
+    assert limiter.classify("GET", ORDER_URL) == RateLimiter.PUBLIC
+    assert limiter.classify("GET", ORDER_URL, SIGNED) == RateLimiter.QUERY
+    assert limiter.classify("POST", ORDER_URL, SIGNED) == RateLimiter.ORDER
+    assert limiter.classify("DELETE", ORDER_URL + "s", SIGNED) == RateLimiter.ORDER
+
+
+def test_feedback_pauses_class():
+    limiter = RateLimiter()
+    limiter.feedback("POST", ORDER_URL, SIGNED, 429, {"Retry-After": "2"})
+    assert limiter.buckets[RateLimiter.ORDER].reserve() > 1.9
+    assert limiter.buckets[RateLimiter.QUERY].reserve() == 0
+    limiter.feedback("GET", ORDER_URL, None, 429, {})
+    assert limiter.buckets[RateLimiter.PUBLIC].reserve() > 0.9
+
+
+def test_retry_after():
+    assert RateLimiter.retry_after({}) is None
+    assert RateLimiter.retry_after({"Retry-After": "1.5"}) == 1.5
+    assert RateLimiter.retry_after({"Retry-After": "soon"}) is None
+    assert (
+        RateLimiter.retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    )
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from bpx.async_.public import Public as AsyncPublic
+from bpx.async_.reference_cache import ReferenceCache as AsyncReferenceCache
+from bpx.public import Public
+from bpx.reference_cache import ReferenceCache
+
+MARKETS = [{"symbol": "SOL_USDC"}, {"symbol": "BTC_USDC"}]
+
+
+def test_markets_are_fetched_once_and_indexed():
+    http_client = Mock()
+    http_client.get.return_value = MARKETS
+    public = Public(http_client=http_client, reference_cache=ReferenceCache())
+
+    assert public.get_markets() == MARKETS
+    assert public.get_market("BTC_USDC") == {"symbol": "BTC_USDC"}
+    assert public.get_market() == MARKETS
+    assert http_client.get.call_count == 1
+
+
+def test_unknown_symbol_and_errors_go_to_the_server():
+    http_client = Mock()
+    http_client.get.side_effect = [MARKETS, {"symbol": "ETH_USDC"}, "error", "error"]
+    public = Public(http_client=http_client, reference_cache=ReferenceCache())
+
+    assert public.get_market("ETH_USDC") == {"symbol": "ETH_USDC"}
+    assert http_client.get.call_args.args[0].endswith("api/v1/markets/ETH_USDC")
+    assert public.get_assets() == "error"
+    assert public.get_assets() == "error"
+
+
+def test_without_cache_every_call_is_a_request():
+    http_client = Mock()
+    http_client.get.return_value = MARKETS
+    public = Public(http_client=http_client)
+    public.get_markets()
+    public.get_markets()
+    public.get_market("SOL_USDC")
+    assert http_client.get.call_count == 3
+    assert http_client.get.call_args.args[0].endswith("api/v1/markets/SOL_USDC")
+
+
+def test_ttl_and_invalidate():
+    cache = ReferenceCache(ttl={"assets": 0.05}, refresh_ahead=1.0)
+    fetch = Mock(side_effect=[["a"], ["b"], ["c"]])
+    assert cache.get("assets", fetch) == ["a"]
+    assert cache.get("assets", fetch) == ["a"]
+    time.sleep(0.06)
+    assert cache.get("assets", fetch) == ["b"]
+    cache.invalidate("assets")
+    assert cache.get("assets", fetch) == ["c"]
+    with pytest.raises(KeyError):
+        ReferenceCache(ttl={"tickers": 1})
+
+
+def test_concurrent_misses_are_single_flight():
+    cache = ReferenceCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return MARKETS
+
+    threads = [
+        threading.Thread(target=cache.get, args=("markets", fetch)) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+
+def test_refresh_ahead_serves_cached_value():
+    cache = ReferenceCache(ttl={"markets": 10}, refresh_ahead=0.0)
+    refreshed = threading.Event()
+
+    def fetch():
+        refreshed.set()
+        return [{"symbol": "ETH_USDC"}]
+
+    cache.store("markets", MARKETS)
+    assert cache.get("markets", fetch) == MARKETS
+    assert refreshed.wait(1)
+    for _ in range(100):
+        if cache.market("ETH_USDC") is not None:
+            break
+        time.sleep(0.01)
+    assert cache.market("ETH_USDC") == {"symbol": "ETH_USDC"}
+    assert cache.market("SOL_USDC") is None
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_and_market_lookup():
+    http_client = Mock()
+
+    async def get(url):
+        await asyncio.sleep(0.01)
+        return MARKETS
+
+    http_client.get = AsyncMock(side_effect=get)
+    public = AsyncPublic(http_client=http_client, reference_cache=AsyncReferenceCache())
+
+    results = await asyncio.gather(*(public.get_markets() for _ in range(5)))
+    assert results == [MARKETS] * 5
+    assert await public.get_market("SOL_USDC") == {"symbol": "SOL_USDC"}
+    assert http_client.get.await_count == 1
+
+    public.reference_cache.invalidate()
+    await public.get_market("SOL_USDC")
+    assert http_client.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_refresh_ahead():
+    cache = AsyncReferenceCache(ttl={"collateral": 10}, refresh_ahead=0.0)
+    cache.store("collateral", ["old"])
+    fetch = AsyncMock(return_value=["new"])
+
+    assert await cache.get("collateral", fetch) == ["old"]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert cache.cached("collateral") == ["new"]
+    assert fetch.await_count == 1
@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+import pytest
+
+from bpx.exceptions import UnexpectedResponseError
+from bpx.models.responses import _MISSING, Balance, Depth, Fill, Ticker
+
+
+def test_ticker_decodes_lazily():
+    raw = {"symbol": "SOL_USDC", "lastPrice": "150.25", "trades": "42", "high": None}
+    ticker = Ticker.parse(raw)
+    assert all(value is _MISSING for value in ticker._values)
+    assert ticker.last_price == Decimal("150.25")
+    assert ticker.trades == 42
+    assert ticker._values[Ticker.last_price.index] == Decimal("150.25")
+    assert ticker.high is None
+    assert ticker.to_dict() is raw
+    assert not hasattr(ticker, "__dict__")
+    with pytest.raises(AttributeError):
+        ticker.extra = 1
+
+
+def test_float_fast_path_and_lists():
+    fills = Fill.parse(
+        [
+            {"price": "1.5", "quantity": "2", "isMaker": True, "symbol": "SOL_USDC"},
+            {"price": "1.25", "quantity": "4", "isMaker": False},
+        ],
+        number_type=float,
+    )
+    assert [fill.price for fill in fills] == [1.5, 1.25]
+    assert fills[0].is_maker and not fills[1].is_maker
+    assert fills[0].symbol == "SOL_USDC"
+
+
+def test_depth_levels():
+    depth = Depth.parse(
+        {"bids": [["1", "2"]], "asks": [["3", "4"]], "lastUpdateId": "7"}
+    )
+    assert depth.bids == [(Decimal("1"), Decimal("2"))]
+    assert depth.asks == [(Decimal("3"), Decimal("4"))]
+    assert depth.last_update_id == 7
+
+
+def test_balances_and_errors():
+    balances = Balance.parse_balances(
+        {"SOL": {"available": "1", "locked": "0.5", "staked": "0"}}
+    )
+    assert balances["SOL"].locked == Decimal("0.5")
+    with pytest.raises(UnexpectedResponseError):
+        Ticker.parse("Internal Server Error")
@@ -0,0 +1,173 @@
+import base64
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bpx.account import Account
+from bpx.http_client.async_http_client import AsyncHttpClient
+from bpx.http_client.retry import RetryPolicy
+from bpx.http_client.sync_http_client import SyncHttpClient
+
+
+def test_retry_delay():
+    policy = RetryPolicy(max_attempts=4, backoff=0.1, max_backoff=0.3, jitter=False)
+    started = time.monotonic()
+    assert policy.retry_delay("GET", 0, started, status=503) == 0.1
+    assert policy.retry_delay("GET", 2, started, status=503) == 0.3
+    assert policy.retry_delay("GET", 3, started, status=503) is None
+    assert policy.retry_delay("GET", 0, started, status=400) is None
+    assert policy.retry_delay("GET", 0, started, error=ConnectionError()) == 0.1
+    assert (
+        policy.retry_delay(
+            "GET", 0, started, status=429, response_headers={"Retry-After": "2"}
+        )
+        == 2.0
+    )
+
+
+def test_non_idempotent_requests_need_dedupe():
+    policy = RetryPolicy(jitter=False)
+    started = time.monotonic()
+    assert policy.retry_delay("POST", 0, started, status=503) is None
+    assert policy.retry_delay("POST", 0, started, status=429) is not None
+    assert policy.retry_delay("POST", 0, started, status=503, can_dedupe=True)
+
+
+def test_deadline_and_signature_window():
+    policy = RetryPolicy(backoff=1.0, jitter=False, deadline=0.5)
+    assert policy.retry_delay("GET", 0, time.monotonic(), status=503) is None
+
+    policy = RetryPolicy(backoff=1.0, jitter=False, deadline=None)
+    headers = {"X-Timestamp": str(int(time.time() * 1e3)), "X-Window": "500"}
+    started = time.monotonic()
+    assert (
+        policy.retry_delay("GET", 0, started, status=503, request_headers=headers)
+        is None
+    )
+    assert policy.retry_delay(
+        "GET", 0, started, status=503, request_headers=headers, can_resign=True
+    )
+
+    # stamped by a clock synced to a server a minute ahead, still expired in 1s
+    headers = {"X-Timestamp": str(int(time.time() * 1e3) + 60_000), "X-Window": "500"}
+    assert (
+        policy.retry_delay("GET", 0, started, status=503, request_headers=headers)
+        is None
+    )
+    headers["X-Window"] = "5000"
+    assert policy.retry_delay("GET", 0, started, status=503, request_headers=headers)
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = 2
+    requests = []
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        type(self).requests.append((self.command, dict(self.headers)))
+        if len(type(self).requests) <= type(self).failures:
+            status, payload = 503, b"unavailable"
+        else:
+            status, payload = 200, json.dumps({"id": "1"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_DELETE = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    FlakyHandler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sync_client_retries(flaky_server):
+    with SyncHttpClient(retry_policy=RetryPolicy(backoff=0.01)) as client:
+        assert client.get(flaky_server) == {"id": "1"}
+    assert len(FlakyHandler.requests) == 3
+
+    FlakyHandler.requests = []
+    with SyncHttpClient() as client:
+        assert client.get(flaky_server) == "unavailable"
+
+
+def test_order_retry_resigns_and_deduplicates(flaky_server):
+    FlakyHandler.failures = 1
+    try:
+        client = SyncHttpClient(retry_policy=RetryPolicy(backoff=0.01))
+        account = Account(
+            "pk",
+            base64.b64encode(os.urandom(32)).decode(),
+            default_http_client=client,
+        )
+        account.BPX_API_URL = flaky_server
+        account._find_order = Mock(return_value=None)
+        account._headers = Mock(wraps=account._headers)
+        assert account.execute_order(
+            "SOL_USDC", "Bid", "Limit", quantity="1", price="1", client_id=5
+        ) == {"id": "1"}
+        account._find_order.assert_called_once_with("SOL_USDC", 5, None)
+        assert account._headers.call_count == 2
+        assert len(FlakyHandler.requests) == 2
+
+        FlakyHandler.requests = []
+        account._find_order = Mock(return_value={"id": "placed"})
+        assert account.execute_order(
+            "SOL_USDC", "Bid", "Limit", quantity="1", price="1", client_id=5
+        ) == {"id": "placed"}
+        assert len(FlakyHandler.requests) == 1
+
+        FlakyHandler.requests = []
+        assert (
+            account.execute_order("SOL_USDC", "Bid", "Limit", quantity="1", price="1")
+            == "unavailable"
+        )
+        assert len(FlakyHandler.requests) == 1
+    finally:
+        FlakyHandler.failures = 2
+
+
+@pytest_asyncio.fixture
+async def flaky_async_server():
+    calls = []
+
+    async def flaky(request: web.Request):
+        calls.append(request.method)
+        if len(calls) <= 2:
+            return web.Response(status=502, text="bad gateway")
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_route("*", "/", flaky)
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    yield server
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_retries(flaky_async_server):
+    client = AsyncHttpClient(retry_policy=RetryPolicy(backoff=0.01))
+    async with client:
+        assert await client.get(str(flaky_async_server.make_url("/"))) == {"ok": True}
+    assert flaky_async_server.calls == ["GET"] * 3
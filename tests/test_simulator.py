@@ -0,0 +1,186 @@
+import base64
+import os
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from bpx.account import Account
+from bpx.async_.account import Account as AsyncAccount
+from bpx.exceptions import ReplayError
+from bpx.http_client.replay_http_client import (
+    AsyncRecordingHttpClient,
+    AsyncReplayHttpClient,
+    RecordingHttpClient,
+    ReplayHttpClient,
+)
+from bpx.http_client.sync_http_client import SyncHttpClient
+from bpx.public import Public
+from bpx.simulator import ExchangeSimulator
+
+
+def key_pair():
+    secret = os.urandom(32)
+    public = (
+        ed25519.Ed25519PrivateKey.from_private_bytes(secret)
+        .public_key()
+        .public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    )
+    return base64.b64encode(public).decode(), base64.b64encode(secret).decode()
+
+
+@pytest.fixture
+def simulator():
+    with ExchangeSimulator() as simulator:
+        yield simulator
+
+
+def account_for(simulator, http_client=None, **kwargs):
+    public_key, secret_key = key_pair()
+    account = Account(
+        public_key,
+        secret_key,
+        default_http_client=http_client or SyncHttpClient(),
+        **kwargs,
+    )
+    account.BPX_API_URL = simulator.url
+    return account
+
+
+def test_orders_and_history(simulator):
+    account = account_for(simulator)
+    resting = account.execute_order(
+        "SOL_USDC", "Bid", "Limit", quantity="1", price="90", client_id=1
+    )
+    assert resting["status"] == "New"
+    assert account.get_open_order("SOL_USDC", client_id=1)["id"] == resting["id"]
+    assert [o["id"] for o in account.get_open_orders("SOL_USDC")] == [resting["id"]]
+
+    filled = account.execute_order("SOL_USDC", "Ask", "Market", quantity="2")
+    assert filled["status"] == "Filled"
+    assert filled["executedQuoteQuantity"] == "200"
+
+    batch = account.execute_orders(
+        [
+            {
+                "symbol": "SOL_USDC",
+                "side": "Ask",
+                "order_type": "Limit",
+                "quantity": "1",
+                "price": "110",
+            },
+            {
+                "symbol": "NOPE_USDC",
+                "side": "Ask",
+                "order_type": "Market",
+                "quantity": "1",
+            },
+        ]
+    )
+    assert batch.results[0]["status"] == "New"
+    assert batch.errors[1].response["code"] == "INVALID_MARKET"
+
+    assert account.cancel_order("SOL_USDC", order_id=resting["id"])["status"] == (
+        "Cancelled"
+    )
+    assert account.cancel_order("SOL_USDC", order_id=resting["id"])["code"] == (
+        "RESOURCE_NOT_FOUND"
+    )
+    assert len(account.cancel_all_orders("SOL_USDC")) == 1
+    assert account.get_open_orders("SOL_USDC") == []
+
+    fills = account.get_fill_history(symbol="SOL_USDC")
+    assert [f["orderId"] for f in fills] == [filled["id"]]
+    assert len(account.get_order_history(symbol="SOL_USDC", limit=2)) == 2
+
+
+def test_history_honours_time_range(simulator):
+    account = account_for(simulator)
+    first = account.execute_order("SOL_USDC", "Bid", "Market", quantity="1")
+    # within the signature window, so requests are still accepted
+    simulator.clock_offset = 3_000
+    second = account.execute_order("SOL_USDC", "Bid", "Market", quantity="1")
+    split = first["createdAt"] + 1_500
+
+    fills = account.get_fill_history(symbol="SOL_USDC", from_=split)
+    assert [f["orderId"] for f in fills] == [second["id"]]
+    _, orders = simulator._private("GET", "/wapi/v1/history/orders", {"to": split})
+    assert [o["id"] for o in orders] == [first["id"]]
+
+    depth = simulator.depth("SOL_USDC")
+    assert abs(depth["timestamp"] - second["createdAt"]) < 60_000
+
+
+def test_signatures_are_checked(simulator):
+    account = account_for(simulator)
+    _, other_secret = key_pair()
+    forged = Account(account.public_key, other_secret)
+    forged.BPX_API_URL = simulator.url
+    assert forged.get_open_orders()["message"] == "Invalid signature"
+
+    simulator.clock_offset = 60_000
+    assert account.get_open_orders()["message"] == "Request has expired"
+
+
+def test_public_endpoints(simulator):
+    public = Public()
+    public.BASE_URL = simulator.url
+    assert {m["symbol"] for m in public.get_markets()} == {"SOL_USDC", "BTC_USDC"}
+    assert public.get_ticker("SOL_USDC")["lastPrice"] == "100"
+    depth = public.get_depth("SOL_USDC")
+    assert depth["asks"][0][0] == "100.01"
+    assert depth["bids"][-1][0] == "99.99"
+    klines = public.get_klines("SOL_USDC", "1h", 0, 7200)
+    assert [k["start"] for k in klines] == [
+        "1970-01-01 00:00:00",
+        "1970-01-01 01:00:00",
+    ]
+    assert isinstance(public.get_time(), int)
+
+
+def test_record_and_replay(simulator, tmp_path):
+    cassette = str(tmp_path / "orders.jsonl")
+    account = account_for(simulator, RecordingHttpClient(cassette))
+    placed = account.execute_order("SOL_USDC", "Bid", "Limit", quantity="1", price="90")
+    listed = account.get_open_orders("SOL_USDC")
+    again = account.get_open_orders("SOL_USDC")
+
+    replay = account_for(simulator, ReplayHttpClient(cassette))
+    simulator.stop()
+    assert (
+        replay.execute_order("SOL_USDC", "Bid", "Limit", quantity="1", price="90")
+        == placed
+    )
+    assert replay.get_open_orders("SOL_USDC") == listed
+    assert replay.get_open_orders("SOL_USDC") == again
+    with pytest.raises(ReplayError):
+        replay.get_open_orders("SOL_USDC")
+
+
+@pytest.mark.asyncio
+async def test_async_record_and_replay(simulator, tmp_path):
+    cassette = str(tmp_path / "orders.jsonl")
+    public_key, secret_key = key_pair()
+    account = AsyncAccount(
+        public_key, secret_key, http_client=AsyncRecordingHttpClient(cassette)
+    )
+    account.BPX_API_URL = simulator.url
+    async with account:
+        placed = await account.execute_order(
+            "SOL_USDC", "Ask", "Market", quantity="1", client_id=3
+        )
+        fills = await account.get_fill_history(symbol="SOL_USDC")
+    assert placed["status"] == "Filled"
+    assert fills[0]["clientId"] == 3
+
+    replay = AsyncAccount(
+        public_key, secret_key, http_client=AsyncReplayHttpClient(cassette)
+    )
+    replay.BPX_API_URL = simulator.url
+    assert (
+        await replay.execute_order(
+            "SOL_USDC", "Ask", "Market", quantity="1", client_id=3
+        )
+        == placed
+    )
+    assert await replay.get_fill_history(symbol="SOL_USDC") == fills
@@ -0,0 +1,156 @@
+import asyncio
+import base64
+import json
+import os
+
+import pytest
+import pytest_asyncio
+from aiohttp import web, WSMsgType
+from aiohttp.test_utils import TestServer
+
+from bpx.async_.account import Account
+from bpx.async_.websocket import PublicWebSocket, AccountWebSocket
+from bpx.base.base_account import BaseAccount
+from bpx.exceptions import InvalidTimeIntervalError
+
+
+class StandInServer:
+    """Local websocket stand-in: sends one frame per subscribed stream"""
+
+    def __init__(self):
+        self.drop_first_connection = False
+        self.connections = 0
+        self.received = []
+        self.server = None
+
+    async def handler(self, request: web.Request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        connection = self.connections
+        async for frame in ws:
+            if frame.type != WSMsgType.TEXT:
+                break
+            message = json.loads(frame.data)
+            self.received.append((connection, message))
+            if message["method"] != "SUBSCRIBE":
+                continue
+            for stream in message["params"]:
+                await ws.send_json(
+                    {"stream": stream, "data": {"connection": connection}}
+                )
+            if connection == 1 and self.drop_first_connection:
+                await ws.close()
+        return ws
+
+    @property
+    def url(self) -> str:
+        return str(self.server.make_url("/"))
+
+
+@pytest_asyncio.fixture
+async def stand_in():
+    stand_in = StandInServer()
+    app = web.Application()
+    app.router.add_get("/", stand_in.handler)
+    stand_in.server = TestServer(app)
+    await stand_in.server.start_server()
+    yield stand_in
+    await stand_in.server.close()
+
+
+def test_stream_names():
+    ws = PublicWebSocket()
+    assert ws.depth_stream("SOL_USDC") == "depth.SOL_USDC"
+    assert ws.kline_stream("SOL_USDC", "1m") == "kline.1m.SOL_USDC"
+    assert ws.mark_price_stream("SOL_USDC_PERP") == "markPrice.SOL_USDC_PERP"
+    assert ws.open_interest_stream("SOL_USDC_PERP") == "openInterest.SOL_USDC_PERP"
+    with pytest.raises(InvalidTimeIntervalError):
+        ws.kline_stream("SOL_USDC", "2m")
+
+
+@pytest.mark.asyncio
+async def test_multiplexes_and_resubscribes(stand_in):
+    stand_in.drop_first_connection = True
+    ws = PublicWebSocket(url=stand_in.url, reconnect_delay=0.01)
+    streams = [ws.depth_stream("SOL_USDC"), ws.trade_stream("BTC_USDC")]
+    async with ws:
+        await ws.subscribe(*streams)
+        messages = []
+        async for message in ws:
+            messages.append(message)
+            if len(messages) == 4:
+                break
+    assert [message["stream"] for message in messages] == streams * 2
+    assert [message["data"]["connection"] for message in messages] == [1, 1, 2, 2]
+    assert ws.reconnects == 1
+    assert stand_in.received[-1] == (
+        2,
+        {"method": "SUBSCRIBE", "params": streams},
+    )
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe(stand_in):
+    ws = PublicWebSocket(url=stand_in.url)
+    async with ws:
+        await ws.subscribe("ticker.SOL_USDC")
+        await ws.unsubscribe("ticker.SOL_USDC", "ticker.ETH_USDC")
+        await asyncio.sleep(0.05)
+    assert ws.subscriptions == {}
+    assert stand_in.received == [
+        (1, {"method": "SUBSCRIBE", "params": ["ticker.SOL_USDC"]}),
+        (1, {"method": "UNSUBSCRIBE", "params": ["ticker.SOL_USDC"]}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_account_stream_signs_and_resyncs(stand_in, mocker):
+    stand_in.drop_first_connection = True
+    account = Account("public", base64.b64encode(os.urandom(32)).decode(), window=3000)
+    mocker.patch.object(account, "get_open_orders", return_value=[{"id": "1"}])
+    mocker.patch.object(account, "get_open_positions", return_value=[])
+    ws = AccountWebSocket(account, url=stand_in.url, reconnect_delay=0.01)
+    async with ws:
+        await ws.subscribe(ws.order_update_stream("SOL_USDC"))
+        messages = []
+        async for message in ws:
+            messages.append(message)
+            if len(messages) == 3:
+                break
+    assert [message["stream"] for message in messages] == [
+        "account.orderUpdate.SOL_USDC",
+        "account.snapshot",
+        "account.orderUpdate.SOL_USDC",
+    ]
+    assert messages[1]["data"] == {"orders": [{"id": "1"}], "positions": []}
+    for _, message in stand_in.received:
+        key, signature, timestamp, window = message["signature"]
+        assert key == "public" and window == "3000"
+        payload = BaseAccount._signing_payload({}, "subscribe", timestamp, window)
+        account.private_key.public_key().verify(
+            base64.b64decode(signature), payload.encode()
+        )
+
+
+@pytest.mark.asyncio
+async def test_account_snapshot_is_retried(stand_in, mocker, caplog):
+    stand_in.drop_first_connection = True
+    account = Account("public", base64.b64encode(os.urandom(32)).decode())
+    mocker.patch.object(
+        account,
+        "get_open_orders",
+        side_effect=[asyncio.TimeoutError(), ConnectionError("429"), []],
+    )
+    mocker.patch.object(account, "get_open_positions", return_value=[])
+    ws = AccountWebSocket(account, url=stand_in.url, reconnect_delay=0.01)
+    async with ws:
+        await ws.subscribe(ws.order_update_stream())
+        streams = []
+        async for message in ws:
+            streams.append(message["stream"])
+            if len(streams) == 3:
+                break
+    assert streams == ["account.orderUpdate", "account.snapshot", "account.orderUpdate"]
+    assert account.get_open_orders.call_count == 3
+    assert "account snapshot failed" in caplog.text